@@ -20,4 +20,83 @@ ASSETS_DIR = PROJECT_ROOT / "assets"
 DRIVER_IMAGES_DIR = ASSETS_DIR / "drivers"
 CONSTRUCTOR_IMAGES_DIR = ASSETS_DIR / "constructors"
 FLAGS_IMAGES_DIR = ASSETS_DIR / "flags"
-CURCUITS_IMAGES_DIR = ASSETS_DIR / "circuits"
\ No newline at end of file
+CURCUITS_IMAGES_DIR = ASSETS_DIR / "circuits"
+APP_DATA_DIR = Path.home() / "AppData" / "Roaming" / "F1App"
+DRIVERS_STATS_FILE = APP_DATA_DIR / "drivers_stats.json"      # legacy, read-only fallback
+DRIVERS_STATS_BIN = APP_DATA_DIR / "drivers_stats.bin"
+DRIVER_RACES_BIN = APP_DATA_DIR / "driver_races.bin"           # every career race per driver
+ERGAST_DB = APP_DATA_DIR / "ergast.sqlite3"                    # offline dump, see services/ergast_import.py
+IMPORT_BATCH_SIZE = 5000
+LAPS_DIR = APP_DATA_DIR / "laps"                               # per-race lap tables, see services/laps.py
+PITSTOPS_DIR = APP_DATA_DIR / "pitstops"                       # final rounds, see services/pitstops.py
+
+# =======================
+# Refresh scheduling (seconds)
+# =======================
+
+POLL_LIVE_INTERVAL = 5 * 60          # inside a post-session window
+POLL_IDLE_INTERVAL = 6 * 60 * 60     # between race weekends
+SPRINT_DURATION = 60 * 60            # session start -> expected chequered flag
+RACE_DURATION = 2 * 60 * 60
+POST_SESSION_WINDOW = 4 * 60 * 60    # how long results keep changing after the flag
+RESULTS_FINAL_AFTER = 24 * 60 * 60   # race start -> results considered final
+SCHEDULE_WINNERS_GRACE = 0.5         # render the schedule alone if winners take longer
+
+# =======================
+# Rendering
+# =======================
+
+# "auto" lets the quality governor step down/up based on measured frame
+# times; any level name from ui.quality.LEVELS pins it.
+RENDER_QUALITY = "auto"
+FRAME_BUDGET_MS = 33
+FRAME_PROBE_INTERVAL_MS = 100
+ANIMATE_POSITION_SWAPS = True
+# Large pages build their widgets in slices of at most this many ms per
+# event-loop turn; the first screenful is always built in one go.
+BUILD_SLICE_MS = 8
+REPLAY_FRAME_MS = 16         # race replay frame interval (FRAME_BUDGET_MS when animations are off)
+REPLAY_SPEEDS = [1, 5, 10, 30, 60, 120]
+REPLAY_DEFAULT_SPEED = 30
+
+# =======================
+# Background tasks
+# =======================
+
+TASK_POOL_SIZE = 4
+TASK_TIMEOUT = 30        # seconds before a page gives up on a request
+AIO_IO_THREADS = 2       # disk / sqlite work awaited by coroutine services
+
+# =======================
+# API
+# =======================
+
+# Shared cache daemon (python -m services.cache_server). When set, requests
+# go through it first, e.g. "http://192.168.1.10:8770/ergast/f1"
+LOCAL_CACHE_URL = None
+CACHE_SERVER_HOST = "127.0.0.1"    # "0.0.0.0" to serve the LAN
+CACHE_SERVER_PORT = 8770
+CACHE_SERVER_TTL = 60              # seconds a response is served before revalidating upstream
+CACHE_SERVER_UPSTREAMS = [JOLPICA_API_URL]
+
+# Equivalent Ergast endpoints, tried in order of health (see utils/mirrors.py).
+# Jolpica stays after the cache daemon, so a dead daemon only costs a failover.
+API_MIRRORS = ([LOCAL_CACHE_URL] if LOCAL_CACHE_URL else []) + [
+    JOLPICA_API_URL,
+]
+API_TIMEOUT = 10         # seconds per request
+API_HEDGE_DELAY = 1.0    # hedge after this long until a mirror's p95 latency is known
+API_HEDGE_MIN_DELAY = 0.1
+API_PAGE_SIZE = 100      # largest limit the Ergast/Jolpica API honours
+API_RATE_LIMIT = 4       # sustained requests per second (upstream burst limit)
+API_BURST = 4
+API_CONCURRENCY = 4      # pages fetched in parallel by the paginator
+API_CACHE_DIR = APP_DATA_DIR / "api_cache"
+API_PROBE_MAX_AGE = 6 * 60 * 60   # re-download in full at least this often, even if probes match
+COMPRESSION_DICT_DIR = APP_DATA_DIR / "dicts"
+COMPRESSION_DICT_SAMPLES = 64      # cached responses to collect before training a dictionary
+COMPRESSION_LEVEL = 6
+API_BREAKER_THRESHOLD = 3  # consecutive failures before a host is treated as down
+API_BACKOFF_BASE = 1.0     # seconds; doubles on every retry / breaker trip
+API_BACKOFF_CAP = 30
+API_BREAKER_MAX_OPEN = 120
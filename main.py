@@ -1,12 +1,18 @@
 import sys
+import logging
 from PyQt6.QtWidgets import QApplication
 from PyQt6.QtCore import QTimer
 from PyQt6.QtGui import QIcon
 from ui.splashscreen import SplashScreen
 from ui.main_window import MainWindow  
+from config import settings
 
 
 if __name__ == "__main__":
+    logging.basicConfig(
+        level=settings.LOG_LEVEL,
+        format="%(asctime)s [%(levelname)s] %(name)s: %(message)s"
+    )
     app = QApplication(sys.argv)
     app.setWindowIcon(QIcon("assets/logo/SlipStream.live.png"))
     splash = SplashScreen("assets/logo/SlipStream.live.png")
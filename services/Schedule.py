@@ -1,15 +1,35 @@
 # --- services/schedule.py
 
-from utils.api_helper import fetch_api
+import asyncio
+import logging
+from utils.api_helper import fetch_api, fetch_api_async, run_blocking
+from services.results import get_all_race_winners_async
+from services.schedule_view import build_schedule_view
+from services.storage import write_json_later, load_state
 from config import settings
 
+logger = logging.getLogger(__name__)
+
+SCHEDULE_FILE = settings.APP_DATA_DIR / "race_schedule.json"
+PROCESSED_FILE = settings.APP_DATA_DIR / "processed_races.json"
+SCHEDULE_SCHEMA = "race_schedule"
+SCHEDULE_VERSION = 1
+
 def get_race_schedule(season = settings.CURRENT_SEASON):
-    data = fetch_api(f"{season}/races")
+    return parse_race_schedule(fetch_api(f"{season}/races"))
+
+
+async def get_race_schedule_async(season = settings.CURRENT_SEASON):
+    return parse_race_schedule(await fetch_api_async(f"{season}/races"))
+
+
+def parse_race_schedule(data):
     races = data.get("MRData", {}).get("RaceTable", {}).get("Races", [])
     schedule = []
     for r in races:
         circuit = r.get("Circuit", {})
         location = circuit.get("Location", {})
+        sprint = r.get("Sprint", {})
         schedule.append({
             "round": r.get("round"),
             "raceName": r.get("raceName"),
@@ -22,7 +42,51 @@ def get_race_schedule(season = settings.CURRENT_SEASON):
             "lat": location.get("lat"),
             "long": location.get("long"),
             "locality": location.get("locality"),
-            "country": location.get("country")
+            "country": location.get("country"),
+            "sprintDate": sprint.get("date"),
+            "sprintTime": sprint.get("time")
         })
 
-    return schedule
\ No newline at end of file
+    return schedule
+
+
+def save_race_schedule(races):
+    """Cache the schedule in AppData for the refresh scheduler and update_json.
+    The write happens on the background writer thread."""
+    write_json_later(SCHEDULE_FILE, races, SCHEDULE_SCHEMA, SCHEDULE_VERSION)
+
+
+def load_cached_schedule():
+    """Return the cached schedule, or None when it has not been saved (or is unreadable)."""
+    return load_state(SCHEDULE_FILE, SCHEDULE_SCHEMA, SCHEDULE_VERSION)
+
+
+async def load_schedule_view(season=settings.CURRENT_SEASON, on_partial=None):
+    """
+    Fetch the schedule and race winners concurrently and return the schedule
+    view (see services.schedule_view), built on the loop's executor.
+
+    The schedule is persisted by the background writer as soon as it arrives.
+    If winners are still pending after SCHEDULE_WINNERS_GRACE seconds,
+    on_partial(view) is called with the schedule alone so it can render early.
+    A failed winners request degrades to the schedule without winners.
+    """
+    schedule_task = asyncio.ensure_future(get_race_schedule_async(season))
+    winners_task = asyncio.ensure_future(get_all_race_winners_async(season))
+    try:
+        races = await schedule_task
+        save_race_schedule(races)
+
+        done, _ = await asyncio.wait({winners_task}, timeout=settings.SCHEDULE_WINNERS_GRACE)
+        if not done and on_partial is not None:
+            on_partial(await run_blocking(build_schedule_view, races))
+
+        try:
+            winners = await winners_task
+        except Exception as e:
+            logger.warning("Race winners unavailable, keeping schedule only: %s", e)
+            winners = {}
+    finally:
+        # Schedule failed or the caller cancelled us: don't leave winners running
+        winners_task.cancel()
+    return await run_blocking(build_schedule_view, races, winners)
@@ -0,0 +1,212 @@
+# -- services/aio.py
+# Runs an asyncio event loop on the Qt event loop, so pages can `await`
+# coroutine-based services from the GUI thread without blocking it.
+#
+# The loop never blocks or polls: Qt watches its sockets (QSocketNotifier)
+# and its timers (QTimer), and the loop is stepped once whenever one of
+# them fires or a callback is scheduled. Blocking disk / sqlite work goes
+# to the loop's default executor, a small bounded pool (AIO_IO_THREADS).
+import asyncio
+import heapq
+import logging
+import math
+import selectors
+from concurrent.futures import ThreadPoolExecutor
+from types import MappingProxyType
+from PyQt6.QtCore import QObject, QSocketNotifier, QTimer, Qt
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+
+def _fileno(fileobj):
+    return fileobj if isinstance(fileobj, int) else fileobj.fileno()
+
+
+class QtSelector(selectors.BaseSelector):
+    """
+    selectors API over QSocketNotifier. select() never waits: it returns
+    the sockets Qt reported ready since the previous step.
+    """
+    def __init__(self, on_ready):
+        self.on_ready = on_ready
+        self.keys = {}          # fd -> SelectorKey
+        self.notifiers = {}     # fd -> [QSocketNotifier]
+        self.ready = {}         # fd -> events seen since the last select()
+
+    def register(self, fileobj, events, data=None):
+        fd = _fileno(fileobj)
+        if fd in self.keys:
+            raise KeyError(f"{fileobj!r} is already registered")
+        key = selectors.SelectorKey(fileobj, fd, events, data)
+        self.keys[fd] = key
+        self.notifiers[fd] = [
+            self._notifier(fd, mask, kind)
+            for mask, kind in ((selectors.EVENT_READ, QSocketNotifier.Type.Read),
+                               (selectors.EVENT_WRITE, QSocketNotifier.Type.Write))
+            if events & mask
+        ]
+        return key
+
+    def _notifier(self, fd, mask, kind):
+        notifier = QSocketNotifier(fd, kind)
+
+        def activated(*_):
+            # level-triggered: stay quiet until the loop has had its turn
+            notifier.setEnabled(False)
+            self.ready[fd] = self.ready.get(fd, 0) | mask
+            self.on_ready()
+
+        notifier.activated.connect(activated)
+        return notifier
+
+    def unregister(self, fileobj):
+        fd = _fileno(fileobj)
+        key = self.keys.pop(fd)
+        for notifier in self.notifiers.pop(fd):
+            notifier.setEnabled(False)
+        self.ready.pop(fd, None)
+        return key
+
+    def select(self, timeout=None):
+        events = []
+        for fd, mask in self.ready.items():
+            key = self.keys.get(fd)
+            if key and mask & key.events:
+                events.append((key, mask & key.events))
+        self.ready.clear()
+        for notifiers in self.notifiers.values():
+            for notifier in notifiers:
+                notifier.setEnabled(True)
+        return events
+
+    def get_key(self, fileobj):
+        try:
+            return self.keys[_fileno(fileobj)]
+        except KeyError:
+            raise KeyError(f"{fileobj!r} is not registered") from None
+
+    def get_map(self):
+        return MappingProxyType(self.keys)
+
+    def close(self):
+        for fd in list(self.keys):
+            self.unregister(fd)
+
+
+class QtEventLoop(asyncio.SelectorEventLoop):
+    """Selector loop that tells the bridge whenever it has work to do."""
+    def __init__(self, bridge):
+        self.bridge = bridge
+        super().__init__(QtSelector(bridge.wake))
+
+    def call_soon(self, callback, *args, context=None):
+        handle = super().call_soon(callback, *args, context=context)
+        self.bridge.wake()
+        return handle
+
+    def call_at(self, when, callback, *args, context=None):
+        handle = super().call_at(when, callback, *args, context=context)
+        self.bridge.wake_at(when)
+        return handle
+
+
+class QtAsyncioBridge(QObject):
+    """
+    Steps an asyncio loop from the Qt event loop.
+
+    Each step runs one iteration of the asyncio loop (ready callbacks plus
+    the sockets Qt reported). A step is queued when a callback is scheduled
+    or a socket becomes ready, and a precise timer is armed for the next
+    loop deadline, so an idle app pays nothing.
+    """
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.wake_timer = QTimer(self)
+        self.wake_timer.setSingleShot(True)
+        self.wake_timer.setInterval(0)
+        self.wake_timer.timeout.connect(self.step)
+        self.deadline_timer = QTimer(self)
+        self.deadline_timer.setSingleShot(True)
+        self.deadline_timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.deadline_timer.timeout.connect(self.step)
+        self.deadlines = []     # heap of loop times something is scheduled for
+        self.rewake = False
+        self.pending = set()    # spawned tasks (the loop itself only holds weak references)
+
+        self.loop = QtEventLoop(self)
+        self.loop.set_default_executor(
+            ThreadPoolExecutor(max_workers=settings.AIO_IO_THREADS, thread_name_prefix="aio-io"))
+        asyncio.set_event_loop(self.loop)
+
+    def wake(self):
+        if not self.wake_timer.isActive():
+            self.wake_timer.start()
+
+    def wake_at(self, when):
+        if when <= self.loop.time():
+            self.wake()
+            return
+        heapq.heappush(self.deadlines, when)
+        if self.deadlines[0] == when:
+            self.arm_deadline()
+
+    def arm_deadline(self):
+        if not self.deadlines:
+            self.deadline_timer.stop()
+            return
+        delay = self.deadlines[0] - self.loop.time()
+        self.deadline_timer.start(max(0, math.ceil(delay * 1000)))
+
+    def step(self):
+        if self.loop.is_running():
+            # fired from a nested Qt event loop inside a callback: step afterwards
+            self.rewake = True
+            return
+        started = self.loop.time()
+        self.loop.call_soon(self.loop.stop)
+        self.wake_timer.stop()      # anything scheduled during the step re-arms it
+        self.loop.run_forever()
+        # deadlines before the step began were due in it
+        while self.deadlines and self.deadlines[0] < started:
+            heapq.heappop(self.deadlines)
+        self.arm_deadline()
+        if self.rewake:
+            self.rewake = False
+            self.wake()
+
+    def spawn(self, coro, on_done=None, on_fail=None):
+        task = self.loop.create_task(coro)
+
+        def finished(t):
+            self.pending.discard(t)
+            if t.cancelled():
+                return
+            error = t.exception()
+            if error is not None:
+                if on_fail:
+                    on_fail(str(error))
+                else:
+                    logger.error("Unhandled error in coroutine", exc_info=error)
+            elif on_done:
+                on_done(t.result())
+
+        task.add_done_callback(finished)
+        self.pending.add(task)
+        return task
+
+
+_bridge = None
+
+
+def get_bridge():
+    """Application-wide bridge (created on first use, after QApplication)."""
+    global _bridge
+    if _bridge is None:
+        _bridge = QtAsyncioBridge()
+    return _bridge
+
+
+def spawn(coro, on_done=None, on_fail=None):
+    """Schedule a coroutine on the Qt-driven loop; callbacks run on the GUI thread."""
+    return get_bridge().spawn(coro, on_done, on_fail)
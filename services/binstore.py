@@ -0,0 +1,203 @@
+# -- services/binstore.py
+# Compact binary table format for derived stats and cached datasets.
+#
+# Layout (little endian):
+#   header   magic "F1TB", version, column count, record count, key count,
+#            offsets of the records, string table and key index
+#   columns  one (type, name) descriptor per column
+#   records  fixed-width rows; strings are (offset, length) into the table
+#   strings  deduplicated UTF-8 blob
+#   index    (key offset, key length, first record, record count), sorted by
+#            key, so one key can own a run of records (e.g. a driver's races)
+#
+# Readers mmap the file and binary-search the index, so a single record is
+# decoded without touching the rest of the file.
+import mmap
+import struct
+from pathlib import Path
+from services.storage import FileLock, atomic_write_bytes
+
+MAGIC = b"F1TB"
+VERSION = 1
+
+HEADER = struct.Struct("<4sHHIIQQQ")
+COLUMN = struct.Struct("<c31s")
+INDEX_ENTRY = struct.Struct("<IIII")
+
+INT = "q"
+FLOAT = "d"
+STR = "s"
+FIELD_FORMATS = {INT: "q", FLOAT: "d", STR: "II"}
+
+
+class FormatError(Exception):
+    pass
+
+
+def _record_struct(columns):
+    return struct.Struct("<" + "".join(FIELD_FORMATS[kind] for _, kind in columns))
+
+
+def write_table(path, columns, rows, key):
+    """
+    Write rows (dicts) to path. columns is a list of (name, type) with type
+    INT, FLOAT or STR; rows are grouped by rows[key], keeping their order
+    within a key. The file is replaced atomically (temp + fsync + rename).
+    """
+    path = Path(path)
+    record = _record_struct(columns)
+
+    strings = bytearray()
+    string_refs = {}
+
+    def ref(value):
+        data = ("" if value is None else str(value)).encode("utf-8")
+        if data not in string_refs:
+            string_refs[data] = (len(strings), len(data))
+            strings.extend(data)
+        return string_refs[data]
+
+    groups = {}
+    for row in rows:
+        groups.setdefault(str(row[key]), []).append(row)
+    ordered_keys = sorted(groups, key=lambda k: k.encode("utf-8"))
+
+    records = bytearray()
+    index = bytearray()
+    n = 0
+    for k in ordered_keys:
+        first = n
+        for row in groups[k]:
+            values = []
+            for name, kind in columns:
+                value = row.get(name)
+                if kind == STR:
+                    values.extend(ref(value))
+                elif kind == INT:
+                    values.append(int(value or 0))
+                else:
+                    values.append(float(value or 0))
+            records += record.pack(*values)
+            n += 1
+        index += INDEX_ENTRY.pack(*ref(k), first, n - first)
+
+    descriptors = b"".join(COLUMN.pack(kind.encode(), name.encode("utf-8")) for name, kind in columns)
+    records_offset = HEADER.size + len(descriptors)
+    strings_offset = records_offset + len(records)
+    index_offset = strings_offset + len(strings)
+    header = HEADER.pack(MAGIC, VERSION, len(columns), n, len(ordered_keys),
+                         records_offset, strings_offset, index_offset)
+
+    with FileLock(path):
+        atomic_write_bytes(path, header + descriptors + records + strings + index)
+
+
+class Table:
+    """
+    Read-only, memory-mapped view of a file written by write_table.
+
+    Keep tables short-lived (use as a context manager): on Windows an open
+    mapping stops writers from replacing the file.
+    """
+    def __init__(self, path):
+        self.path = Path(path)
+        self.file = self.path.open("rb")
+        try:
+            self.mm = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            self.file.close()
+            raise FormatError(f"{self.path} is empty")
+        try:
+            self._read_header()
+        except Exception:
+            self.close()
+            raise
+
+    def _read_header(self):
+        if len(self.mm) < HEADER.size:
+            raise FormatError(f"{self.path} is truncated")
+        (magic, version, ncols, self.count, self.key_count,
+         self.records_offset, self.strings_offset, self.index_offset) = HEADER.unpack_from(self.mm, 0)
+        if magic != MAGIC or version != VERSION:
+            raise FormatError(f"{self.path} is not a version {VERSION} table")
+        if self.index_offset + self.key_count * INDEX_ENTRY.size > len(self.mm):
+            raise FormatError(f"{self.path} is truncated")
+        self.columns = []
+        for i in range(ncols):
+            kind, name = COLUMN.unpack_from(self.mm, HEADER.size + i * COLUMN.size)
+            self.columns.append((name.rstrip(b"\0").decode("utf-8"), kind.decode()))
+        self.record = _record_struct(self.columns)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if getattr(self, "mm", None) is not None:
+            self.mm.close()
+            self.mm = None
+        self.file.close()
+
+    def __len__(self):
+        return self.count
+
+    def _string(self, offset, length):
+        start = self.strings_offset + offset
+        return self.mm[start:start + length].decode("utf-8")
+
+    def row(self, i):
+        """Decode record i into a dict."""
+        if not 0 <= i < self.count:
+            raise IndexError(i)
+        values = iter(self.record.unpack_from(self.mm, self.records_offset + i * self.record.size))
+        row = {}
+        for name, kind in self.columns:
+            if kind == STR:
+                row[name] = self._string(next(values), next(values))
+            else:
+                row[name] = next(values)
+        return row
+
+    def _entry(self, i):
+        return INDEX_ENTRY.unpack_from(self.mm, self.index_offset + i * INDEX_ENTRY.size)
+
+    def find(self, key):
+        """(first, count) of the records stored under key, or None."""
+        target = str(key).encode("utf-8")
+        lo, hi = 0, self.key_count
+        while lo < hi:
+            mid = (lo + hi) // 2
+            offset, length, first, count = self._entry(mid)
+            start = self.strings_offset + offset
+            probe = self.mm[start:start + length]
+            if probe == target:
+                return first, count
+            if probe < target:
+                lo = mid + 1
+            else:
+                hi = mid
+        return None
+
+    def lookup(self, key):
+        """All records stored under key, in their original order."""
+        span = self.find(key)
+        if span is None:
+            return []
+        first, count = span
+        return [self.row(i) for i in range(first, first + count)]
+
+    def get(self, key):
+        """First record stored under key, or None."""
+        span = self.find(key)
+        return self.row(span[0]) if span else None
+
+    def keys(self):
+        for i in range(self.key_count):
+            offset, length, _, _ = self._entry(i)
+            yield self._string(offset, length)
+
+    def rows(self):
+        for i in range(self.count):
+            yield self.row(i)
@@ -1,11 +1,22 @@
 # -- services/ConstStandings.py
 
-from utils.api_helper import fetch_api
+from utils.api_helper import fetch_api, fetch_api_async, run_blocking
+from services import ergast_import
 from config import settings
 
 def get_constructors_standings(season=settings.CURRENT_SEASON):
-    
-    data = fetch_api(f"{season}/constructorstandings")
+    if ergast_import.has_season(season):
+        return ergast_import.season_constructor_standings(season)
+    return parse_constructors_standings(fetch_api(f"{season}/constructorstandings"))
+
+
+async def get_constructors_standings_async(season=settings.CURRENT_SEASON):
+    if await run_blocking(ergast_import.has_season, season):
+        return await run_blocking(ergast_import.season_constructor_standings, season)
+    return parse_constructors_standings(await fetch_api_async(f"{season}/constructorstandings"))
+
+
+def parse_constructors_standings(data):
     c_standings = data.get("MRData", {}).get("StandingsTable", {}).get("StandingsLists", [])
     constructors = []
     if c_standings :
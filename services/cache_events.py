@@ -0,0 +1,74 @@
+# -- services/cache_events.py
+# Listens to the shared cache daemon's /events stream (see cache_server.py)
+# and tells the dashboard which of its pages have new data.
+import json
+import logging
+import threading
+from urllib.parse import urlsplit, urlunsplit
+import requests
+from PyQt6.QtCore import QObject, pyqtSignal
+from config import settings
+from services.refresh_scheduler import RESULTS, STANDINGS, WINNERS
+from utils.circuit_breaker import backoff_delay
+
+logger = logging.getLogger(__name__)
+
+
+def events_url(cache_url):
+    parts = urlsplit(cache_url)
+    return urlunsplit((parts.scheme, parts.netloc, "/events", "", ""))
+
+
+def kinds_for_paths(paths):
+    """Refresh kinds (see refresh_scheduler) affected by the changed request paths."""
+    kinds = set()
+    for path in paths:
+        if "standings" in path:
+            kinds.add(STANDINGS)
+        elif "results" in path:
+            kinds |= {RESULTS, WINNERS}
+        elif "races" in path:
+            kinds.add(WINNERS)
+    return frozenset(kinds)
+
+
+class CacheEvents(QObject):
+    """Emits invalidated(paths) whenever the cache daemon announces new data."""
+    invalidated = pyqtSignal(list)
+
+    def __init__(self, parent=None, cache_url=None):
+        super().__init__(parent)
+        self.cache_url = cache_url or settings.LOCAL_CACHE_URL
+        self.stopped = threading.Event()
+        self.thread = None
+
+    def start(self):
+        if not self.cache_url or self.thread:
+            return
+        self.thread = threading.Thread(target=self.run, name="cache-events", daemon=True)
+        self.thread.start()
+
+    def stop(self):
+        self.stopped.set()
+
+    def run(self):
+        url = events_url(self.cache_url)
+        attempt = 0
+        while not self.stopped.is_set():
+            try:
+                with requests.get(url, stream=True, timeout=(settings.API_TIMEOUT, 60)) as resp:
+                    resp.raise_for_status()
+                    attempt = 0
+                    # chunk_size=1: hand over each line as soon as it arrives
+                    for raw in resp.iter_lines(chunk_size=1):
+                        if self.stopped.is_set():
+                            return
+                        line = raw.decode("utf-8")
+                        if line.startswith("data:"):
+                            event = json.loads(line[len("data:"):])
+                            if event.get("event") == "invalidate":
+                                self.invalidated.emit(event["paths"])
+            except Exception as e:
+                logger.info("Cache event stream lost: %s", e)
+            self.stopped.wait(backoff_delay(attempt))
+            attempt += 1
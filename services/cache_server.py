@@ -0,0 +1,229 @@
+# -- services/cache_server.py
+# Shared cache daemon for several dashboards on one host or LAN. It speaks
+# the Ergast URL scheme (/ergast/f1/<endpoint>.json), fetches each endpoint
+# upstream once however many clients ask, and pushes invalidations as
+# Server-Sent Events on /events when a revalidation finds new data.
+#
+#   python -m services.cache_server [--host HOST] [--port PORT] [--upstream URL ...]
+#
+# Dashboards use it by setting settings.LOCAL_CACHE_URL.
+import argparse
+import gzip
+import hashlib
+import json
+import logging
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from datetime import datetime, timezone
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qsl, urlsplit
+from config import settings
+from utils import api_helper
+from utils.circuit_breaker import is_upstream_failure
+from services.Schedule import get_race_schedule, save_race_schedule
+from services.refresh_scheduler import plan_next_poll
+
+logger = logging.getLogger(__name__)
+
+PREFIX = "/ergast/f1/"
+EVENTS_PATH = "/events"
+KEEPALIVE = 15      # seconds between SSE comments, so idle proxies keep the stream open
+
+
+class CacheDaemon:
+    """Responses shared by every client, with single-flight upstream fetches."""
+    def __init__(self, ttl=None):
+        self.ttl = settings.CACHE_SERVER_TTL if ttl is None else ttl
+        self.entries = {}       # request path -> entry dict
+        self.inflight = {}      # request path -> Future of the running upstream fetch
+        self.subscribers = set()
+        self.lock = threading.Lock()
+        self.upstream_fetches = 0
+
+    def get(self, key, endpoint, params, force=False):
+        """
+        The entry for key, fetched upstream if missing or older than the TTL.
+        Concurrent callers for the same key share one upstream request.
+        Whichever caller refetches, new data is announced to subscribers.
+        """
+        with self.lock:
+            previous = entry = self.entries.get(key)
+            if entry and not force and time.monotonic() - entry["checked"] < self.ttl:
+                return entry
+            future = self.inflight.get(key)
+            leader = future is None
+            if leader:
+                future = self.inflight[key] = Future()
+        if not leader:
+            return future.result()
+
+        try:
+            # fetch_api brings the client-side cache, probes, breaker and mirrors
+            data = api_helper.fetch_api(endpoint, params)
+            body = json.dumps(data, ensure_ascii=False).encode("utf-8")
+            entry = {
+                "endpoint": endpoint,
+                "params": params,
+                "body": body,
+                "gzip": gzip.compress(body),
+                "etag": '"' + hashlib.sha1(body).hexdigest() + '"',
+                "checked": time.monotonic(),
+            }
+            with self.lock:
+                self.entries[key] = entry
+                self.upstream_fetches += 1
+            future.set_result(entry)
+            if previous and previous["etag"] != entry["etag"]:
+                logger.info("New data for %s", key)
+                self.publish({"event": "invalidate", "paths": [key]})
+            return entry
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self.lock:
+                self.inflight.pop(key, None)
+
+    # ---- Invalidation ----
+
+    def refresh(self):
+        """Revalidate every cached endpoint; get() announces the ones that changed."""
+        with self.lock:
+            cached = list(self.entries.items())
+        changed = []
+        for key, entry in cached:
+            try:
+                fresh = self.get(key, entry["endpoint"], entry["params"], force=True)
+            except Exception as e:
+                logger.warning("Could not revalidate %s: %s", key, e)
+                continue
+            if fresh["etag"] != entry["etag"]:
+                changed.append(key)
+        return changed
+
+    def watch(self):
+        """Revalidate on the refresh scheduler's cadence: often after sessions, rarely between weekends."""
+        while True:
+            try:
+                races = get_race_schedule()
+                save_race_schedule(races)     # fetch_api reads the session windows from it
+            except Exception as e:
+                logger.warning("Cache daemon could not load schedule: %s", e)
+                races = []
+            delay, _ = plan_next_poll(races, datetime.now(timezone.utc))
+            time.sleep(delay)
+            self.refresh()
+
+    def subscribe(self):
+        events = queue.Queue()
+        with self.lock:
+            self.subscribers.add(events)
+        return events
+
+    def unsubscribe(self, events):
+        with self.lock:
+            self.subscribers.discard(events)
+
+    def publish(self, event):
+        with self.lock:
+            subscribers = list(self.subscribers)
+        for events in subscribers:
+            events.put(event)
+
+
+class CacheRequestHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    server_version = "SlipStreamCache/1"
+
+    def log_message(self, fmt, *args):
+        logger.debug("%s - " + fmt, self.address_string(), *args)
+
+    def send_empty(self, status, headers=None):
+        self.send_response(status)
+        for name, value in (headers or {}).items():
+            self.send_header(name, value)
+        self.send_header("Content-Length", "0")
+        self.end_headers()
+
+    def do_GET(self):
+        parts = urlsplit(self.path)
+        if parts.path == EVENTS_PATH:
+            return self.stream_events()
+        if not (parts.path.startswith(PREFIX) and parts.path.endswith(".json")):
+            return self.send_empty(404)
+
+        endpoint = parts.path[len(PREFIX):-len(".json")]
+        params = dict(parse_qsl(parts.query))
+        key = api_helper.request_path(endpoint, params)
+        try:
+            entry = self.server.cache.get(key, endpoint, params)
+        except Exception as e:
+            logger.warning("Upstream fetch of %s failed: %s", key, e)
+            return self.send_empty(502 if is_upstream_failure(e.__cause__ or e) else 404)
+
+        if self.headers.get("If-None-Match") == entry["etag"]:
+            return self.send_empty(304, {"ETag": entry["etag"]})
+        compressed = "gzip" in self.headers.get("Accept-Encoding", "")
+        body = entry["gzip"] if compressed else entry["body"]
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", entry["etag"])
+        if compressed:
+            self.send_header("Content-Encoding", "gzip")
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def stream_events(self):
+        events = self.server.cache.subscribe()
+        self.close_connection = True
+        try:
+            self.send_response(200)
+            self.send_header("Content-Type", "text/event-stream")
+            self.send_header("Cache-Control", "no-cache")
+            self.end_headers()
+            self.wfile.write(b": connected\n\n")
+            self.wfile.flush()
+            while True:
+                try:
+                    event = events.get(timeout=KEEPALIVE)
+                except queue.Empty:
+                    self.wfile.write(b": keepalive\n\n")
+                else:
+                    self.wfile.write(f"data: {json.dumps(event)}\n\n".encode("utf-8"))
+                self.wfile.flush()
+        except OSError:
+            pass        # client went away
+        finally:
+            self.server.cache.unsubscribe(events)
+
+
+def serve(host=None, port=None, upstreams=None, watch=True):
+    """Start the daemon on a background thread; returns the server (call shutdown() to stop)."""
+    api_helper.mirrors.set_urls(upstreams or settings.CACHE_SERVER_UPSTREAMS)
+    server = ThreadingHTTPServer((host or settings.CACHE_SERVER_HOST,
+                                  settings.CACHE_SERVER_PORT if port is None else port),
+                                 CacheRequestHandler)
+    server.cache = CacheDaemon()
+    threading.Thread(target=server.serve_forever, name="cache-server", daemon=True).start()
+    if watch:
+        threading.Thread(target=server.cache.watch, name="cache-watch", daemon=True).start()
+    logger.info("Serving Ergast cache on http://%s:%d%s", *server.server_address[:2], PREFIX.rstrip("/"))
+    return server
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Shared Ergast cache for SlipStream dashboards")
+    parser.add_argument("--host", default=settings.CACHE_SERVER_HOST)
+    parser.add_argument("--port", type=int, default=settings.CACHE_SERVER_PORT)
+    parser.add_argument("--upstream", action="append", help="Ergast base URL (repeatable)")
+    args = parser.parse_args()
+    logging.basicConfig(level=settings.LOG_LEVEL, format="%(asctime)s [%(levelname)s] %(message)s")
+    serve(args.host, args.port, args.upstream)
+    threading.Event().wait()
+
+
+if __name__ == "__main__":
+    main()
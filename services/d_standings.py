@@ -1,11 +1,22 @@
 # -- services/DriversStandings.py
 
-from utils.api_helper import fetch_api
+from utils.api_helper import fetch_api, fetch_api_async, run_blocking
+from services import ergast_import
 from config import settings
 
 def get_driver_standings(season=settings.CURRENT_SEASON):
-    
-    data = fetch_api(f"{season}/driverstandings")
+    if ergast_import.has_season(season):
+        return ergast_import.season_driver_standings(season)
+    return parse_driver_standings(fetch_api(f"{season}/driverstandings"))
+
+
+async def get_driver_standings_async(season=settings.CURRENT_SEASON):
+    if await run_blocking(ergast_import.has_season, season):
+        return await run_blocking(ergast_import.season_driver_standings, season)
+    return parse_driver_standings(await fetch_api_async(f"{season}/driverstandings"))
+
+
+def parse_driver_standings(data):
     d_standings = data.get("MRData", {}).get("StandingsTable", {}).get("StandingsLists", [])
     drivers = []
     if d_standings:
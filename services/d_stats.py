@@ -1,77 +1,108 @@
-import requests
-import json
 import time
-from pathlib import Path
-
-BASE_URL = "https://api.jolpi.ca/ergast/f1"
+from functools import partial
+from config import settings
+from utils.api_helper import fetch_api, fetch_api_stream, iter_pages
+from utils.circuit_breaker import CircuitOpenError, backoff_delay
+from services.binstore import write_table, INT, FLOAT, STR
+from services.storage import load_state, save_state, delete_state
 
 # ---------------- AppData Setup ----------------
-APP_DIR = Path.home() / "AppData" / "Roaming" / "F1App"
-APP_DIR.mkdir(exist_ok=True)
+APP_DIR = settings.APP_DATA_DIR
+APP_DIR.mkdir(parents=True, exist_ok=True)
 
-DRIVERS_FILE = APP_DIR / "drivers_stats.json"
+DRIVERS_FILE = settings.DRIVERS_STATS_BIN
+RACES_FILE = settings.DRIVER_RACES_BIN
 SCHEDULE_FILE = APP_DIR / "race_schedule.json"
 PROCESSED_FILE = APP_DIR / "processed_races.json"
+CHECKPOINT_FILE = APP_DIR / "d_stats_checkpoint.json"
+
+CHECKPOINT_SCHEMA = "d_stats_checkpoint"
+CHECKPOINT_VERSION = 1
+CHECKPOINT_MAX_AGE = 2 * 24 * 60 * 60   # older crawls may have missed a race: start over
+PAGE_SIZE = settings.API_PAGE_SIZE
+
+STATS_COLUMNS = [
+    ("driverId", STR), ("permanentNumber", STR), ("code", STR),
+    ("givenName", STR), ("familyName", STR), ("nationality", STR), ("dateOfBirth", STR),
+    ("totalPoints", FLOAT), ("totalPoles", INT), ("totalWins", INT),
+    ("totalPodiums", INT), ("fastestLaps", INT), ("seasonsRaced", INT),
+]
+RACE_COLUMNS = [
+    ("driverId", STR), ("season", INT), ("round", INT), ("raceName", STR), ("date", STR),
+]
 
 # ---------- Helper Functions ----------
 
-def safe_get(url, retries=3, delay=2):
-    """GET request with retries and delay."""
+def safe_fetch(endpoint, params=None, retries=5, fetch=fetch_api):
+    """
+    fetch (fetch_api by default) with retries. Waits grow exponentially
+    with jitter; while the API's circuit breaker is open, waits until its
+    next probe is due.
+    """
     for attempt in range(retries):
         try:
-            resp = requests.get(url, timeout=10)
-            resp.raise_for_status()
-            return resp
-        except requests.exceptions.RequestException as e:
+            return fetch(endpoint, params)
+        except CircuitOpenError as e:
+            delay = max(e.retry_in, backoff_delay(attempt))
+            print(f"API unavailable ({attempt+1}/{retries}), waiting {delay:.0f}s")
+        except Exception as e:
+            delay = backoff_delay(attempt)
             print(f"Request failed ({attempt+1}/{retries}): {e}")
+        if attempt + 1 < retries:
             time.sleep(delay)
-    raise Exception(f"Failed to fetch {url} after {retries} retries")
+    raise Exception(f"Failed to fetch {endpoint} after {retries} retries")
 
-def get_current_drivers():
+def get_current_drivers(current_season=settings.CURRENT_SEASON):
     """Fetch current season's drivers list."""
-    url = f"{BASE_URL}/2025/drivers.json?limit=1000"
-    resp = safe_get(url)
-    data = resp.json()
-    return data['MRData']['DriverTable']['Drivers']
+    return [d for _, _, page in iter_pages(f"{current_season}/drivers", "DriverTable", "Drivers",
+                                           fetch=safe_fetch)
+            for d in page]
+
+def reduce_race(race, endpoint):
+    """Keep only what the stats need from one Ergast race record."""
+    if endpoint == "qualifying":
+        return {"season": race["season"], "round": race["round"],
+                "position": race["QualifyingResults"][0]["position"]}
+    result = race["Results"][0]
+    return {
+        "season": race["season"], "round": race["round"],
+        "raceName": race["raceName"], "date": race["date"],
+        "position": result["position"], "points": result["points"],
+        "fastestLap": "FastestLap" in result,
+    }
 
-def get_all_races(driver_id, endpoint="results"):
-    """Fetch all races for a driver (results or qualifying) with pagination."""
+def get_all_races(driver_id, endpoint="results", offset=0, on_page=None):
+    """
+    Fetch all races for a driver (results or qualifying), reduced with
+    reduce_race while each page streams in; pages after the first are
+    fetched in parallel by the API paginator.
+    on_page(races, offset, total) is called after every page, in order, so
+    callers can checkpoint; offset resumes a partially fetched list.
+    """
+    stream = partial(fetch_api_stream, table="RaceTable", items_key="Races",
+                     reduce=lambda race: reduce_race(race, endpoint))
     results = []
-    limit = 100
-    offset = 0
-    while True:
-        url = f"{BASE_URL}/drivers/{driver_id}/{endpoint}.json?limit={limit}&offset={offset}"
-        resp = safe_get(url)
-        data = resp.json()
-        races = data['MRData']['RaceTable']['Races']
-        if not races:
-            break
+    pages = iter_pages(f"drivers/{driver_id}/{endpoint}", "RaceTable", "Races",
+                       offset=offset, fetch=partial(safe_fetch, fetch=stream))
+    for page_offset, total, races in pages:
         results.extend(races)
-        total = int(data['MRData']['total'])
-        offset += limit
-        if offset >= total:
-            break
-        time.sleep(0.2)
+        if on_page:
+            on_page(races, min(page_offset + PAGE_SIZE, total), total)
     return results
 
-def calculate_driver_stats(driver, current_season="2025"):
+def calculate_driver_stats(driver, race_results, qualifying_results, current_season=settings.CURRENT_SEASON):
     """Calculate comprehensive stats for a driver, including fastest lap points for past seasons only (2019+)."""
-    driver_id = driver['driverId']
-    print(f"Processing {driver['givenName']} {driver['familyName']}...")
-
-    race_results = get_all_races(driver_id, "results")
-    
     total_points = 0
     total_wins = 0
     total_podiums = 0
     fastest_laps_count = 0
     seasons_raced_set = set()
 
-    for r in race_results:
-        result = r['Results'][0]
-        season = int(r['season'])
+    for result in race_results:
+        season = int(result['season'])
         points = float(result['points'])
-        if 2019 <= season < int(current_season) and 'FastestLap' in result and int(result['position']) <= 10:
+        if 2019 <= season < int(current_season) and result['fastestLap'] and result['position'].isdigit() \
+                and int(result['position']) <= 10:
             points += 1
             fastest_laps_count += 1
         total_points += points
@@ -86,11 +117,10 @@ def calculate_driver_stats(driver, current_season="2025"):
         seasons_raced_set.add(season)
 
     # Qualifying results
-    qualifying_results = get_all_races(driver_id, "qualifying")
-    total_poles = sum(1 for r in qualifying_results if r['QualifyingResults'][0]['position'] == "1")
+    total_poles = sum(1 for r in qualifying_results if r['position'] == "1")
 
     return {
-        "driverId": driver_id,
+        "driverId": driver['driverId'],
         "permanentNumber": driver.get("permanentNumber", ""),
         "code": driver.get("code", ""),
         "givenName": driver["givenName"],
@@ -106,39 +136,157 @@ def calculate_driver_stats(driver, current_season="2025"):
     }
 
 
-def save_to_json(data, filename=DRIVERS_FILE):
-    """Save driver stats to JSON inside AppData."""
-    with filename.open("w", encoding="utf-8") as f:
-        json.dump(data, f, indent=4, ensure_ascii=False)
+def save_stats(stats, filename=DRIVERS_FILE):
+    """Save driver stats as a binary table keyed by driverId."""
+    write_table(filename, STATS_COLUMNS, stats, "driverId")
+
+
+def save_driver_races(driver_races, filename=RACES_FILE):
+    """Save every driver's career races as one binary table keyed by driverId."""
+    write_table(filename, RACE_COLUMNS, driver_races, "driverId")
+
+# ---------- Checkpoints ----------
+
+def new_checkpoint(season):
+    return {"season": str(season), "started": time.time(), "drivers": None, "units": {}}
+
+
+def load_checkpoint(season):
+    """Resume state of an interrupted crawl of this season, or a fresh one."""
+    checkpoint = load_state(CHECKPOINT_FILE, CHECKPOINT_SCHEMA, CHECKPOINT_VERSION)
+    if (not checkpoint or checkpoint.get("season") != str(season)
+            or time.time() - checkpoint.get("started", 0) > CHECKPOINT_MAX_AGE):
+        return new_checkpoint(season)
+    return checkpoint
+
+
+def seed_from_dump(checkpoint):
+    """
+    Pre-fill the careers held by an imported Ergast dump (settings.ERGAST_DB),
+    so the crawl only requests the races after it.
+    """
+    # imported here: ergast_import builds on this module
+    from services.ergast_import import dump_units
+    missing = [d["driverId"] for d in checkpoint["drivers"] if d["driverId"] not in checkpoint["units"]]
+    seeded = dump_units(checkpoint["season"], missing)
+    checkpoint["units"].update(seeded)
+    if seeded:
+        print(f"📦 Seeded {len(seeded)} careers from {settings.ERGAST_DB.name}")
+
+
+def save_checkpoint(checkpoint):
+    # rewritten after every page and holds whole careers: keep it compact
+    save_state(CHECKPOINT_FILE, checkpoint, CHECKPOINT_SCHEMA, CHECKPOINT_VERSION, compress=True)
+
+
+class Progress:
+    """Counts drivers and requests for the progress callback and estimates the ETA."""
+    def __init__(self, callback, total, done):
+        self.callback = callback
+        self.total = total
+        self.done = done
+        self.done_at_start = done
+        self.requests = 0
+        self.started = time.monotonic()
+
+    def report(self, driver=None):
+        if not self.callback:
+            return
+        finished_now = self.done - self.done_at_start
+        eta = None
+        if finished_now:
+            per_driver = (time.monotonic() - self.started) / finished_now
+            eta = per_driver * (self.total - self.done)
+        self.callback({
+            "drivers_done": self.done,
+            "drivers_total": self.total,
+            "requests": self.requests,
+            "eta_seconds": eta,
+            "driver": driver,
+        })
+
+
+def crawl_driver(driver, unit, checkpoint, progress):
+    """Fetch one driver's results and qualifying pages, checkpointing each page."""
+    driver_id = driver["driverId"]
+    for endpoint in ("results", "qualifying"):
+        state = unit.setdefault(endpoint, {"offset": 0, "total": None, "races": []})
+        if state["total"] is not None and state["offset"] >= state["total"]:
+            continue
+
+        def on_page(races, offset, total, state=state):
+            state["races"].extend(races)
+            state["offset"], state["total"] = offset, total
+            progress.requests += 1
+            save_checkpoint(checkpoint)
+            progress.report(driver_id)
+
+        get_all_races(driver_id, endpoint, offset=state["offset"], on_page=on_page)
+        if state["total"] is None:
+            state["total"] = state["offset"]
 
 # ---------- Main ----------
 
-def main():
-    drivers = get_current_drivers()
-    stats = []
-    processed_races = {}
+def main(progress=None, current_season=settings.CURRENT_SEASON):
+    """
+    Crawl every current driver's career and save stats + races.
+    Progress is checkpointed per driver and page, so an interrupted run
+    resumes where it stopped. progress(dict) receives drivers_done,
+    drivers_total, requests, eta_seconds and the driver being fetched.
+    """
+    checkpoint = load_checkpoint(current_season)
+    if checkpoint["drivers"] is None:
+        checkpoint["drivers"] = get_current_drivers(current_season)
+        seed_from_dump(checkpoint)
+        save_checkpoint(checkpoint)
+    drivers = checkpoint["drivers"]
+    units = checkpoint["units"]
 
-    for driver in drivers:
-        driver_stats = calculate_driver_stats(driver)
-        stats.append(driver_stats)
+    done = sum(1 for d in drivers if units.get(d["driverId"], {}).get("done"))
+    if done:
+        print(f"↻ Resuming stats crawl: {done}/{len(drivers)} drivers already fetched")
+    tracker = Progress(progress, len(drivers), done)
+    tracker.report()
 
-        driver_id = driver_stats['driverId']
-        race_results = get_all_races(driver_id, "results")
-        processed_races[driver_id] = [
-            {"raceName": r["raceName"], "date": r["date"]} for r in race_results
-        ]
+    for driver in drivers:
+        unit = units.setdefault(driver["driverId"], {})
+        if unit.get("done"):
+            continue
+        print(f"Processing {driver['givenName']} {driver['familyName']}...")
+        crawl_driver(driver, unit, checkpoint, tracker)
+        unit["done"] = True
+        save_checkpoint(checkpoint)
+        tracker.done += 1
+        tracker.report(driver["driverId"])
 
-        time.sleep(0.5)  # small delay to avoid server reset
+    stats = []
+    driver_races = []
+    for driver in drivers:
+        unit = units[driver["driverId"]]
+        results = unit["results"]["races"]
+        stats.append(calculate_driver_stats(driver, results, unit["qualifying"]["races"], current_season))
+        driver_races.extend(
+            {"driverId": driver["driverId"], "season": r["season"], "round": r["round"],
+             "raceName": r["raceName"], "date": r["date"]}
+            for r in results
+        )
 
     # Save stats
-    save_to_json(stats, DRIVERS_FILE)
+    save_stats(stats)
     print(f"✅ Driver stats saved to {DRIVERS_FILE}")
 
-    # Save processed races 
-    with PROCESSED_FILE.open("w", encoding="utf-8") as f:
-        json.dump(processed_races, f, indent=4)
-    print(f"✅ Processed races saved to {PROCESSED_FILE}")
+    # Save every driver's career races (processed_races.json is owned by update_json)
+    save_driver_races(driver_races)
+    print(f"✅ Driver races saved to {RACES_FILE}")
+
+    delete_state(CHECKPOINT_FILE)
+    return stats
+
+
+def print_progress(p):
+    eta = f", ETA {p['eta_seconds']:.0f}s" if p["eta_seconds"] is not None else ""
+    print(f"[{p['drivers_done']}/{p['drivers_total']} drivers, {p['requests']} requests{eta}]")
 
 
 if __name__ == "__main__":
-    main()
+    main(progress=print_progress)
@@ -0,0 +1,46 @@
+# -- services/diff.py
+
+def row_key(row, key):
+    """Key of a row, where key is either a dict field name or a callable."""
+    return key(row) if callable(key) else row.get(key)
+
+
+def diff_rows(old_rows, new_rows, key, fields):
+    """
+    Keyed diff between two ordered datasets (lists of dicts).
+    Returns a dictionary with:
+        order   - keys of new_rows in display order
+        added   - keys only present in new_rows
+        removed - keys only present in old_rows
+        moved   - {key: (old_index, new_index)} for rows that changed place
+        changed - {key: [fields]} for rows whose compared fields differ
+    """
+    old_index = {row_key(r, key): i for i, r in enumerate(old_rows)}
+    new_index = {row_key(r, key): i for i, r in enumerate(new_rows)}
+
+    added = [k for k in new_index if k not in old_index]
+    removed = [k for k in old_index if k not in new_index]
+    moved = {}
+    changed = {}
+    for k, i in new_index.items():
+        if k not in old_index:
+            continue
+        j = old_index[k]
+        if i != j:
+            moved[k] = (j, i)
+        old, new = old_rows[j], new_rows[i]
+        fields_changed = [f for f in fields if old.get(f) != new.get(f)]
+        if fields_changed:
+            changed[k] = fields_changed
+
+    return {
+        "order": list(new_index),
+        "added": added,
+        "removed": removed,
+        "moved": moved,
+        "changed": changed,
+    }
+
+
+def has_changes(diff):
+    return bool(diff["added"] or diff["removed"] or diff["moved"] or diff["changed"])
@@ -0,0 +1,463 @@
+# -- services/ergast_import.py
+# Bulk import of an Ergast-format database dump into a local SQLite file
+# (settings.ERGAST_DB). Accepts the CSV release (zip or extracted directory)
+# or the MySQL .sql dump. Rows are streamed and inserted in batches, and
+# indexes are built once at the end.
+#
+# From the imported data, all-time driver stats are bootstrapped with no API
+# calls, and every d_stats crawl seeds its careers from it (dump_units), so
+# it only fetches what came after the dump.
+#
+#   python -m services.ergast_import <dump> [--stats]
+import argparse
+import csv
+import io
+import logging
+import re
+import sqlite3
+import time
+import zipfile
+from pathlib import Path
+from config import settings
+from services import d_stats
+
+logger = logging.getLogger(__name__)
+
+NULL = "\\N"    # Ergast's NULL in CSV files
+
+# Built after the bulk insert; (table, columns)
+INDEXES = [
+    ("races", ("year", "round")),
+    ("drivers", ("driverRef",)),
+    ("results", ("driverId", "raceId")),
+    ("results", ("raceId", "positionOrder")),
+    ("qualifying", ("driverId", "raceId")),
+    ("driver_standings", ("raceId",)),
+    ("constructor_standings", ("raceId",)),
+]
+
+
+# ---- Loading ----
+
+class Importer:
+    """Creates tables and batches inserts into one SQLite connection."""
+    def __init__(self, conn, batch_size=None):
+        self.conn = conn
+        self.batch_size = batch_size or settings.IMPORT_BATCH_SIZE
+        self.columns = {}
+        self.counts = {}
+
+    def begin_table(self, table, columns):
+        self.columns[table] = columns
+        self.counts[table] = 0
+        # NUMERIC affinity stores "2023" as an integer but keeps "1:27.452" text
+        definition = ", ".join(f'"{c}" NUMERIC' for c in columns)
+        self.conn.execute(f'DROP TABLE IF EXISTS "{table}"')
+        self.conn.execute(f'CREATE TABLE "{table}" ({definition})')
+
+    def insert(self, table, rows):
+        """Insert an iterable of rows, batch_size rows per executemany."""
+        placeholders = ", ".join("?" * len(self.columns[table]))
+        sql = f'INSERT INTO "{table}" VALUES ({placeholders})'
+        batch = []
+        for row in rows:
+            batch.append(row)
+            if len(batch) >= self.batch_size:
+                self.conn.executemany(sql, batch)
+                self.counts[table] += len(batch)
+                batch = []
+        if batch:
+            self.conn.executemany(sql, batch)
+            self.counts[table] += len(batch)
+
+    def finish(self):
+        for table, columns in INDEXES:
+            if table in self.columns and all(c in self.columns[table] for c in columns):
+                name = f"idx_{table}_{'_'.join(columns)}"
+                self.conn.execute(f'CREATE INDEX "{name}" ON "{table}" ({", ".join(columns)})')
+        self.conn.commit()
+
+
+def _csv_rows(reader):
+    for row in reader:
+        yield [None if value == NULL else value for value in row]
+
+
+def load_csv(importer, name, text_stream):
+    reader = csv.reader(text_stream)
+    columns = next(reader)
+    table = Path(name).stem
+    importer.begin_table(table, columns)
+    importer.insert(table, _csv_rows(reader))
+
+
+def load_csv_dump(importer, path):
+    """Every *.csv in a directory or zip; the file name is the table name."""
+    if path.is_dir():
+        for csv_path in sorted(path.glob("*.csv")):
+            with csv_path.open(encoding="utf-8", newline="") as f:
+                load_csv(importer, csv_path.name, f)
+        return
+    with zipfile.ZipFile(path) as archive:
+        for name in archive.namelist():
+            if name.endswith(".csv"):
+                with archive.open(name) as raw:
+                    load_csv(importer, name, io.TextIOWrapper(raw, encoding="utf-8", newline=""))
+
+
+_CREATE = re.compile(r"CREATE TABLE `(\w+)`")
+_COLUMN = re.compile(r"\s+`(\w+)`\s")
+_INSERT = re.compile(r"INSERT INTO `(\w+)`(?: \([^)]*\))? VALUES\s*")
+_VALUE = re.compile(r"'((?:[^'\\]|\\.)*)'|(NULL)\b|(\()|(\))|([^,()'\s;]+)", re.S)
+_ESCAPES = {"n": "\n", "r": "\r", "t": "\t", "0": "\0"}
+
+
+def _unescape(text):
+    return re.sub(r"\\(.)", lambda m: _ESCAPES.get(m[1], m[1]), text)
+
+
+def _sql_rows(values):
+    """Rows of a MySQL `VALUES (..),(..);` list."""
+    row = None
+    for m in _VALUE.finditer(values):
+        quoted, null, opened, closed, bare = m.groups()
+        if opened:
+            row = []
+        elif closed:
+            yield row
+            row = None
+        elif row is None:
+            continue
+        elif quoted is not None:
+            row.append(_unescape(quoted))
+        elif null:
+            row.append(None)
+        else:
+            row.append(bare)
+
+
+def load_sql_dump(importer, path):
+    """A mysqldump file: CREATE TABLE gives the columns, each INSERT line a batch."""
+    table = None
+    columns = None
+    with open(path, encoding="utf-8") as f:
+        for line in f:
+            created = _CREATE.match(line)
+            if created:
+                table, columns = created[1], []
+                continue
+            if columns is not None:
+                column = _COLUMN.match(line)
+                if column:
+                    columns.append(column[1])
+                elif line.startswith(")"):
+                    importer.begin_table(table, columns)
+                    columns = None
+                continue
+            inserted = _INSERT.match(line)
+            if inserted:
+                importer.insert(inserted[1], _sql_rows(line[inserted.end():]))
+
+
+def import_dump(path, db_path=None):
+    """
+    Import an Ergast dump (CSV zip/directory or .sql) into db_path, replacing
+    its previous contents. Returns {table: row count}.
+    """
+    path = Path(path)
+    db_path = Path(db_path or settings.ERGAST_DB)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+    started = time.perf_counter()
+
+    conn = sqlite3.connect(db_path)
+    try:
+        # bulk load: a lost import is simply re-run, so skip the journal
+        conn.execute("PRAGMA journal_mode = OFF")
+        conn.execute("PRAGMA synchronous = OFF")
+        importer = Importer(conn)
+        if path.suffix == ".sql":
+            load_sql_dump(importer, path)
+        else:
+            load_csv_dump(importer, path)
+        importer.finish()
+    finally:
+        conn.close()
+
+    logger.info("Imported %d rows from %s in %.1fs", sum(importer.counts.values()),
+                path, time.perf_counter() - started)
+    return importer.counts
+
+
+# ---- Queries ----
+
+def connect(db_path=None):
+    """Read connection to the imported dump, or None if there is none."""
+    db_path = Path(db_path or settings.ERGAST_DB)
+    if not db_path.exists():
+        return None
+    conn = sqlite3.connect(f"file:{db_path}?mode=ro", uri=True)
+    conn.row_factory = sqlite3.Row
+    return conn
+
+
+def latest_season(conn):
+    return conn.execute("SELECT MAX(year) FROM races WHERE raceId IN (SELECT raceId FROM results)").fetchone()[0]
+
+
+def has_season(season, db_path=None):
+    """
+    True when the dump holds the whole season. The dump's newest season may
+    have been cut off mid-year, so only seasons before it count.
+    """
+    if int(season) >= int(settings.CURRENT_SEASON):
+        return False
+    conn = connect(db_path)
+    if conn is None:
+        return False
+    try:
+        latest = latest_season(conn)
+        return latest is not None and int(season) < latest
+    except sqlite3.Error:
+        return False
+    finally:
+        conn.close()
+
+
+def season_winners(season, db_path=None):
+    """Race winners of a past season, shaped like results.parse_race_winners."""
+    conn = connect(db_path)
+    try:
+        rows = conn.execute("""
+            SELECT r.round, d.forename, d.surname, d.nationality, d.code, c.name AS constructor
+            FROM results res
+            JOIN races r ON r.raceId = res.raceId
+            JOIN drivers d ON d.driverId = res.driverId
+            JOIN constructors c ON c.constructorId = res.constructorId
+            WHERE r.year = ? AND res.positionOrder = 1
+            ORDER BY r.round
+        """, (int(season),))
+        return {
+            str(row["round"]): {
+                "driverName": f"{row['forename']} {row['surname']}",
+                "constructor": row["constructor"],
+                "driverNationality": row["nationality"],
+                "driverCode": row["code"],
+            }
+            for row in rows
+        }
+    finally:
+        conn.close()
+
+
+def season_driver_standings(season, db_path=None):
+    """Final driver standings of a past season, shaped like d_standings.parse_driver_standings."""
+    conn = connect(db_path)
+    try:
+        rows = conn.execute("""
+            SELECT ds.position, ds.positionText, ds.points, ds.wins,
+                   d.driverRef, d.number, d.code, d.url AS driverUrl, d.forename, d.surname,
+                   d.dob, d.nationality,
+                   c.constructorRef, c.name AS constructorName, c.url AS constructorUrl,
+                   c.nationality AS constructorNationality
+            FROM driver_standings ds
+            JOIN drivers d ON d.driverId = ds.driverId
+            LEFT JOIN constructors c ON c.constructorId = (
+                SELECT res.constructorId FROM results res JOIN races rr ON rr.raceId = res.raceId
+                WHERE res.driverId = ds.driverId AND rr.year = ?
+                ORDER BY rr.round DESC LIMIT 1)
+            WHERE ds.raceId = (
+                SELECT r.raceId FROM races r
+                WHERE r.year = ? AND r.raceId IN (SELECT raceId FROM driver_standings)
+                ORDER BY r.round DESC LIMIT 1)
+            ORDER BY ds.position
+        """, (int(season), int(season)))
+        return [
+            {
+                "position": str(row["position"]),
+                "positionText": str(row["positionText"]),
+                "points": str(row["points"]),
+                "wins": str(row["wins"]),
+                "driverId": row["driverRef"],
+                "permanentNumber": None if row["number"] is None else str(row["number"]),
+                "code": row["code"],
+                "driverUrl": row["driverUrl"],
+                "givenName": row["forename"],
+                "familyName": row["surname"],
+                "dateOfBirth": row["dob"],
+                "nationality": row["nationality"],
+                "driverName": f"{row['forename']} {row['surname']}",
+                "constructorId": row["constructorRef"],
+                "constructorName": row["constructorName"],
+                "constructorUrl": row["constructorUrl"],
+                "constructorNationality": row["constructorNationality"],
+            }
+            for row in rows
+        ]
+    finally:
+        conn.close()
+
+
+def season_constructor_standings(season, db_path=None):
+    """Final constructor standings of a past season, shaped like c_standings.parse_constructors_standings."""
+    conn = connect(db_path)
+    try:
+        rows = conn.execute("""
+            SELECT cs.position, cs.positionText, cs.points, cs.wins,
+                   c.constructorRef, c.name, c.url, c.nationality
+            FROM constructor_standings cs
+            JOIN constructors c ON c.constructorId = cs.constructorId
+            WHERE cs.raceId = (
+                SELECT r.raceId FROM races r
+                WHERE r.year = ? AND r.raceId IN (SELECT raceId FROM constructor_standings)
+                ORDER BY r.round DESC LIMIT 1)
+            ORDER BY cs.position
+        """, (int(season),))
+        return [
+            {
+                "position": str(row["position"]),
+                "positionText": str(row["positionText"]),
+                "points": str(row["points"]),
+                "wins": str(row["wins"]),
+                "constructorId": row["constructorRef"],
+                "constructorName": row["name"],
+                "constructorUrl": row["url"],
+                "constructorNationality": row["nationality"],
+            }
+            for row in rows
+        ]
+    finally:
+        conn.close()
+
+
+# ---- Bootstrapping d_stats ----
+
+def _driver_record(row):
+    """A driver row in the API's Driver shape."""
+    return {
+        "driverId": row["driverRef"],
+        "permanentNumber": "" if row["number"] is None else str(row["number"]),
+        "code": row["code"] or "",
+        "givenName": row["forename"],
+        "familyName": row["surname"],
+        "nationality": row["nationality"],
+        "dateOfBirth": row["dob"],
+    }
+
+
+def career_units(conn, season, driver_refs=None):
+    """
+    {driverRef: (driver, results, qualifying)} for races before `season`,
+    in the reduced shape d_stats.reduce_race produces from the API.
+    Defaults to the drivers of the newest season in the dump.
+    """
+    if driver_refs is None:
+        driver_refs = [row[0] for row in conn.execute("""
+            SELECT DISTINCT d.driverRef FROM results res
+            JOIN races r ON r.raceId = res.raceId JOIN drivers d ON d.driverId = res.driverId
+            WHERE r.year = ?
+        """, (latest_season(conn),))]
+    units = {}
+    for ref in driver_refs:
+        driver = conn.execute("SELECT * FROM drivers WHERE driverRef = ?", (ref,)).fetchone()
+        if driver is None:
+            continue
+        results = [
+            {
+                "season": str(row["year"]), "round": str(row["round"]),
+                "raceName": row["name"], "date": row["date"],
+                "position": str(row["positionOrder"]), "points": str(row["points"]),
+                # the API attaches a FastestLap block whenever a fastest lap is recorded
+                "fastestLap": row["fastestLap"] is not None,
+            }
+            for row in conn.execute("""
+                SELECT r.year, r.round, r.name, r.date, res.positionOrder, res.points, res.fastestLap
+                FROM results res JOIN races r ON r.raceId = res.raceId
+                WHERE res.driverId = ? AND r.year < ?
+                ORDER BY r.year, r.round
+            """, (driver["driverId"], int(season)))
+        ]
+        qualifying = [
+            {"season": str(row["year"]), "round": str(row["round"]), "position": str(row["position"])}
+            for row in conn.execute("""
+                SELECT r.year, r.round, q.position
+                FROM qualifying q JOIN races r ON r.raceId = q.raceId
+                WHERE q.driverId = ? AND r.year < ?
+                ORDER BY r.year, r.round
+            """, (driver["driverId"], int(season)))
+        ]
+        units[ref] = (_driver_record(driver), results, qualifying)
+    return units
+
+
+def dump_units(season, driver_ids, db_path=None):
+    """
+    d_stats checkpoint units for the given drivers, pre-filled with their
+    careers before `season` from the dump. The API lists a driver's races
+    oldest first, so what the dump holds is exactly the first len(results)
+    rows: the crawl resumes there. Drivers missing from the dump are left
+    out; returns {} without a dump.
+    """
+    conn = connect(db_path)
+    if conn is None:
+        return {}
+    try:
+        units = career_units(conn, season, driver_ids)
+    finally:
+        conn.close()
+    return {
+        ref: {
+            "results": {"offset": len(results), "total": None, "races": results},
+            "qualifying": {"offset": len(qualifying), "total": None, "races": qualifying},
+        }
+        for ref, (_, results, qualifying) in units.items()
+    }
+
+
+def bootstrap_stats(db_path=None, season=settings.CURRENT_SEASON):
+    """
+    Write driver stats and career races from the dump alone (no API calls).
+    The next d_stats crawl seeds itself from the dump (dump_units) and only
+    fetches what came after it: the live season.
+    """
+    conn = connect(db_path)
+    if conn is None:
+        raise FileNotFoundError(db_path or settings.ERGAST_DB)
+    try:
+        units = career_units(conn, season)
+    finally:
+        conn.close()
+
+    stats = []
+    driver_races = []
+    for ref, (driver, results, qualifying) in units.items():
+        stats.append(d_stats.calculate_driver_stats(driver, results, qualifying, season))
+        driver_races.extend(
+            {"driverId": ref, "season": r["season"], "round": r["round"],
+             "raceName": r["raceName"], "date": r["date"]}
+            for r in results
+        )
+
+    d_stats.save_stats(stats)
+    d_stats.save_driver_races(driver_races)
+    logger.info("Bootstrapped stats for %d drivers from %s", len(stats), db_path or settings.ERGAST_DB)
+    return stats
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Import an Ergast database dump")
+    parser.add_argument("dump", help="CSV zip, directory of CSV files, or .sql dump")
+    parser.add_argument("--db", default=None, help=f"SQLite output (default {settings.ERGAST_DB})")
+    parser.add_argument("--stats", action="store_true", help="bootstrap driver stats afterwards")
+    args = parser.parse_args()
+    logging.basicConfig(level=settings.LOG_LEVEL, format="%(asctime)s [%(levelname)s] %(message)s")
+
+    counts = import_dump(args.dump, args.db)
+    for table, count in sorted(counts.items()):
+        print(f"  {table}: {count} rows")
+    if args.stats:
+        stats = bootstrap_stats(args.db)
+        print(f"✅ Driver stats bootstrapped for {len(stats)} drivers")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,227 @@
+# -- services/laps.py
+# Lap-by-lap timing per race, from /{season}/{round}/laps.
+#
+# A race is held as columns of driver index x lap, flattened row-major
+# (driver i, lap n at i * laps + n - 1): lap times in integer milliseconds
+# and running positions, 0 where a driver has no lap (retired / lapped).
+# Final races are written under LAPS_DIR as
+#   header   magic "F1LP", version, driver count, lap count, id blob length
+#   ids      driver ids, "\n"-separated UTF-8
+#   times    int32 per cell
+#   places   int16 per cell
+# and never fetched again; loading one is three bytes -> array copies.
+import struct
+import sys
+import threading
+from array import array
+from datetime import datetime, timedelta, timezone
+from functools import partial
+from config import settings
+from utils.api_helper import fetch_api_stream, iter_pages
+from services.schedule_view import parse_utc
+from services.storage import atomic_write_bytes
+
+MAGIC = b"F1LP"
+VERSION = 1
+HEADER = struct.Struct("<4sHHHI")
+
+
+class FormatError(Exception):
+    pass
+
+
+def parse_lap_time(text):
+    """"1:31.234" (or "31.234", "1:02:03.456") -> milliseconds; 0 if missing."""
+    if not text:
+        return 0
+    seconds = 0.0
+    for part in text.split(":"):
+        seconds = seconds * 60 + float(part)
+    return round(seconds * 1000)
+
+
+def format_lap_time(ms):
+    if not ms:
+        return "—"
+    minutes, ms = divmod(ms, 60_000)
+    return f"{minutes}:{ms / 1000:06.3f}"
+
+
+class LapTable:
+    """Lap times and positions of one race as flat driver x lap arrays."""
+    def __init__(self, season, round_no, drivers, laps, times, positions):
+        self.season = str(season)
+        self.round = str(round_no)
+        self.drivers = list(drivers)
+        self.laps = laps
+        self.times = times
+        self.positions = positions
+        self._index = {driver_id: i for i, driver_id in enumerate(self.drivers)}
+
+    def index(self, driver_id):
+        return self._index[driver_id]
+
+    def _row(self, column, driver):
+        i = driver if isinstance(driver, int) else self._index[driver]
+        return column[i * self.laps:(i + 1) * self.laps]
+
+    def lap_times(self, driver):
+        """One driver's lap times in ms (index or driverId), lap 1 first."""
+        return self._row(self.times, driver)
+
+    def lap_positions(self, driver):
+        return self._row(self.positions, driver)
+
+    def laps_completed(self, driver):
+        times = self.lap_times(driver)
+        return next((n for n in range(self.laps, 0, -1) if times[n - 1]), 0)
+
+    def best_lap(self, driver):
+        """(lap number, ms) of a driver's fastest lap, or None."""
+        times = self.lap_times(driver)
+        laps = [(ms, n + 1) for n, ms in enumerate(times) if ms]
+        if not laps:
+            return None
+        ms, lap = min(laps)
+        return lap, ms
+
+    def cumulative_times(self):
+        """Race time in ms at the end of every lap, same layout as times; 0 after a driver stops."""
+        out = array("i", bytes(len(self.times) * 4))
+        for i in range(len(self.drivers)):
+            total = 0
+            base = i * self.laps
+            for n in range(self.laps):
+                ms = self.times[base + n]
+                if not ms:
+                    break
+                total += ms
+                out[base + n] = total
+        return out
+
+    # ---- Binary form ----
+
+    def to_bytes(self):
+        ids = "\n".join(self.drivers).encode("utf-8")
+        times, positions = array("i", self.times), array("h", self.positions)
+        if sys.byteorder == "big":
+            times.byteswap()
+            positions.byteswap()
+        return (HEADER.pack(MAGIC, VERSION, len(self.drivers), self.laps, len(ids))
+                + ids + times.tobytes() + positions.tobytes())
+
+    @classmethod
+    def from_bytes(cls, season, round_no, blob):
+        if len(blob) < HEADER.size:
+            raise FormatError("lap table is truncated")
+        magic, version, count, laps, ids_size = HEADER.unpack_from(blob)
+        if magic != MAGIC or version != VERSION:
+            raise FormatError(f"not a version {VERSION} lap table")
+        cells = count * laps
+        offset = HEADER.size + ids_size
+        if len(blob) != offset + cells * 6:
+            raise FormatError("lap table is truncated")
+        drivers = blob[HEADER.size:offset].decode("utf-8").split("\n") if count else []
+        times, positions = array("i"), array("h")
+        times.frombytes(blob[offset:offset + cells * 4])
+        positions.frombytes(blob[offset + cells * 4:])
+        if sys.byteorder == "big":
+            times.byteswap()
+            positions.byteswap()
+        return cls(season, round_no, drivers, laps, times, positions)
+
+
+# ---- Ingestion ----
+
+def reduce_laps_page(race):
+    """One page's race record -> its timing rows as (lap, driverId, position, ms)."""
+    return {
+        "date": race.get("date"),
+        "time": race.get("time"),
+        "rows": [(int(lap["number"]), t["driverId"], int(t.get("position") or 0), parse_lap_time(t.get("time")))
+                 for lap in race.get("Laps", []) for t in lap.get("Timings", [])],
+    }
+
+
+def build_table(season, round_no, rows):
+    """
+    Columnar table from timing rows in any order. Ergast pages by timing
+    row, so a lap split across two pages simply contributes rows to both.
+    Drivers are ordered by their position on lap 1.
+    """
+    laps = max((lap for lap, _, _, _ in rows), default=0)
+    first_lap = {}
+    for lap, driver_id, position, _ in rows:
+        if lap == 1 or driver_id not in first_lap:
+            first_lap[driver_id] = (lap, position)
+    drivers = sorted(first_lap, key=lambda d: first_lap[d])
+    index = {driver_id: i for i, driver_id in enumerate(drivers)}
+
+    times = array("i", bytes(len(drivers) * laps * 4))
+    positions = array("h", bytes(len(drivers) * laps * 2))
+    for lap, driver_id, position, ms in rows:
+        cell = index[driver_id] * laps + lap - 1
+        times[cell] = ms
+        positions[cell] = position
+    return LapTable(season, round_no, drivers, laps, times, positions)
+
+
+def fetch_race_laps(season, round_no):
+    """
+    Download every page of a race's laps (pages after the first in parallel,
+    each decoded as it streams) and build its table.
+    Returns (table, race start in UTC or None).
+    """
+    stream = partial(fetch_api_stream, table="RaceTable", items_key="Races", reduce=reduce_laps_page)
+    rows = []
+    start = None
+    for _, _, races in iter_pages(f"{season}/{round_no}/laps", "RaceTable", "Races", fetch=stream):
+        for race in races:
+            rows.extend(race["rows"])
+            if race["date"] and start is None:
+                start = parse_utc(race["date"], race["time"])
+    return build_table(season, round_no, rows), start
+
+
+# ---- Store ----
+
+_final = {}         # (season, round) -> LapTable of a final race, for this session
+_lock = threading.Lock()
+
+
+def laps_path(season, round_no):
+    return settings.LAPS_DIR / f"{season}_{int(round_no):02d}.laps"
+
+
+def is_final(start, now=None):
+    """True once a race's classification can no longer change (RESULTS_FINAL_AFTER)."""
+    now = now or datetime.now(timezone.utc)
+    return start is not None and now >= start + timedelta(seconds=settings.RESULTS_FINAL_AFTER)
+
+
+def load_stored_laps(season, round_no):
+    """The stored table of a final race, or None."""
+    try:
+        return LapTable.from_bytes(season, round_no, laps_path(season, round_no).read_bytes())
+    except (OSError, FormatError, UnicodeDecodeError):
+        return None
+
+
+def get_race_laps(season, round_no):
+    """
+    Lap table of a race. Final races come from memory or LAPS_DIR once
+    fetched and stored; a race still settling is fetched every time.
+    """
+    key = (str(season), str(round_no))
+    with _lock:
+        table = _final.get(key)
+    if table is None:
+        table = load_stored_laps(season, round_no)
+    if table is None:
+        table, start = fetch_race_laps(season, round_no)
+        if not (is_final(start) and table.laps):
+            return table
+        atomic_write_bytes(laps_path(season, round_no), table.to_bytes())
+    with _lock:
+        _final[key] = table
+    return table
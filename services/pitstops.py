@@ -0,0 +1,151 @@
+# -- services/pitstops.py
+# Pit-stop analytics for a season, from /{season}/{round}/pitstops.
+#
+# Every completed round is fetched in parallel. Rounds whose results are
+# final (RESULTS_FINAL_AFTER) are kept in PITSTOPS_DIR as one binstore
+# table per season keyed by round, so they are never fetched again.
+# Durations are pit-lane times in ms. Each stop carries the constructor
+# the driver raced for in that round, taken from the season's results
+# (one paginated download for all rounds), so mid-season swaps count for
+# the right team. The page only reads the summary.
+import statistics
+from array import array
+from concurrent.futures import ThreadPoolExecutor
+from datetime import datetime, timedelta, timezone
+from config import settings
+from utils.api_helper import iter_pages, paginate
+from services.binstore import write_table, Table, FormatError, INT, STR
+from services.Schedule import get_race_schedule
+from services.laps import parse_lap_time, is_final
+from services.schedule_view import parse_utc
+
+STOP_COLUMNS = [
+    ("round", STR), ("driverId", STR), ("driverName", STR), ("constructor", STR),
+    ("lap", INT), ("stop", INT), ("duration", INT),
+]
+
+
+def stops_path(season):
+    return settings.PITSTOPS_DIR / f"pitstops_{season}.bin"
+
+
+def season_entrants(season):
+    """
+    round -> {driverId: (name, constructor name)} for every race of a
+    season, from one paginated /results download (about five pages) rather
+    than a request per round. Ergast splits races across pages; each page
+    just adds its rows.
+    """
+    entrants = {}
+    for race in paginate(f"{season}/results", "RaceTable", "Races"):
+        drivers = entrants.setdefault(race["round"], {})
+        for result in race.get("Results", []):
+            driver = result["Driver"]
+            drivers[driver["driverId"]] = (f"{driver.get('givenName')} {driver.get('familyName')}",
+                                           result.get("Constructor", {}).get("name") or "Unknown")
+    return entrants
+
+
+def parse_stop(round_no, stop, entrants):
+    name, constructor = entrants.get(stop["driverId"], (stop["driverId"], "Unknown"))
+    return {
+        "round": str(round_no),
+        "driverId": stop["driverId"],
+        "driverName": name,
+        "constructor": constructor,
+        "lap": int(stop.get("lap") or 0),
+        "stop": int(stop.get("stop") or 0),
+        "duration": parse_lap_time(stop.get("duration")),
+    }
+
+
+def fetch_round_stops(season, round_no, entrants):
+    """All stops of one race (every page of the endpoint); entrants maps each driver to their team that day."""
+    return [parse_stop(round_no, stop, entrants)
+            for _, _, races in iter_pages(f"{season}/{round_no}/pitstops", "RaceTable", "Races")
+            for race in races for stop in race.get("PitStops", [])]
+
+
+def load_stored_stops(season):
+    """round -> stops of the final rounds stored for a season."""
+    try:
+        with Table(stops_path(season)) as table:
+            if table.columns != STOP_COLUMNS:
+                return {}       # older layout: fetch again
+            return {key: table.lookup(key) for key in table.keys()}
+    except (OSError, FormatError):
+        return {}
+
+
+def get_season_stops(season=settings.CURRENT_SEASON, now=None):
+    """
+    round -> list of stops for every completed round of a season. Stored
+    rounds are read from disk; the rest are fetched concurrently, and the
+    ones that are now final are added to the store.
+    """
+    now = now or datetime.now(timezone.utc)
+    race_duration = timedelta(seconds=settings.RACE_DURATION)
+    starts = {race["round"]: parse_utc(race["date"], race.get("time"))
+              for race in get_race_schedule(season) if race.get("date")}
+    completed = [r for r, start in starts.items() if start + race_duration <= now]
+
+    stops = load_stored_stops(season)
+    missing = [r for r in completed if r not in stops]
+    if missing:
+        entrants = season_entrants(season)
+        workers = min(settings.API_CONCURRENCY, len(missing))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="pitstops") as pool:
+            fetched = dict(zip(missing, pool.map(
+                lambda r: fetch_round_stops(season, r, entrants.get(r, {})), missing)))
+        final = {r: rows for r, rows in fetched.items() if rows and is_final(starts[r], now)}
+        if final:
+            stored = dict(stops)
+            stored.update(final)
+            write_table(stops_path(season), STOP_COLUMNS,
+                        [row for r in sorted(stored, key=int) for row in stored[r]], key="round")
+        stops.update(fetched)
+    return {r: stops[r] for r in completed if r in stops}
+
+
+# ---- Analytics ----
+
+def summarize(durations):
+    """median / best / count of an array of durations in ms."""
+    return {
+        "median": statistics.median(durations),
+        "best": min(durations),
+        "count": len(durations),
+    }
+
+
+def group_durations(stops, key):
+    """key(stop) -> array of that group's durations, one pass over the season."""
+    groups = {}
+    for stop in stops:
+        if stop["duration"]:
+            groups.setdefault(key(stop), array("i")).append(stop["duration"])
+    return groups
+
+
+def pit_stop_summary(season=settings.CURRENT_SEASON):
+    """
+    Per-team and per-driver pit-stop distributions for a season:
+    {"rounds": n, "teams": [...], "drivers": [...]}, each row holding
+    name, median, best and count, fastest median first. Stops count for
+    the team the driver raced for in that round; a driver's row shows
+    their latest team.
+    """
+    by_round = get_season_stops(season)
+    stops = [stop for r in sorted(by_round, key=int) for stop in by_round[r]]
+    latest = {stop["driverId"]: stop for stop in stops}
+
+    teams = [dict(summarize(d), name=name)
+             for name, d in group_durations(stops, lambda s: s["constructor"]).items()]
+    drivers = [dict(summarize(d), name=latest[driver_id]["driverName"], driverId=driver_id,
+                    team=latest[driver_id]["constructor"])
+               for driver_id, d in group_durations(stops, lambda s: s["driverId"]).items()]
+    return {
+        "rounds": len(by_round),
+        "teams": sorted(teams, key=lambda row: row["median"]),
+        "drivers": sorted(drivers, key=lambda row: row["median"]),
+    }
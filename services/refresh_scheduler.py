@@ -0,0 +1,142 @@
+# -- services/refresh_scheduler.py
+import logging
+from datetime import datetime, timedelta, timezone
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from config import settings
+from services.Schedule import get_race_schedule, save_race_schedule, load_cached_schedule
+from services.schedule_view import parse_utc
+from services.worker import submit, LOW
+from utils import http_cache
+
+logger = logging.getLogger(__name__)
+
+RESULTS = "results"
+STANDINGS = "standings"
+WINNERS = "winners"
+ALL_KINDS = frozenset({RESULTS, STANDINGS, WINNERS})
+
+# What each session can change once its flag falls
+SESSION_KINDS = {
+    "sprint": frozenset({STANDINGS}),
+    "race": ALL_KINDS,
+}
+SESSION_DURATION = {
+    "sprint": settings.SPRINT_DURATION,
+    "race": settings.RACE_DURATION,
+}
+
+
+def session_windows(races):
+    """Yield (kind, round, opens, closes) for every post-session window in the season."""
+    for race in races:
+        sessions = [("race", race.get("date"), race.get("time"))]
+        if race.get("sprintDate"):
+            sessions.append(("sprint", race["sprintDate"], race.get("sprintTime")))
+        for kind, date, time in sessions:
+            if not date:
+                continue
+            opens = parse_utc(date, time) + timedelta(seconds=SESSION_DURATION[kind])
+            closes = opens + timedelta(seconds=settings.POST_SESSION_WINDOW)
+            yield kind, race.get("round"), opens, closes
+
+
+def plan_next_poll(races, now):
+    """
+    Decide when to poll next and what for.
+    Returns (delay_seconds, kinds): a short delay inside a post-session window,
+    otherwise sleep until the next window opens, capped at the idle interval.
+    """
+    live_kinds = set()
+    next_open = None
+    for kind, _, opens, closes in session_windows(races):
+        if opens <= now < closes:
+            live_kinds |= SESSION_KINDS[kind]
+        elif now < opens and (next_open is None or opens < next_open):
+            next_open = opens
+
+    if live_kinds:
+        return settings.POLL_LIVE_INTERVAL, frozenset(live_kinds)
+
+    delay = settings.POLL_IDLE_INTERVAL
+    if next_open is not None:
+        delay = min(delay, max(1, (next_open - now).total_seconds()))
+    return delay, ALL_KINDS
+
+
+def final_results_due(races, since, now):
+    """Rounds whose results became final in (since, now]."""
+    final_after = timedelta(seconds=settings.RESULTS_FINAL_AFTER)
+    due = []
+    for race in races:
+        if not race.get("date"):
+            continue
+        final_at = parse_utc(race["date"], race.get("time")) + final_after
+        if since < final_at <= now:
+            due.append(race.get("round"))
+    return due
+
+
+class RefreshScheduler(QObject):
+    """Polls live endpoints around sessions and backs off between race weekends."""
+    refreshDue = pyqtSignal(object)      # frozenset of RESULTS / STANDINGS / WINNERS
+    resultsFinal = pyqtSignal(str)       # round whose results are now final
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.races = []
+        self.last_tick = datetime.now(timezone.utc)
+        self.timer = QTimer(self)
+        self.timer.setSingleShot(True)
+        self.timer.timeout.connect(self.on_tick)
+
+    def start(self):
+        self.races = load_cached_schedule() or []
+        if not self.races:
+            submit(
+                get_race_schedule, self.on_schedule_loaded,
+                lambda e: logger.warning("Refresh scheduler could not load schedule: %s", e),
+                key="refresh-scheduler-schedule", priority=LOW
+            )
+        self.schedule_next()
+
+    def on_schedule_loaded(self, races):
+        self.races = races
+        try:
+            save_race_schedule(races)
+        except Exception as e:
+            logger.warning("Failed to cache race schedule: %s", e)
+        self.schedule_next()
+
+    def on_tick(self):
+        now = datetime.now(timezone.utc)
+        cached = load_cached_schedule()
+        if cached:
+            self.races = cached
+
+        _, kinds = plan_next_poll(self.races, now)
+        http_cache.log_metrics()        # how the previous refreshes were served
+        logger.info("Refreshing %s", ", ".join(sorted(kinds)))
+        self.refreshDue.emit(kinds)
+
+        for round_no in final_results_due(self.races, self.last_tick, now):
+            logger.info("Round %s results are final", round_no)
+            self.resultsFinal.emit(str(round_no))
+        self.last_tick = now
+        self.schedule_next()
+
+    def schedule_next(self):
+        now = datetime.now(timezone.utc)
+        delay, _ = plan_next_poll(self.races, now)
+
+        # Also wake up when a race's results become final
+        horizon = now + timedelta(seconds=delay)
+        final_after = timedelta(seconds=settings.RESULTS_FINAL_AFTER)
+        for race in self.races:
+            if race.get("date"):
+                final_at = parse_utc(race["date"], race.get("time")) + final_after
+                if now < final_at < horizon:
+                    horizon = final_at
+        delay = max(1, (horizon - now).total_seconds())
+
+        logger.info("Next data refresh in %d min", delay // 60)
+        self.timer.start(int(delay * 1000))
@@ -1,4 +1,5 @@
-from utils.api_helper import fetch_api
+from utils.api_helper import fetch_api, fetch_api_async, paginate, fetch_all_async, run_blocking
+from services import ergast_import
 from config import settings
 
 def get_last_race_results():
@@ -6,13 +7,22 @@ def get_last_race_results():
     Fetches the results of the last race in the current season.
     Returns a dictionary with race details and results.
     """
-    data = fetch_api("current/last/results")
+    return parse_last_race_results(fetch_api("current/last/results"))
+
+
+async def get_last_race_results_async():
+    return parse_last_race_results(await fetch_api_async("current/last/results"))
+
+
+def parse_last_race_results(data):
     races = data.get("MRData", {}).get("RaceTable", {}).get("Races", [])
     if not races:
         return None
 
     last_race = races[0]
     return {
+        "season": last_race.get("season"),
+        "round": last_race.get("round"),
         "raceName": last_race.get("raceName"),
         "circuit": last_race.get("Circuit", {}).get("circuitName"),
         "circuitId": last_race.get("Circuit", {}).get("circuitId", ""),
@@ -23,9 +33,18 @@ def get_last_race_results():
 
 
 def get_all_race_winners(season=settings.CURRENT_SEASON):
-    data = fetch_api(f"{season}/results/1?limit=1000")
-    races = data.get("MRData", {}).get("RaceTable", {}).get("Races", [])
-    
+    if ergast_import.has_season(season):
+        return ergast_import.season_winners(season)
+    return parse_race_winners(paginate(f"{season}/results/1", "RaceTable", "Races"))
+
+
+async def get_all_race_winners_async(season=settings.CURRENT_SEASON):
+    if await run_blocking(ergast_import.has_season, season):
+        return await run_blocking(ergast_import.season_winners, season)
+    return parse_race_winners(await fetch_all_async(f"{season}/results/1", "RaceTable", "Races"))
+
+
+def parse_race_winners(races):
     winners = {}
     for race in races:
         result = race["Results"][0]  
@@ -0,0 +1,78 @@
+# -- services/schedule_view.py
+# Turns raw schedule rows into display-ready values in one pass, so the
+# schedule page only binds prepared strings and statuses.
+from datetime import datetime, timezone
+
+COMPLETED = "completed"
+UPCOMING = "upcoming"
+FUTURE = "future"
+
+DATE_FORMAT = "%d %b %Y, %H:%M"
+
+
+def parse_utc(date, time=None):
+    time = (time or "00:00:00").replace("Z", "")
+    return datetime.fromisoformat(f"{date}T{time}").replace(tzinfo=timezone.utc)
+
+
+def build_row(race, winners):
+    start = parse_utc(race["date"], race.get("time"))
+    local = start.astimezone()
+    race = dict(race)
+    if race.get("round") in winners:
+        race["winner"] = winners[race["round"]]
+    row = {
+        "race": race,
+        "start_utc": start,
+        "start_local": local,
+        "date_text": f"Date & Time: {start.strftime(DATE_FORMAT)} UTC ({local.strftime('%H:%M')} local)",
+        "status": FUTURE,
+    }
+    if race.get("sprintDate"):
+        row["sprint_utc"] = parse_utc(race["sprintDate"], race.get("sprintTime"))
+    return row
+
+
+def build_schedule_view(races, winners=None, now=None):
+    """
+    Precompute everything the schedule page shows: session datetimes (UTC and
+    local), the winner join, each race's status and the next race index.
+    Pure function, safe to run off the GUI thread.
+    """
+    winners = winners or {}
+    view = {
+        "rows": [build_row(race, winners) for race in races],
+        "signature": tuple(
+            (r.get("round"), r.get("raceName"), r.get("date"), r.get("time"), r.get("circuitId"))
+            for r in races
+        ),
+        "next_index": None,
+        "next_change": None,
+    }
+    reevaluate(view, now)
+    return view
+
+
+def reevaluate(view, now=None):
+    """
+    Refresh statuses against the clock without re-parsing anything.
+    Returns the indices whose status changed. view["next_change"] is the
+    next race start, i.e. when this needs to run again.
+    """
+    now = now or datetime.now(timezone.utc)
+    changed = []
+    next_index = None
+    for i, row in enumerate(view["rows"]):
+        if row["start_utc"] < now:
+            status = COMPLETED
+        elif next_index is None:
+            status = UPCOMING
+            next_index = i
+        else:
+            status = FUTURE
+        if row["status"] != status:
+            row["status"] = status
+            changed.append(i)
+    view["next_index"] = next_index
+    view["next_change"] = view["rows"][next_index]["start_utc"] if next_index is not None else None
+    return changed
@@ -0,0 +1,117 @@
+# -- services/stats_repo.py
+import json
+import logging
+from PyQt6.QtCore import QObject, QFileSystemWatcher, QTimer, pyqtSignal
+from config import settings
+from services.worker import submit, LOW
+from services.binstore import Table
+
+logger = logging.getLogger(__name__)
+
+RELOAD_DELAY_MS = 250   # let a writer finish before re-reading
+
+
+def read_driver_stats(path, json_path=None):
+    """
+    Load the binary stats table into a driverId -> stats dict, falling back
+    to a legacy drivers_stats.json. The mapping is closed before returning
+    so the updater can replace the file at any time.
+    """
+    if path.exists():
+        with Table(path) as table:
+            return {row["driverId"]: row for row in table.rows()}
+    try:
+        with json_path.open("r", encoding="utf-8") as f:
+            records = json.load(f)
+    except (AttributeError, FileNotFoundError):
+        return {}
+    return {r["driverId"]: r for r in records}
+
+
+class DriverStatsRepository(QObject):
+    """
+    In-memory, driverId-indexed view of the driver stats table.
+
+    The file is parsed once on a worker thread and again only when
+    QFileSystemWatcher reports that update_json / d_stats rewrote it,
+    so lookups are dict hits with no disk I/O on the GUI thread.
+    """
+    statsChanged = pyqtSignal()
+
+    def __init__(self, path=None, json_path=None, races_path=None, parent=None):
+        super().__init__(parent)
+        self.path = path or settings.DRIVERS_STATS_BIN
+        self.json_path = json_path or settings.DRIVERS_STATS_FILE
+        self.races_path = races_path or settings.DRIVER_RACES_BIN
+        self.index = {}
+        self.loaded = False
+        self.signature = None   # (name, mtime, size) of the stats files last read
+
+        self.reload_timer = QTimer(self)
+        self.reload_timer.setSingleShot(True)
+        self.reload_timer.setInterval(RELOAD_DELAY_MS)
+        self.reload_timer.timeout.connect(self.reload)
+
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        self.watcher = QFileSystemWatcher(self)
+        # the directory tells us when the file is created or atomically replaced
+        self.watcher.addPath(str(self.path.parent))
+        self.watcher.directoryChanged.connect(self.on_changed)
+        self.watcher.fileChanged.connect(self.on_changed)
+        self.watch_file()
+        self.reload()
+
+    def get(self, driver_id):
+        return self.index.get(driver_id)
+
+    def watch_file(self):
+        if self.path.exists() and str(self.path) not in self.watcher.files():
+            self.watcher.addPath(str(self.path))
+
+    def file_signature(self):
+        """(name, mtime, size) of every stats file present; the updater rewrites them together."""
+        signature = []
+        for path in (self.path, self.races_path, self.json_path):
+            try:
+                st = path.stat()
+            except FileNotFoundError:
+                continue
+            signature.append((path.name, st.st_mtime_ns, st.st_size))
+        return tuple(signature)
+
+    def on_changed(self, _path):
+        self.watch_file()
+        # the directory also sees cache, lock and temp-file churn: only the stats files count
+        if self.file_signature() != self.signature:
+            self.reload_timer.start()
+
+    def reload(self):
+        signature = self.file_signature()
+        if self.loaded and signature == self.signature:
+            return      # changed back before the delay ran out
+        self.signature = signature
+        submit(read_driver_stats, self.on_loaded, self.on_failed, self.path, self.json_path,
+               key="driver-stats-repo", priority=LOW)
+
+    def on_loaded(self, index):
+        if self.loaded and index == self.index:
+            return
+        self.index = index
+        self.loaded = True
+        logger.info("Loaded stats for %d drivers", len(index))
+        self.statsChanged.emit()
+
+    def on_failed(self, error):
+        # half-written or corrupt file: keep serving the last good index
+        logger.warning("Could not read %s: %s", self.path, error)
+
+
+_repo = None
+
+
+def get_stats_repo():
+    """Application-wide repository (created on first use, after QApplication)."""
+    global _repo
+    if _repo is None:
+        _repo = DriverStatsRepository()
+    return _repo
@@ -0,0 +1,297 @@
+# -- services/storage.py
+# Persistence for AppData state shared by the UI, background threads and the
+# standalone updater: atomic replace, file locks and a checksummed envelope.
+import hashlib
+import json
+import logging
+import os
+import queue
+import threading
+import time
+
+try:
+    import msvcrt
+except ImportError:     # POSIX
+    msvcrt = None
+    import fcntl
+
+from utils import compression
+
+logger = logging.getLogger(__name__)
+
+LOCK_TIMEOUT = 10
+LOCK_DIR = ".locks"             # lock files live here, beside the data they guard
+BACKUP_INTERVAL = 60 * 60       # seconds between .bak refreshes of a state file
+
+
+class StorageError(Exception):
+    pass
+
+
+# ---- Locking ----
+
+_thread_locks = {}
+_thread_locks_guard = threading.Lock()
+
+
+def _thread_lock(path):
+    with _thread_locks_guard:
+        return _thread_locks.setdefault(str(path), threading.RLock())
+
+
+class FileLock:
+    """
+    Exclusive lock on `path` across threads and processes.
+
+    A `<name>.lock` file in the LOCK_DIR subdirectory carries the OS lock
+    (fcntl / msvcrt), so the data file itself can still be atomically
+    replaced while held, and watchers of the data directory see no churn.
+    With blocking=False, acquire() returns False instead of waiting.
+    """
+    def __init__(self, path, timeout=LOCK_TIMEOUT, blocking=True):
+        self.path = path
+        self.lock_path = path.parent / LOCK_DIR / (path.name + ".lock")
+        self.timeout = timeout
+        self.blocking = blocking
+        self.thread_lock = _thread_lock(path)
+        self.handle = None
+
+    def acquire(self):
+        if not self.thread_lock.acquire(self.blocking, self.timeout if self.blocking else -1):
+            if self.blocking:
+                raise StorageError(f"Timed out waiting for {self.path}")
+            return False
+        try:
+            self.lock_path.parent.mkdir(parents=True, exist_ok=True)
+            self.handle = open(self.lock_path, "a+b")
+            deadline = time.monotonic() + self.timeout
+            while not self._try_os_lock():
+                if not self.blocking:
+                    self._close()
+                    self.thread_lock.release()
+                    return False
+                if time.monotonic() > deadline:
+                    raise StorageError(f"Timed out waiting for {self.lock_path}")
+                time.sleep(0.05)
+        except Exception:
+            self._close()
+            self.thread_lock.release()
+            raise
+        return True
+
+    def _try_os_lock(self):
+        try:
+            if msvcrt:
+                self.handle.seek(0)
+                msvcrt.locking(self.handle.fileno(), msvcrt.LK_NBLCK, 1)
+            else:
+                fcntl.flock(self.handle.fileno(), fcntl.LOCK_EX | fcntl.LOCK_NB)
+            return True
+        except OSError:
+            return False
+
+    def _close(self):
+        if self.handle:
+            self.handle.close()
+            self.handle = None
+
+    def release(self):
+        try:
+            if msvcrt:
+                self.handle.seek(0)
+                msvcrt.locking(self.handle.fileno(), msvcrt.LK_UNLCK, 1)
+            else:
+                fcntl.flock(self.handle.fileno(), fcntl.LOCK_UN)
+        finally:
+            self._close()
+            self.thread_lock.release()
+
+    def __enter__(self):
+        self.acquire()
+        return self
+
+    def __exit__(self, *exc):
+        self.release()
+
+
+# ---- Atomic writes ----
+
+def atomic_write_bytes(path, data):
+    """Write to a temp file, fsync it and rename it over path."""
+    path.parent.mkdir(parents=True, exist_ok=True)
+    tmp = path.with_name(f"{path.name}.{os.getpid()}.{threading.get_ident()}.tmp")
+    try:
+        with open(tmp, "wb") as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp, path)
+    except BaseException:
+        tmp.unlink(missing_ok=True)
+        raise
+    if not msvcrt:
+        # make the rename itself durable
+        fd = os.open(path.parent, os.O_RDONLY)
+        try:
+            os.fsync(fd)
+        finally:
+            os.close(fd)
+
+
+def write_json(path, data, indent=4):
+    """Atomically replace path with plain JSON."""
+    with FileLock(path):
+        atomic_write_bytes(path, json.dumps(data, indent=indent, ensure_ascii=False).encode("utf-8"))
+
+
+# ---- Versioned, checksummed state ----
+
+def _checksum(data):
+    canonical = json.dumps(data, sort_keys=True, ensure_ascii=False, separators=(",", ":"))
+    return hashlib.sha256(canonical.encode("utf-8")).hexdigest()
+
+
+def _backup_path(path):
+    return path.with_name(path.name + ".bak")
+
+
+_disk_versions = {}     # path -> envelope version last read or written by this process
+
+
+def _backup_due(path, version):
+    """Refresh .bak when the version changes, when there is none, or every BACKUP_INTERVAL."""
+    if _disk_versions.get(str(path), version) != version:
+        return True
+    try:
+        return time.time() - _backup_path(path).stat().st_mtime > BACKUP_INTERVAL
+    except FileNotFoundError:
+        return True
+
+
+def _decode_state(path, raw, schema, version, migrate):
+    if compression.is_packed(raw):
+        raw = compression.unpack(raw)
+    doc = json.loads(raw)
+    if isinstance(doc, dict) and doc.get("schema") == schema:
+        if doc.get("checksum") != _checksum(doc.get("data")):
+            raise StorageError("checksum mismatch")
+        _disk_versions[str(path)] = doc.get("version")
+        if doc.get("version") == version:
+            return doc["data"]
+        if migrate:
+            return migrate(doc["data"], doc.get("version"))
+        raise StorageError(f"unsupported {schema} version {doc.get('version')}")
+    # Plain JSON written before the envelope existed
+    _disk_versions[str(path)] = 0
+    if migrate:
+        return migrate(doc, 0)
+    return doc
+
+
+def save_state(path, data, schema, version=1, compress=False):
+    """
+    Persist data inside a {schema, version, checksum, data} envelope.
+    The previous good copy is kept as <name>.bak, refreshed on a version
+    change and otherwise at most every BACKUP_INTERVAL. compress stores
+    compact JSON packed by utils.compression (load_state detects it).
+    """
+    doc = {"schema": schema, "version": version, "checksum": _checksum(data), "data": data}
+    if compress:
+        payload = compression.pack(json.dumps(doc, ensure_ascii=False, separators=(",", ":")).encode("utf-8"))
+    else:
+        payload = json.dumps(doc, indent=1, ensure_ascii=False).encode("utf-8")
+    with FileLock(path):
+        if _backup_due(path, version):
+            try:
+                atomic_write_bytes(_backup_path(path), path.read_bytes())
+            except FileNotFoundError:
+                pass
+        atomic_write_bytes(path, payload)
+        _disk_versions[str(path)] = version
+
+
+def load_state(path, schema, version=1, default=None, migrate=None):
+    """
+    Load data saved by save_state. A corrupt or torn file falls back to the
+    .bak copy, then to default. migrate(data, old_version) upgrades older
+    versions (old_version 0 is plain JSON without an envelope).
+    """
+    if not (path.exists() or _backup_path(path).exists()):
+        return default      # nothing to read: don't create a lock for it
+    with FileLock(path):
+        for candidate in (path, _backup_path(path)):
+            try:
+                raw = candidate.read_bytes()
+            except FileNotFoundError:
+                continue
+            try:
+                return _decode_state(path, raw, schema, version, migrate)
+            except (ValueError, StorageError, KeyError, TypeError, OSError) + compression.ERRORS as e:
+                logger.warning("Ignoring unreadable %s: %s", candidate, e)
+    return default
+
+
+def delete_state(path):
+    """Remove a state file and its backup."""
+    with FileLock(path):
+        for candidate in (path, _backup_path(path)):
+            candidate.unlink(missing_ok=True)
+
+
+# ---- Background writes ----
+
+class BackgroundWriter:
+    """
+    Single daemon thread that persists state off the GUI thread.
+    Pending writes to the same path are coalesced: only the newest data is written.
+    """
+    def __init__(self):
+        self.pending = {}
+        self.lock = threading.Lock()
+        self.queue = queue.Queue()
+        self.thread = threading.Thread(target=self.run, name="storage-writer", daemon=True)
+        self.thread.start()
+
+    def submit(self, path, data, schema=None, version=1, compress=False):
+        with self.lock:
+            first = path not in self.pending
+            self.pending[path] = (data, schema, version, compress)
+        if first:
+            self.queue.put(path)
+
+    def run(self):
+        while True:
+            path = self.queue.get()
+            with self.lock:
+                data, schema, version, compress = self.pending.pop(path)
+            try:
+                if schema:
+                    save_state(path, data, schema, version, compress)
+                else:
+                    write_json(path, data)
+                logger.info("Saved %s", path)
+            except Exception:
+                logger.error("Failed to save %s", path, exc_info=True)
+            finally:
+                self.queue.task_done()
+
+    def flush(self):
+        """Block until every queued write has hit the disk."""
+        self.queue.join()
+
+
+_writer = None
+_writer_lock = threading.Lock()
+
+
+def get_writer():
+    global _writer
+    with _writer_lock:
+        if _writer is None:
+            _writer = BackgroundWriter()
+    return _writer
+
+
+def write_json_later(path, data, schema=None, version=1, compress=False):
+    """Queue a write on the background writer thread (enveloped, optionally packed, when schema is given)."""
+    get_writer().submit(path, data, schema, version, compress)
@@ -1,15 +1,18 @@
+import os
+import sys
 import threading
 from datetime import datetime, timedelta
 import json
-from pathlib import Path
 import logging
 from services import d_stats  # your driver stats module
+from services.Schedule import SCHEDULE_FILE, PROCESSED_FILE, load_cached_schedule
+from services.storage import FileLock, load_state, save_state
 from config import settings   # to get CURRENT_SEASON
 
 # ---------------- Setup logging ----------------
 # ---------------- AppData Setup ----------------
-APP_DIR = Path.home() / "AppData" / "Roaming" / "F1App"
-APP_DIR.mkdir(exist_ok=True)  # make sure the directory exists
+APP_DIR = settings.APP_DATA_DIR
+APP_DIR.mkdir(parents=True, exist_ok=True)  # make sure the directory exists
 
 # ---------------- Setup logging ----------------
 log_file = APP_DIR / "update_json.log"
@@ -27,62 +30,78 @@ logger = logging.getLogger(__name__)
 
 logger.info("Logger initialized. Log file: %s", log_file)
 
-# ---------------- AppData Setup ----------------
-APP_DIR = Path.home() / "AppData" / "Roaming" / "F1App"
-APP_DIR.mkdir(exist_ok=True)
-
 SEASON = settings.CURRENT_SEASON
 
-SCHEDULE_FILE = APP_DIR / f"race_schedule.json"
-PROCESSED_FILE = APP_DIR / f"processed_races.json"
+PROCESSED_SCHEMA = "processed_races"
+PROCESSED_VERSION = 1
+UPDATE_LOCK = APP_DIR / "stats_update"
+
+
+def migrate_processed(data, old_version):
+    """Processed race names from any earlier processed_races.json layout."""
+    if isinstance(data, dict):
+        # d_stats used to overwrite the file with {driverId: [{raceName, date}]};
+        # every race of this season in there was already folded into the stats
+        return sorted({
+            r["raceName"] for races in data.values() for r in races
+            if str(r.get("date", "")).startswith(str(SEASON))
+        })
+    return [r["raceName"] if isinstance(r, dict) else r for r in data]
+
+
+def load_processed():
+    return set(load_state(PROCESSED_FILE, PROCESSED_SCHEMA, PROCESSED_VERSION,
+                          default=[], migrate=migrate_processed))
+
+
+def save_processed(processed):
+    save_state(PROCESSED_FILE, sorted(processed), PROCESSED_SCHEMA, PROCESSED_VERSION)
 
 
-def check_and_update_stats():
-    """Check schedule and run d_stats if a race is 2 days old and not processed."""
+def check_and_update_stats(progress=None):
+    """
+    Check schedule and run d_stats once if any race is a day old and not processed.
+    progress is forwarded to d_stats.main. Returns True when stats were rewritten.
+    """
+    lock = FileLock(UPDATE_LOCK, blocking=False)
+    if not lock.acquire():
+        logger.info("ℹ️ Another stats update is already running.")
+        return False
     try:
         # Load schedule
-        if not SCHEDULE_FILE.exists():
+        races = load_cached_schedule()
+        if not races:
             logger.warning(f"Race schedule for {SEASON} not found: {SCHEDULE_FILE}")
-            return
-
-        with SCHEDULE_FILE.open("r", encoding="utf-8") as f:
-            races = json.load(f)
-
-        # Load processed 
-        try:
-            with PROCESSED_FILE.open("r", encoding="utf-8") as f:
-                processed_data = json.load(f)
-                if processed_data and isinstance(processed_data[0], dict):
-                    processed = set(r["raceName"] for r in processed_data)
-                else:
-                    processed = set(processed_data)
-        except FileNotFoundError:
-            processed = set()
+            return False
 
+        processed = load_processed()
         today = datetime.today()
-        updated = False
 
+        pending = []
         for race in races:
             race_name = race["raceName"]
             race_date = datetime.strptime(race["date"], "%Y-%m-%d")
             update_date = race_date + timedelta(days=1) 
 
             if today >= update_date and race_name not in processed:
-                logger.info(f"📊 Updating stats after {race_name}...")
-                d_stats.main()  
-                processed.add(race_name)
-                updated = True
-
-        if updated:
-            # Save updated processed races as a list of names
-            with PROCESSED_FILE.open("w", encoding="utf-8") as f:
-                json.dump(list(processed), f, indent=4)
+                pending.append(race_name)
+
+        if pending:
+            # d_stats recomputes whole careers, so one run covers every pending race
+            logger.info(f"📊 Updating stats after {', '.join(pending)}...")
+            d_stats.main(progress=progress)
+            processed.update(pending)
+            save_processed(processed)
             logger.info(f"✅ Processed file updated: {PROCESSED_FILE}")
-        else:
-            logger.info("ℹ️ No new races to process.")
+            return True
+        logger.info("ℹ️ No new races to process.")
+        return False
 
     except Exception as e:
         logger.error("❌ Exception in update_json thread:", exc_info=True)
+        raise
+    finally:
+        lock.release()
 
 
 def run_in_background(wait_for_completion=False):
@@ -91,13 +110,60 @@ def run_in_background(wait_for_completion=False):
     Args:
         wait_for_completion (bool): If True, wait for thread to finish (standalone mode)
     """
-    thread = threading.Thread(target=check_and_update_stats, daemon=True)
+    def run():
+        try:
+            check_and_update_stats()
+        except Exception:
+            pass    # already logged
+
+    thread = threading.Thread(target=run, daemon=True)
     thread.start()
     if wait_for_completion:
         thread.join()
 
 
+# ---------------- Worker process mode ----------------
+
+def lower_priority():
+    """Run below the UI: nice on POSIX, BELOW_NORMAL priority class on Windows."""
+    try:
+        if hasattr(os, "nice"):
+            os.nice(10)
+        else:
+            import ctypes
+            BELOW_NORMAL_PRIORITY_CLASS = 0x4000
+            kernel32 = ctypes.windll.kernel32
+            kernel32.SetPriorityClass(kernel32.GetCurrentProcess(), BELOW_NORMAL_PRIORITY_CLASS)
+    except Exception as e:
+        logger.warning("Could not lower updater priority: %s", e)
+
+
+def run_ipc():
+    """
+    Entry point of the updater worker process (services.updater_process).
+    Events go to stdout as JSON lines: progress, then done or error.
+    Everything else printed by d_stats is redirected to stderr.
+    """
+    channel = sys.stdout
+    sys.stdout = sys.stderr
+
+    def emit(event, **fields):
+        channel.write(json.dumps({"event": event, **fields}) + "\n")
+        channel.flush()
+
+    lower_priority()
+    try:
+        updated = check_and_update_stats(progress=lambda p: emit("progress", **p))
+    except Exception as e:
+        emit("error", message=str(e))
+        return 1
+    emit("done", updated=updated)
+    return 0
+
+
 def main():
+    if "--ipc" in sys.argv:
+        sys.exit(run_ipc())
     # Standalone execution: wait for completion
     run_in_background(wait_for_completion=True)
 
@@ -0,0 +1,100 @@
+# -- services/updater_process.py
+import json
+import logging
+import sys
+from pathlib import Path
+from PyQt6.QtCore import QObject, QProcess, pyqtSignal
+
+logger = logging.getLogger(__name__)
+
+PROJECT_ROOT = Path(__file__).resolve().parents[1]
+
+
+class StatsUpdaterProcess(QObject):
+    """
+    Runs services.update_json in a separate, low-priority Python process so
+    the career-stats crawl never competes with the UI for the GIL.
+
+    The child reports over stdout as JSON lines (see update_json.run_ipc).
+    New stats reach the UI through DriverStatsRepository's file watcher,
+    not through this channel.
+    """
+    progress = pyqtSignal(dict)
+    finished = pyqtSignal(bool)      # True when stats were rewritten
+    failed = pyqtSignal(str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.process = None
+        self.buffer = b""
+        self.result = None
+
+    @property
+    def running(self):
+        return self.process is not None
+
+    def start(self):
+        if self.running:
+            return
+        if getattr(sys, "frozen", False):
+            # Packaged builds have no interpreter to launch: fall back to a thread
+            import services.update_json
+            services.update_json.run_in_background()
+            return
+
+        self.buffer = b""
+        self.result = None
+        self.process = QProcess(self)
+        self.process.setWorkingDirectory(str(PROJECT_ROOT))
+        self.process.readyReadStandardOutput.connect(self.on_stdout)
+        self.process.readyReadStandardError.connect(self.on_stderr)
+        self.process.finished.connect(self.on_finished)
+        self.process.errorOccurred.connect(self.on_error)
+        self.process.start(sys.executable, ["-m", "services.update_json", "--ipc"])
+        logger.info("Stats updater started")
+
+    def stop(self):
+        if self.running:
+            self.process.kill()
+            self.process.waitForFinished(2000)
+
+    def on_stdout(self):
+        self.buffer += bytes(self.process.readAllStandardOutput())
+        *lines, self.buffer = self.buffer.split(b"\n")
+        for line in lines:
+            if line.strip():
+                self.handle_event(line)
+
+    def handle_event(self, line):
+        try:
+            event = json.loads(line)
+        except ValueError:
+            logger.debug("updater: %s", line.decode("utf-8", "replace"))
+            return
+        kind = event.pop("event", None)
+        if kind == "progress":
+            self.progress.emit(event)
+        elif kind in ("done", "error"):
+            self.result = (kind, event)
+
+    def on_stderr(self):
+        for line in bytes(self.process.readAllStandardError()).decode("utf-8", "replace").splitlines():
+            logger.debug("updater: %s", line)
+
+    def on_error(self, error):
+        if error == QProcess.ProcessError.FailedToStart:
+            self.process.deleteLater()
+            self.process = None
+            self.failed.emit("Stats updater failed to start")
+
+    def on_finished(self, exit_code, exit_status):
+        self.on_stdout()
+        self.process.deleteLater()
+        self.process = None
+        kind, event = self.result or ("error", {"message": f"Stats updater exited with code {exit_code}"})
+        if kind == "done":
+            logger.info("Stats updater finished (updated: %s)", event.get("updated"))
+            self.finished.emit(bool(event.get("updated")))
+        else:
+            logger.warning("Stats updater failed: %s", event.get("message"))
+            self.failed.emit(event.get("message", ""))
@@ -1,18 +1,204 @@
-from PyQt6.QtCore import QThread, pyqtSignal
+import threading
+import time
+from itertools import count
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QTimer, pyqtSignal
+from config import settings
 
-class Worker(QThread):
-    finished = pyqtSignal(object)  
-    failed = pyqtSignal(str)       
+# ---- Priorities (higher runs first) ----
+LOW = -10
+NORMAL = 0
+HIGH = 10
 
-    def __init__(self, fn, *args, **kwargs):
+
+class TaskCancelled(Exception):
+    pass
+
+
+class CancelToken:
+    """Checked by long-running functions that accept a `cancel_token` keyword."""
+    def __init__(self):
+        self._event = threading.Event()
+
+    def cancel(self):
+        self._event.set()
+
+    @property
+    def cancelled(self):
+        return self._event.is_set()
+
+    def raise_if_cancelled(self):
+        if self._event.is_set():
+            raise TaskCancelled()
+
+
+class TaskHandle:
+    """Returned by TaskRunner.submit; lets the caller cancel or inspect a task."""
+    def __init__(self, runner, key, generation, token):
+        self.runner = runner
+        self.key = key
+        self.generation = generation
+        self.token = token
+        self.state = "queued"       # queued | running | done | failed | cancelled | timed_out
+        self.started_at = None
+
+    def cancel(self):
+        self.runner.cancel(self)
+
+    @property
+    def active(self):
+        return self.state in ("queued", "running")
+
+
+class _TaskSignals(QObject):
+    # Emitted from pool threads, delivered on the GUI thread
+    started = pyqtSignal(object)
+    finished = pyqtSignal(object, object)
+    failed = pyqtSignal(object, str)
+    released = pyqtSignal(object)
+
+
+class _Task(QRunnable):
+    def __init__(self, handle, signals, fn, args, kwargs):
         super().__init__()
+        self.setAutoDelete(False)
+        self.handle = handle
+        self.signals = signals
         self.fn = fn
         self.args = args
         self.kwargs = kwargs
 
     def run(self):
         try:
+            if self.handle.token.cancelled:
+                return
+            self.signals.started.emit(self.handle)
             result = self.fn(*self.args, **self.kwargs)
-            self.finished.emit(result)
+            self.signals.finished.emit(self.handle, result)
+        except TaskCancelled:
+            pass
         except Exception as e:
-            self.failed.emit(str(e))  
+            self.signals.failed.emit(self.handle, str(e))
+        finally:
+            self.signals.released.emit(self)
+
+
+class TaskRunner(QObject):
+    """
+    Runs blocking service calls on a bounded QThreadPool.
+
+    Tasks submitted under the same key supersede each other: the previous
+    one is cancelled (or pulled from the queue if it has not started) and
+    any result it still produces is dropped by generation check.
+    """
+    def __init__(self, max_threads=None, parent=None):
+        super().__init__(parent)
+        self.pool = QThreadPool(self)
+        self.pool.setMaxThreadCount(max_threads or settings.TASK_POOL_SIZE)
+        self.alive = set()   # runnables the pool may still touch
+        self.signals = _TaskSignals()
+        self.signals.started.connect(self._on_started)
+        self.signals.finished.connect(self._on_finished)
+        self.signals.failed.connect(self._on_failed)
+        self.signals.released.connect(self.alive.discard)
+        self.generations = count(1)
+        self.latest = {}     # key -> current TaskHandle
+        self.tasks = {}      # TaskHandle -> (_Task, on_done, on_fail, timer)
+
+    def submit(self, fn, on_done=None, on_fail=None, *args, key=None,
+               priority=NORMAL, timeout=None, pass_token=False, **kwargs):
+        """Queue fn(*args, **kwargs); callbacks run on the GUI thread."""
+        if key is not None and key in self.latest:
+            self.cancel(self.latest[key])
+
+        token = CancelToken()
+        handle = TaskHandle(self, key, next(self.generations), token)
+        if pass_token:
+            kwargs["cancel_token"] = token
+        task = _Task(handle, self.signals, fn, args, kwargs)
+
+        # The timeout counts from when the task starts, not while it is queued
+        timer = None
+        timeout = settings.TASK_TIMEOUT if timeout is None else timeout
+        if timeout:
+            timer = QTimer(self)
+            timer.setSingleShot(True)
+            timer.setInterval(int(timeout * 1000))
+            timer.timeout.connect(lambda: self._on_timeout(handle, timeout))
+
+        if key is not None:
+            self.latest[key] = handle
+        self.tasks[handle] = (task, on_done, on_fail, timer)
+        self.alive.add(task)
+        self.pool.start(task, priority)
+        return handle
+
+    def cancel(self, handle):
+        if not handle.active:
+            return
+        handle.token.cancel()
+        entry = self.tasks.get(handle)
+        if entry and handle.state == "queued" and self.pool.tryTake(entry[0]):
+            self.alive.discard(entry[0])
+        handle.state = "cancelled"
+        self._forget(handle)
+
+    def is_current(self, handle):
+        return handle.active and (handle.key is None or self.latest.get(handle.key) is handle)
+
+    def _forget(self, handle):
+        entry = self.tasks.pop(handle, None)
+        if entry and entry[3]:
+            entry[3].stop()
+            entry[3].deleteLater()
+        if handle.key is not None and self.latest.get(handle.key) is handle:
+            del self.latest[handle.key]
+
+    def _on_started(self, handle):
+        if handle.state == "queued":
+            handle.state = "running"
+            handle.started_at = time.monotonic()
+            timer = self.tasks[handle][3]
+            if timer:
+                timer.start()
+
+    def _on_finished(self, handle, result):
+        if not self.is_current(handle):
+            return          # stale generation, cancelled or timed out
+        on_done = self.tasks[handle][1]
+        handle.state = "done"
+        self._forget(handle)
+        if on_done:
+            on_done(result)
+
+    def _on_failed(self, handle, error):
+        if not self.is_current(handle):
+            return
+        on_fail = self.tasks[handle][2]
+        handle.state = "failed"
+        self._forget(handle)
+        if on_fail:
+            on_fail(error)
+
+    def _on_timeout(self, handle, timeout):
+        if not self.is_current(handle):
+            return
+        on_fail = self.tasks[handle][2]
+        self.cancel(handle)     # pulled from the queue too, if it has not started
+        handle.state = "timed_out"
+        if on_fail:
+            on_fail(f"Timed out after {timeout:g}s")
+
+
+_runner = None
+
+
+def get_runner():
+    """Application-wide task runner (created on first use)."""
+    global _runner
+    if _runner is None:
+        _runner = TaskRunner()
+    return _runner
+
+
+def submit(fn, on_done=None, on_fail=None, *args, **kwargs):
+    return get_runner().submit(fn, on_done, on_fail, *args, **kwargs)
@@ -0,0 +1,121 @@
+# -- tests/test_cache_server.py
+# The shared cache daemon against a local stand-in for the Ergast API:
+# single-flight upstream fetches, gzip bodies and SSE invalidations.
+#
+#   python -m pytest tests/test_cache_server.py   (or python -m unittest)
+import gzip
+import hashlib
+import json
+import tempfile
+import threading
+import time
+import unittest
+import urllib.request
+from concurrent.futures import ThreadPoolExecutor
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from pathlib import Path
+import requests
+from config import settings
+from utils import api_helper, http_cache
+from services import cache_server
+from services.storage import get_writer
+
+ENDPOINT = "current/driverstandings"
+UPSTREAM_DELAY = 0.3    # long enough for every concurrent client to arrive first
+
+
+class StubUpstream(BaseHTTPRequestHandler):
+    """Ergast stand-in: serves `standings` with an ETag and counts requests per path."""
+    protocol_version = "HTTP/1.1"
+    standings = {}
+    hits = {}
+
+    def log_message(self, fmt, *args):
+        pass
+
+    def do_GET(self):
+        path = self.path.split("?", 1)[0]
+        StubUpstream.hits[path] = StubUpstream.hits.get(path, 0) + 1
+        time.sleep(UPSTREAM_DELAY)
+        body = json.dumps({"MRData": {"total": "1", "StandingsTable": {"StandingsLists": [
+            {"season": "2025", "round": "1", "DriverStandings": [StubUpstream.standings]}]}}}).encode("utf-8")
+        etag = '"' + hashlib.sha1(body).hexdigest() + '"'
+        if self.headers.get("If-None-Match") == etag:
+            self.send_response(304)
+            self.send_header("ETag", etag)
+            self.send_header("Content-Length", "0")
+            self.end_headers()
+            return
+        self.send_response(200)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("ETag", etag)
+        self.send_header("Content-Length", str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+
+class CacheServerTest(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.saved = settings.API_CACHE_DIR, http_cache._cache
+        settings.API_CACHE_DIR = Path(self.tmp.name)
+        http_cache._cache = None
+
+        StubUpstream.standings = {"position": "1", "points": "25", "Driver": {"driverId": "norris"}}
+        StubUpstream.hits = {}
+        self.upstream = ThreadingHTTPServer(("127.0.0.1", 0), StubUpstream)
+        threading.Thread(target=self.upstream.serve_forever, daemon=True).start()
+        upstream_url = "http://127.0.0.1:%d/ergast/f1" % self.upstream.server_address[1]
+
+        self.server = cache_server.serve("127.0.0.1", 0, upstreams=[upstream_url], watch=False)
+        self.base = "http://127.0.0.1:%d" % self.server.server_address[1]
+        self.url = f"{self.base}{cache_server.PREFIX}{ENDPOINT}.json"
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+        self.upstream.shutdown()
+        self.upstream.server_close()
+        get_writer().flush()
+        settings.API_CACHE_DIR, http_cache._cache = self.saved
+        api_helper.mirrors.set_urls(settings.API_MIRRORS)
+        self.tmp.cleanup()
+
+    def upstream_hits(self):
+        return StubUpstream.hits.get(f"/ergast/f1/{ENDPOINT}.json", 0)
+
+    def test_concurrent_clients_share_one_upstream_fetch(self):
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            responses = list(pool.map(lambda _: requests.get(self.url, timeout=10), range(8)))
+        self.assertTrue(all(r.status_code == 200 for r in responses))
+        self.assertEqual(len({r.content for r in responses}), 1)
+        self.assertEqual(self.upstream_hits(), 1)
+        self.assertEqual(self.server.cache.upstream_fetches, 1)
+
+    def test_gzip_body(self):
+        request = urllib.request.Request(self.url, headers={"Accept-Encoding": "gzip"})
+        with urllib.request.urlopen(request, timeout=10) as resp:
+            self.assertEqual(resp.headers["Content-Encoding"], "gzip")
+            data = json.loads(gzip.decompress(resp.read()))
+        standings = data["MRData"]["StandingsTable"]["StandingsLists"][0]["DriverStandings"]
+        self.assertEqual(standings[0]["Driver"]["driverId"], "norris")
+
+    def test_changed_data_is_announced(self):
+        requests.get(self.url, timeout=10).raise_for_status()
+        with requests.get(f"{self.base}{cache_server.EVENTS_PATH}", stream=True, timeout=10) as events:
+            # chunk_size=1 as in services/cache_events.py: each line as it arrives
+            lines = events.iter_lines(chunk_size=1, decode_unicode=True)
+            self.assertEqual(next(lines), ": connected")    # subscribed from here on
+
+            self.assertEqual(self.server.cache.refresh(), [])       # unchanged: nothing sent
+            StubUpstream.standings = dict(StubUpstream.standings, points="33")
+            key = api_helper.request_path(ENDPOINT)
+            self.assertEqual(self.server.cache.refresh(), [key])
+
+            data = next(line for line in lines if line.startswith("data: "))
+        self.assertEqual(json.loads(data[len("data: "):]), {"event": "invalidate", "paths": [key]})
+        self.assertIn(b'"33"', requests.get(self.url, timeout=10).content)
+
+
+if __name__ == "__main__":
+    unittest.main()
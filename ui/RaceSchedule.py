@@ -1,27 +1,38 @@
 import sys
-import os
-from pathlib import Path
-import json
 from datetime import datetime, timezone
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QLabel, QVBoxLayout, QHBoxLayout,
     QScrollArea, QFrame, QGraphicsDropShadowEffect,QPushButton
 )
-from PyQt6.QtCore import Qt, QPropertyAnimation, QEasingCurve
+from PyQt6.QtCore import Qt, QPropertyAnimation, QEasingCurve, QTimer
 from PyQt6.QtGui import QPixmap, QColor
-from services.worker import Worker
+from services.aio import spawn
 from utils.api_helper import on_failed as show_api_error
-from services.Schedule import get_race_schedule
-from services.results import get_all_race_winners
+from services.Schedule import load_schedule_view
+from services.schedule_view import reevaluate, COMPLETED, UPCOMING, FUTURE
 from ui.skeleton import ScheduleSkeleton
+from ui.progressive import ProgressiveBuilder, visible_count
+from ui import quality
+
+
+CARD_HEIGHT = 330
+
+STATUS_COLORS = {
+    # status: (timeline color, card background)
+    COMPLETED: ("#aaa", "#4A4639"),
+    FUTURE: ("#00b7ff", "#2a2a2a"),
+    UPCOMING: ("#0eff3a", "#033d16"),
+}
 
 
 class TimelineRaceCard(QWidget):
-    def __init__(self, race, side='left', highlight_upcoming=False):
+    def __init__(self, row, side='left'):
         super().__init__()
-        self.race = race
+        self.row = row
+        self.race = row["race"]
         self.side = side
-        self.highlight_upcoming = highlight_upcoming
+        self.winner_label = None
+        self.status = None
         self.initUI()
         self.setGraphicsEffect(None)
 
@@ -30,45 +41,24 @@ class TimelineRaceCard(QWidget):
         main_layout.setContentsMargins(40, 0, 40, 0)
         main_layout.setSpacing(20)
 
-        # --- Date check
-        race_time = self.race.get('time', '00:00:00')
-        race_datetime = datetime.fromisoformat(
-            f"{self.race['date']}T{race_time.replace('Z','')}"
-        ).replace(tzinfo=timezone.utc)
-        now = datetime.now(timezone.utc)
-
         # --- Labels
         circuit_name = QLabel(self.race['circuitName'])
         race_title = QLabel(f"Round {self.race['round']}: {self.race['raceName']}")
         location = f"{self.race['locality']}, {self.race['country']}"
-        date_label = QLabel(f"Date & Time: {race_datetime.strftime('%d %b %Y, %H:%M UTC')}")
+        date_label = QLabel(self.row["date_text"])
         loc_label = QLabel(location)
 
-        # --- Colors
-        if race_datetime < now:
-            timeline_color = "#aaa"
-            card_bg = "#4A4639"
-        else:
-            timeline_color = "#00b7ff"
-            card_bg = "#2a2a2a"
-
-        if self.highlight_upcoming:
-            card_bg = "#033d16"
-            timeline_color = "#0eff3a"
-
         # --- Timeline
         timeline_widget = QVBoxLayout()
         timeline_widget.setAlignment(Qt.AlignmentFlag.AlignTop | Qt.AlignmentFlag.AlignHCenter)
-        circle = QLabel("●")
-        circle.setStyleSheet(f"color: {timeline_color}; font-size: 22px;")
-        circle.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        timeline_widget.addWidget(circle)
+        self.circle = QLabel("●")
+        self.circle.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        timeline_widget.addWidget(self.circle)
 
-        line = QFrame()
-        line.setFrameShape(QFrame.Shape.VLine)
-        line.setStyleSheet(f"background-color: {timeline_color};")
-        line.setFixedWidth(4)
-        timeline_widget.addWidget(line, 1)
+        self.line = QFrame()
+        self.line.setFrameShape(QFrame.Shape.VLine)
+        self.line.setFixedWidth(4)
+        timeline_widget.addWidget(self.line, 1)
 
         timeline_container = QWidget()
         timeline_container.setLayout(timeline_widget)
@@ -76,13 +66,8 @@ class TimelineRaceCard(QWidget):
 
         # --- Card
         card = QFrame()
-        card.setStyleSheet(f"""
-            QFrame {{
-                border-radius: 16px;
-                background-color: {card_bg};
-                padding: 15px;
-            }}
-        """)
+        self.card = card
+        self.set_status(self.row["status"])
 
         # --- Shadow effect
         shadow = QGraphicsDropShadowEffect()
@@ -100,7 +85,7 @@ class TimelineRaceCard(QWidget):
         if pixmap.isNull():
             pixmap = QPixmap(300, 180)
             pixmap.fill(Qt.GlobalColor.lightGray)
-        scaled_pixmap = pixmap.scaledToHeight(180, Qt.TransformationMode.SmoothTransformation)
+        scaled_pixmap = pixmap.scaledToHeight(180, quality.transform_mode())
         img_label = QLabel()
         img_label.setPixmap(scaled_pixmap)
         img_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -123,21 +108,17 @@ class TimelineRaceCard(QWidget):
         date_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
         card_layout.addWidget(date_label)
 
+        card.setLayout(card_layout)
+        self.card_layout = card_layout
+
         # --- Winner info
         if "winner" in self.race:
-            w = self.race["winner"]
-            winner_label = QLabel(f"Winner: {w['driverName']} ({w['constructor']})")
-            winner_label.setStyleSheet("color: gold; font-size: 12px; font-weight: bold;")
-            winner_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-            card_layout.addWidget(winner_label)
-
-        card.setLayout(card_layout)
+            self.set_winner(self.race["winner"])
 
         # --- Hover animation
         self.anim = QPropertyAnimation(card, b"geometry")
         self.anim.setDuration(150)
         self.anim.setEasingCurve(QEasingCurve.Type.InOutQuad)
-        self.card = card
 
         # --- Layout
         if self.side == 'left':
@@ -151,6 +132,34 @@ class TimelineRaceCard(QWidget):
 
         self.setLayout(main_layout)
 
+    def set_status(self, status):
+        """Restyle for completed / upcoming / future without rebuilding."""
+        if status == self.status:
+            return
+        self.status = status
+        timeline_color, card_bg = STATUS_COLORS[status]
+        self.circle.setStyleSheet(f"color: {timeline_color}; font-size: 22px;")
+        self.line.setStyleSheet(f"background-color: {timeline_color};")
+        self.card.setStyleSheet(f"""
+            QFrame {{
+                border-radius: 16px;
+                background-color: {card_bg};
+                padding: 15px;
+            }}
+        """)
+
+    def set_winner(self, w):
+        """Show (or update) the winner line without rebuilding the card."""
+        self.race["winner"] = w
+        text = f"Winner: {w['driverName']} ({w['constructor']})"
+        if self.winner_label is None:
+            self.winner_label = QLabel(text)
+            self.winner_label.setStyleSheet("color: gold; font-size: 12px; font-weight: bold;")
+            self.winner_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            self.card_layout.addWidget(self.winner_label)
+        elif self.winner_label.text() != text:
+            self.winner_label.setText(text)
+
 
 
 class ScheduleWindow(QWidget):
@@ -164,6 +173,14 @@ class ScheduleWindow(QWidget):
             QScrollBar::handle:vertical { background: #555; border-radius: 4px; }
             QScrollBar::handle:vertical:hover { background: #888; }
         """)
+        self.load_task = None
+        self.view = None
+        self.cards = []
+        self.builder = None
+        # Flips race statuses when the clock passes the next race start
+        self.status_timer = QTimer(self)
+        self.status_timer.setSingleShot(True)
+        self.status_timer.timeout.connect(self.update_statuses)
         self.initUI()
 
     def initUI(self):
@@ -191,90 +208,111 @@ class ScheduleWindow(QWidget):
             self.vbox.addWidget(ScheduleSkeleton(side))
 
     def load_schedule(self):
-        self.race_worker = Worker(get_race_schedule)
-        self.race_worker.finished.connect(self.on_races_loaded)
-        self.race_worker.failed.connect(self.on_failed)
-        self.race_worker.start()
+        if self.load_task and not self.load_task.done():
+            self.load_task.cancel()
+        # Schedule and winners load concurrently; if winners lag, the schedule
+        # renders first (on_partial) and the winners are patched in afterwards
+        self.load_task = spawn(
+            load_schedule_view(on_partial=self.on_schedule_loaded),
+            self.on_schedule_loaded, self.on_failed
+        )
+
+    def refresh(self):
+        """Re-fetch schedule and winners in place (no skeletons)."""
+        self.load_schedule()
 
     def clear_vbox(self):
+        if self.builder:
+            self.builder.cancel()
+            self.builder = None
         while self.vbox.count():
             item = self.vbox.takeAt(0)
             widget = item.widget()
             if widget:
                 widget.deleteLater()
-
-    def on_races_loaded(self, races):
-        self.races = races
-        appdata_dir = Path.home() / "AppData" / "Roaming" / "F1App"
-        appdata_dir.mkdir(exist_ok=True)
-        schedule_file = appdata_dir / "race_schedule.json"
-        try:
-            with schedule_file.open("w", encoding="utf-8") as f:
-                json.dump(races, f, indent=4, ensure_ascii=False)
-            print(f"✅ Race schedule saved to {schedule_file}")
-        except Exception as e:
-            print(f"❌ Failed to save race schedule: {e}")
-            # --- Processed races file ---
-        processed_file = appdata_dir / "processed_races.json"
-        if not processed_file.exists():
-            try:
-                with processed_file.open("w", encoding="utf-8") as f:
-                    json.dump([], f, indent=4)
-                print(f"✅ Created empty processed_races.json at {processed_file}")
-            except Exception as e:
-                print(f"❌ Failed to create processed_races.json: {e}")
-                
-        self.winner_worker = Worker(get_all_race_winners)
-        self.winner_worker.finished.connect(self.on_winners_loaded)
-        self.winner_worker.failed.connect(self.on_failed)
-        self.winner_worker.start()
-
-    def on_winners_loaded(self, winners):
-        for race in self.races:
-            round_no = race.get("round")
-            if round_no in winners:
-                race["winner"] = winners[round_no]
-
+        self.cards = []
+
+    def on_schedule_loaded(self, view):
+        fully_built = self.builder is None or self.builder.done
+        if self.cards and fully_built and view["signature"] == self.view["signature"]:
+            # Same races: only winners can differ, patch the existing cards
+            for card, row in zip(self.cards, view["rows"]):
+                if "winner" in row["race"]:
+                    card.set_winner(row["race"]["winner"])
+                card.set_status(row["status"])
+                card.row, card.race = row, row["race"]
+            self.view = view
+            self.update_progress_label()
+            self.arm_status_timer()
+            return
+        self.view = view
+        self.render_schedule()
+
+    def render_schedule(self):
         self.clear_vbox()
-        now = datetime.now(timezone.utc)
-        done_count = 0
-        upcoming_race = None
-
-        for race in self.races:
-            race_time = race.get('time', '00:00:00')
-            race_datetime = datetime.fromisoformat(
-                f"{race['date']}T{race_time.replace('Z','')}"
-            ).replace(tzinfo=timezone.utc)
-            if race_datetime < now:
-                done_count += 1
-            elif upcoming_race is None:
-                upcoming_race = race
-
-        total_races = len(self.races)
-        if upcoming_race:
-            next_gp_name = upcoming_race['raceName']
-            next_gp_round = upcoming_race['round']
-            self.progress_label.setText(
-                f"Up Next: {next_gp_name} | Race {next_gp_round} of {total_races}"
-            )
-        else:
-            self.progress_label.setText("All races completed!")
-
-        for i, race in enumerate(self.races):
-            side = 'left' if i % 2 == 0 else 'right'
-            highlight = (race == upcoming_race)
-            card = TimelineRaceCard(race, side, highlight_upcoming=highlight)
-            card.setGraphicsEffect(None)
-
-            # ---- Fade-in animation ---- 
+        self.update_progress_label()
+        self.arm_status_timer()
+
+        # First screenful now, the rest in time-sliced batches
+        self.builder = ProgressiveBuilder(
+            self.view["rows"], self.add_card,
+            first=visible_count(self.scroll, CARD_HEIGHT), parent=self
+        )
+        self.builder.finished.connect(lambda: quality.apply_effects(self.container))
+        self.builder.start()
+
+    def add_card(self, i, row):
+        side = 'left' if i % 2 == 0 else 'right'
+        card = TimelineRaceCard(row, side)
+        card.setGraphicsEffect(None)
+
+        # ---- Fade-in animation ---- 
+        if quality.animations_enabled():
             anim = QPropertyAnimation(card, b"windowOpacity")
             anim.setDuration(400)
             anim.setStartValue(0)
             anim.setEndValue(1)
             anim.start()
-            self.vbox.addWidget(card)
+        self.vbox.addWidget(card)
+        self.cards.append(card)
+
+    def update_progress_label(self):
+        rows = self.view["rows"]
+        next_index = self.view["next_index"]
+        if next_index is not None:
+            upcoming_race = rows[next_index]["race"]
+            self.progress_label.setText(
+                f"Up Next: {upcoming_race['raceName']} | Race {upcoming_race['round']} of {len(rows)}"
+            )
+        else:
+            self.progress_label.setText("All races completed!")
+
+    def update_statuses(self):
+        """Re-evaluate statuses against the clock and restyle only the cards that changed."""
+        if not self.view:
+            return
+        for i in reevaluate(self.view):
+            if i < len(self.cards):     # later cards are still being built
+                self.cards[i].set_status(self.view["rows"][i]["status"])
+        self.update_progress_label()
+        self.arm_status_timer()
+
+    def arm_status_timer(self):
+        self.status_timer.stop()
+        next_change = self.view["next_change"]
+        if next_change is None:
+            return
+        delay = (next_change - datetime.now(timezone.utc)).total_seconds()
+        # QTimer takes an int of ms; re-check at least daily
+        self.status_timer.start(int(min(max(delay, 1), 24 * 60 * 60) * 1000))
 
     def on_failed(self, error_msg):
+        if self.cards:
+            # keep the last good schedule on screen when a refresh fails
+            print(f"❌ Failed to refresh race schedule: {error_msg}")
+            return
+        self.clear_vbox()
+        self.status_timer.stop()
         show_api_error(self.container, self.retry_load)
 
         
@@ -1,7 +1,4 @@
 import sys
-import os
-from pathlib import Path
-import json
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QLabel, QVBoxLayout, QHBoxLayout,
     QScrollArea, QGraphicsDropShadowEffect, QPushButton, QFrame
@@ -10,16 +7,69 @@ from PyQt6.QtCore import Qt, pyqtSignal
 from PyQt6.QtGui import QPixmap, QColor
 from config.colors import TEAM_COLORS
 from config.settings import DRIVER_IMAGES_DIR, FLAGS_IMAGES_DIR,CONSTRUCTOR_IMAGES_DIR
+from ui import quality
+from services.stats_repo import get_stats_repo
+
+STAT_FIELDS = {
+    "totalPoints": "Total Points",
+    "totalPoles": "Total Poles",
+    "totalWins": "Total Wins",
+    "totalPodiums": "Total Podiums",
+    "seasonsRaced": "Seasons Raced",
+}
+
+CARD_STYLE = """
+    QWidget {{
+        background-color: {color};
+        border-radius: 16px;
+        padding: 16px;
+    }}
+"""
+BACK_BUTTON_STYLE = """
+    QPushButton {{
+        color: black;
+        background-color: {color};
+        border-radius: 8px;
+        padding: 8px;
+        font-weight: bold;
+    }}
+    QPushButton:hover {{
+        background-color: {color};
+        opacity: 0.85;
+    }}
+"""
+DEFAULT_TEAM_COLOR = "#1e1e2f"  # default dark
+
+
+def load_scaled(path, width, height, fallback_size):
+    pixmap = QPixmap(str(path))
+    if pixmap.isNull():
+        pixmap = QPixmap(*fallback_size)
+        pixmap.fill(Qt.GlobalColor.lightGray)
+    return pixmap.scaled(width, height, Qt.AspectRatioMode.KeepAspectRatio,
+                         quality.transform_mode())
+
 
 class DriverDetails(QWidget):
+    """
+    Driver profile page. The widget tree is built once; bind() points it at
+    another driver, so MainWindow can reuse a single instance. The large
+    driver portrait is dropped while the page is hidden and reloaded on show.
+    """
 
     driverSelected = pyqtSignal(str)
 
-    def __init__(self, driver: dict, constructor: dict = None):
+    def __init__(self, driver: dict = None, constructor: dict = None):
         super().__init__()
-        self.driver = driver
-        self.constructor = constructor
+        self.driver = {}
+        self.constructor = None
+        self.cards = []
+        self.portrait_loaded = False
+        self.stats_repo = get_stats_repo()
+        self.stats_repo.statsChanged.connect(self.on_stats_changed)
         self.initUI()
+        if driver:
+            self.bind(driver, constructor)
 
     def create_card(self, widgets: list, width=450, base_color="#2a2a3f"):
         """Card with background color and black text"""
@@ -30,18 +80,13 @@ class DriverDetails(QWidget):
             layout.addWidget(w)
         card.setLayout(layout)
         card.setFixedWidth(width)
-        card.setStyleSheet(f"""
-            QWidget {{
-                background-color: {base_color};
-                border-radius: 16px;
-                padding: 16px;
-            }}
-        """)
+        card.setStyleSheet(CARD_STYLE.format(color=base_color))
         shadow = QGraphicsDropShadowEffect()
         shadow.setBlurRadius(25)
         shadow.setOffset(0, 0)
         shadow.setColor(QColor(0, 0, 0, 100))
         card.setGraphicsEffect(shadow)
+        self.cards.append(card)
         return card
 
     def create_label(self, text, bold=False, font_size=16):
@@ -54,14 +99,11 @@ class DriverDetails(QWidget):
         return label
 
     def initUI(self):
-        team_color = "#1e1e2f"  # default dark
-        if self.constructor and self.constructor.get("name") in TEAM_COLORS:
-            team_color = TEAM_COLORS[self.constructor["name"]]
-
         # --- Scrollable container ---
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
         scroll.setStyleSheet("QScrollArea {border: none;}")
+        self.scroll = scroll
 
         container = QWidget()
         container_layout = QVBoxLayout()
@@ -76,97 +118,56 @@ class DriverDetails(QWidget):
         info_layout.setSpacing(20)
 
         # ---- Driver Info Card ---- 
-        name_label = self.create_label(self.driver.get('driverName', 'Unknown'), bold=True, font_size=24)
-        flag_image_path = FLAGS_IMAGES_DIR / f"{self.driver['nationality']}.png"
-        flag_pixmap = QPixmap(str(flag_image_path))
-        if flag_pixmap.isNull():
-            flag_pixmap = QPixmap(100, 100)
-            flag_pixmap.fill(Qt.GlobalColor.lightGray)
-        flag_pixmap = flag_pixmap.scaled(100, 100, Qt.AspectRatioMode.KeepAspectRatio,
-                                        Qt.TransformationMode.SmoothTransformation)
-        flag_label = QLabel()   
-        flag_label.setPixmap(flag_pixmap)
-        nationality_label = self.create_label(self.driver.get('nationality', 'Unknown'), bold=True, font_size=16)
+        self.name_label = self.create_label("", bold=True, font_size=24)
+        self.flag_label = QLabel()
+        self.nationality_label = self.create_label("", bold=True, font_size=16)
 
         nat_layout = QHBoxLayout()
-        nat_layout.addWidget(flag_label)
+        nat_layout.addWidget(self.flag_label)
         nat_layout.addSpacing(12)
-        nat_layout.addWidget(nationality_label)
+        nat_layout.addWidget(self.nationality_label)
         nat_widget = QWidget()
         nat_widget.setLayout(nat_layout)
 
-        number_label = self.create_label(f"Number: {self.driver.get('permanentNumber', 'N/A')}", font_size=16)
-        dob_label = self.create_label(f"DOB: {self.driver.get('dateOfBirth', 'N/A')}", font_size=16)
-        code_label = self.create_label(f"Code: {self.driver.get('code', 'N/A')}", font_size=16)
+        self.number_label = self.create_label("", font_size=16)
+        self.dob_label = self.create_label("", font_size=16)
+        self.code_label = self.create_label("", font_size=16)
 
-        driver_card = self.create_card([name_label, nat_widget, number_label, dob_label, code_label],
-                                       base_color=team_color)
+        driver_card = self.create_card([self.name_label, nat_widget, self.number_label,
+                                        self.dob_label, self.code_label])
         info_layout.addWidget(driver_card)
 
         # ---- Constructor Card ---- 
-        if self.constructor:
-            # Team Logo
-            logo_path = CONSTRUCTOR_IMAGES_DIR / f"{self.constructor['constructorId']}.png"
-            logo_pixmap = QPixmap(str(logo_path))
-            if logo_pixmap.isNull():
-                logo_pixmap = QPixmap(100, 100)
-                logo_pixmap.fill(Qt.GlobalColor.lightGray)
-            logo_pixmap = logo_pixmap.scaled(100, 100, Qt.AspectRatioMode.KeepAspectRatio,
-                                            Qt.TransformationMode.SmoothTransformation)
-            logo_label = QLabel()
-            logo_label.setPixmap(logo_pixmap)
-
-            # Team Name + Nationality
-            constructor_name = self.create_label(
-                f"Team: {self.constructor.get('name', 'N/A')}", bold=True, font_size=18
-            )
-            constructor_nat = self.create_label(
-                f"Nationality: {self.constructor.get('nationality', 'N/A')}", font_size=16
-            )
-
-            # Layout with logo + text
-            team_layout = QHBoxLayout()
-            team_layout.addWidget(logo_label)
-            team_layout.addSpacing(12)
-
-            text_widget = QWidget()
-            text_layout = QVBoxLayout()
-            text_layout.setContentsMargins(0, 0, 0, 0)
-            text_layout.addWidget(constructor_name)
-            text_layout.addWidget(constructor_nat)
-            text_widget.setLayout(text_layout)
-
-            team_layout.addWidget(text_widget)
-            team_widget = QWidget()
-            team_widget.setLayout(team_layout)
-
-            constructor_card = self.create_card([team_widget], base_color=team_color)
-            info_layout.addWidget(constructor_card)
-
-        # ---------------- Load driver stats from AppData ----------------
-        appdata_dir = Path(os.getenv('APPDATA')) / "F1App"
-        stats_file = appdata_dir / "drivers_stats.json"
-
-        if stats_file.exists():
-            with stats_file.open("r", encoding="utf-8") as f:
-                all_drivers_stats = json.load(f)
-        else:
-            all_drivers_stats = []
-        driver_id = self.driver.get('driverId') if self.driver else None
-        if driver_id:
-            json_driver = next((d for d in all_drivers_stats if d["driverId"] == driver_id), None)
-            if json_driver:
-                self.driver.update(json_driver)
+        self.logo_label = QLabel()
+        self.constructor_name = self.create_label("", bold=True, font_size=18)
+        self.constructor_nat = self.create_label("", font_size=16)
 
-        # ------------------- Stats Card -------------------
-    
+        # Layout with logo + text
+        team_layout = QHBoxLayout()
+        team_layout.addWidget(self.logo_label)
+        team_layout.addSpacing(12)
+
+        text_widget = QWidget()
+        text_layout = QVBoxLayout()
+        text_layout.setContentsMargins(0, 0, 0, 0)
+        text_layout.addWidget(self.constructor_name)
+        text_layout.addWidget(self.constructor_nat)
+        text_widget.setLayout(text_layout)
+
+        team_layout.addWidget(text_widget)
+        team_widget = QWidget()
+        team_widget.setLayout(team_layout)
+
+        self.constructor_card = self.create_card([team_widget])
+        info_layout.addWidget(self.constructor_card)
 
-# ------------------- Stats Card -------------------
+        # ------------------- Stats Card -------------------
         stats_widgets = []
+        self.stat_labels = {}
 
-        def add_stat_widget(text):
-            
-            label = self.create_label(text, font_size=16)
+        for key in STAT_FIELDS:
+            label = self.create_label("", font_size=16)
+            self.stat_labels[key] = label
             stats_widgets.append(label)
 
             line = QFrame()
@@ -174,56 +175,26 @@ class DriverDetails(QWidget):
             line.setFrameShadow(QFrame.Shadow.Sunken)
             line.setStyleSheet("background-color: #EAEAEA; max-height: 1px;")  
             stats_widgets.append(line)
-
-        add_stat_widget(f"Total Points: {self.driver.get('totalPoints', 0)}")
-        add_stat_widget(f"Total Poles: {self.driver.get('totalPoles', 0)}")
-        add_stat_widget(f"Total Wins: {self.driver.get('totalWins', 0)}")
-        add_stat_widget(f"Total Podiums: {self.driver.get('totalPodiums', 0)}")
-        add_stat_widget(f"Seasons Raced: {self.driver.get('seasonsRaced', 0)}")
         if isinstance(stats_widgets[-1], QFrame):
             stats_widgets.pop()
 
-        stats_card = self.create_card(stats_widgets, base_color=team_color)
+        stats_card = self.create_card(stats_widgets)
         info_layout.addWidget(stats_card)
 
 
         # ----  Back Button ---- 
-        back_btn = QPushButton("← Back")
-        back_btn.setFixedWidth(120)
-        back_btn.setStyleSheet(f"""
-            QPushButton {{
-                color: black;
-                background-color: {team_color};
-                border-radius: 8px;
-                padding: 8px;
-                font-weight: bold;
-            }}
-            QPushButton:hover {{
-                background-color: {team_color};
-                opacity: 0.85;
-            }}
-        """)
-        back_btn.clicked.connect(lambda: self.driverSelected.emit("back"))
-        info_layout.addWidget(back_btn, alignment=Qt.AlignmentFlag.AlignLeft)
+        self.back_btn = QPushButton("← Back")
+        self.back_btn.setFixedWidth(120)
+        self.back_btn.clicked.connect(lambda: self.driverSelected.emit("back"))
+        info_layout.addWidget(self.back_btn, alignment=Qt.AlignmentFlag.AlignLeft)
         info_layout.addStretch()
 
         top_layout.addLayout(info_layout, 2)
 
         # ---- RIGHT PANEL: Driver Image ----
-        image_label = QLabel()
-        driver_image_path = DRIVER_IMAGES_DIR / f"{self.driver['driverId']}.png"
-        pixmap = QPixmap(str(driver_image_path))
-        if pixmap.isNull():
-            pixmap = QPixmap(800, 1000)
-            pixmap.fill(Qt.GlobalColor.lightGray)
-        pixmap = pixmap.scaled(
-            650, 900, Qt.AspectRatioMode.KeepAspectRatio,
-            Qt.TransformationMode.SmoothTransformation
-        )
-        
-        image_label.setPixmap(pixmap)
-        image_label.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
-        top_layout.addWidget(image_label, alignment=Qt.AlignmentFlag.AlignCenter, stretch=3)
+        self.image_label = QLabel()
+        self.image_label.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        top_layout.addWidget(self.image_label, alignment=Qt.AlignmentFlag.AlignCenter, stretch=3)
 
         container_layout.addLayout(top_layout)
         container.setLayout(container_layout)
@@ -240,6 +211,79 @@ class DriverDetails(QWidget):
             }}
         """)
 
+    def bind(self, driver: dict, constructor: dict = None):
+        """Show another driver in the existing widgets."""
+        self.driver = driver
+        self.constructor = constructor
+
+        team_color = DEFAULT_TEAM_COLOR
+        if constructor and constructor.get("name") in TEAM_COLORS:
+            team_color = TEAM_COLORS[constructor["name"]]
+        for card in self.cards:
+            card.setStyleSheet(CARD_STYLE.format(color=team_color))
+        self.back_btn.setStyleSheet(BACK_BUTTON_STYLE.format(color=team_color))
+
+        # ---- Driver info ----
+        self.name_label.setText(driver.get('driverName', 'Unknown'))
+        self.flag_label.setPixmap(load_scaled(
+            FLAGS_IMAGES_DIR / f"{driver.get('nationality')}.png", 100, 100, (100, 100)))
+        self.nationality_label.setText(driver.get('nationality', 'Unknown'))
+        self.number_label.setText(f"Number: {driver.get('permanentNumber', 'N/A')}")
+        self.dob_label.setText(f"DOB: {driver.get('dateOfBirth', 'N/A')}")
+        self.code_label.setText(f"Code: {driver.get('code', 'N/A')}")
+
+        # ---- Constructor ----
+        self.constructor_card.setVisible(bool(constructor))
+        if constructor:
+            self.logo_label.setPixmap(load_scaled(
+                CONSTRUCTOR_IMAGES_DIR / f"{constructor['constructorId']}.png", 100, 100, (100, 100)))
+            self.constructor_name.setText(f"Team: {constructor.get('name', 'N/A')}")
+            self.constructor_nat.setText(f"Nationality: {constructor.get('nationality', 'N/A')}")
+
+        # ---- Career stats ----
+        self.show_stats()
+
+        # ---- Portrait (heavy: only while visible) ----
+        self.portrait_loaded = False
+        if self.isVisible():
+            self.load_portrait()
+        else:
+            self.image_label.clear()
+
+        self.scroll.verticalScrollBar().setValue(0)
+        quality.apply_effects(self)
+
+    def show_stats(self):
+        """Merge the driver's career stats from the repository into the stats card."""
+        stats = self.stats_repo.get(self.driver.get('driverId'))
+        if stats:
+            self.driver.update(stats)
+        for key, title in STAT_FIELDS.items():
+            self.stat_labels[key].setText(f"{title}: {self.driver.get(key, 0)}")
+
+    def on_stats_changed(self):
+        if self.driver:
+            self.show_stats()
+
+    def load_portrait(self):
+        if self.portrait_loaded or not self.driver:
+            return
+        self.image_label.setPixmap(load_scaled(
+            DRIVER_IMAGES_DIR / f"{self.driver['driverId']}.png", 650, 900, (800, 1000)))
+        self.portrait_loaded = True
+
+    def release_portrait(self):
+        self.image_label.clear()
+        self.portrait_loaded = False
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        self.load_portrait()
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.release_portrait()
+
 
 if __name__ == "__main__":
     app = QApplication(sys.argv)
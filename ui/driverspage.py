@@ -7,13 +7,20 @@ from PyQt6.QtCore import Qt, QPropertyAnimation, pyqtSignal
 from PyQt6.QtGui import QPixmap, QColor, QFont
 from collections import defaultdict
 from config.settings import DRIVER_IMAGES_DIR
-from services.worker import Worker
+from services.worker import submit, NORMAL, LOW
 from utils.api_helper import on_failed as show_api_error
 from services.d_standings import get_driver_standings
 from config.colors import TEAM_COLORS
 from ui.skeleton import DriverSkeleton
+from ui import quality
+from ui.incremental import animate_moves
+from ui.progressive import ProgressiveBuilder, visible_count
+from services.diff import diff_rows
 from ui.d_details import DriverDetails
 
+CARD_FIELDS = ["driverName", "permanentNumber", "constructorName", "wins"]
+CARD_HEIGHT = 260
+
 
 class DriverCard(QWidget):
     driverClicked = pyqtSignal(str)
@@ -37,6 +44,7 @@ class DriverCard(QWidget):
         color = QColor(team_color)
         brightness = (color.red() * 0.299 + color.green() * 0.587 + color.blue() * 0.114)
         text_color =  "#000000"
+        self.text_color = text_color
 
         # --- Driver image
         driver_image_path = DRIVER_IMAGES_DIR / f"{self.driver['driverId']}.png"
@@ -47,7 +55,7 @@ class DriverCard(QWidget):
         else:
             crop_height = pixmap.height() // 2
             pixmap = pixmap.copy(0, 0, pixmap.width(), crop_height)
-        pixmap = pixmap.scaledToWidth(110, Qt.TransformationMode.SmoothTransformation)
+        pixmap = pixmap.scaledToWidth(110, quality.transform_mode())
 
         driverImg = QLabel()
         driverImg.setPixmap(pixmap)
@@ -66,7 +74,8 @@ class DriverCard(QWidget):
         # --- Labels
         name_label = QLabel(f"#{number} {name}")
         team_label = QLabel(team)
-        win_label = QLabel(f"Wins: {wins}")
+        win_label = QLabel()
+        self.win_label = win_label
 
         # ---- Fonts
         name_label.setFont(QFont("Segoe UI", 20, QFont.Weight.Bold))
@@ -76,10 +85,7 @@ class DriverCard(QWidget):
         # ---- Colors
         name_label.setStyleSheet(f"color: {text_color};")
         team_label.setStyleSheet(f"color: {text_color};")
-        if int(wins) > 0:
-            win_label.setStyleSheet("color: #4a2c0a; font-weight: bold;")
-        else:
-            win_label.setStyleSheet(f"color: {text_color}; font-style: italic;")
+        self.set_wins(wins)
 
         # --- Info layout
         info_layout = QVBoxLayout()
@@ -146,6 +152,17 @@ class DriverCard(QWidget):
         shadow.setColor(QColor(0, 0, 0, 180))
         self.setGraphicsEffect(shadow)
 
+    def set_wins(self, wins):
+        self.win_label.setText(f"Wins: {wins}")
+        if int(wins) > 0:
+            self.win_label.setStyleSheet("color: #4a2c0a; font-weight: bold;")
+        else:
+            self.win_label.setStyleSheet(f"color: {self.text_color}; font-style: italic;")
+
+    def update_data(self, driver: dict):
+        self.driver = driver
+        self.set_wins(driver.get("wins", "0"))
+
     def on_details_clicked(self):
         driver_id = self.driver.get("driverId")
         self.driverClicked.emit(driver_id)
@@ -157,6 +174,9 @@ class DriversWindow(QWidget):
         super().__init__()
         self.setWindowTitle("Drivers")
         self.drivers = []
+        self.sorted_drivers = []
+        self.cards = {}
+        self.builder = None
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
         self.setWindowFlags(Qt.WindowType.FramelessWindowHint)
 
@@ -203,27 +223,37 @@ class DriversWindow(QWidget):
 
     def show_skeletons(self):
         self.clear_layout(self.gbox)
+        self.cards = {}
+        self.sorted_drivers = []
         for i in range(6):
             card = DriverSkeleton()
             row, col = divmod(i, 2)
             self.gbox.addWidget(card, row, col)
 
-    def load_drivers(self):
-        self.worker = Worker(get_driver_standings)
-        self.worker.finished.connect(self.on_data_loaded)
-        self.worker.failed.connect(self.on_failed)
-        self.worker.start()
+    def load_drivers(self, priority=NORMAL):
+        self.task = submit(get_driver_standings, self.on_data_loaded, self.on_failed,
+                           key=f"drivers-{id(self)}", priority=priority)
 
     def clear_layout(self, layout):
+        if layout is self.gbox and self.builder:
+            self.builder.cancel()
+            self.builder = None
         while layout.count():
             item = layout.takeAt(0)
             widget = item.widget()
             if widget:
                 widget.deleteLater()
 
+    def refresh(self):
+        """Re-fetch the grid; only cards that changed are touched."""
+        self.load_drivers(priority=LOW)
+
+    def make_card(self, driver):
+        card = DriverCard(driver)
+        card.driverClicked.connect(self.open_driver_detail_page)
+        return card
+
     def on_data_loaded(self, drivers):
-        
-        self.clear_layout(self.gbox)
         self.drivers = drivers
         
         teams = defaultdict(list)
@@ -235,20 +265,85 @@ class DriversWindow(QWidget):
         for team, members in teams.items():
             sorted_drivers.extend(members)
 
-        for i, driver in enumerate(sorted_drivers):
-            card = DriverCard(driver)
-            card.driverClicked.connect(self.open_driver_detail_page)
-            row, col = divmod(i, 2)
-            self.gbox.addWidget(card, row, col)
+        if not self.cards or not (self.builder is None or self.builder.done):
+            self.build_grid(sorted_drivers)
+            return
+
+        diff = diff_rows(self.sorted_drivers, sorted_drivers, "driverId", CARD_FIELDS)
+        self.sorted_drivers = sorted_drivers
+        by_id = {d["driverId"]: d for d in sorted_drivers}
+
+        for driver_id in diff["removed"]:
+            card = self.cards.pop(driver_id)
+            self.gbox.removeWidget(card)
+            card.deleteLater()
+
+        replaced = False
+        for driver_id, fields in diff["changed"].items():
+            if fields == ["wins"]:
+                self.cards[driver_id].update_data(by_id[driver_id])
+                continue
+            # team, name or number changed: the card colours depend on it
+            old = self.cards[driver_id]
+            self.gbox.removeWidget(old)
+            old.deleteLater()
+            self.cards[driver_id] = self.make_card(by_id[driver_id])
+            replaced = True
+
+        new_cards = []
+        for driver_id in diff["added"]:
+            self.cards[driver_id] = self.make_card(by_id[driver_id])
+            new_cards.append(self.cards[driver_id])
+
+        if diff["added"] or diff["moved"] or replaced:
+            old_pos = {k: self.cards[k].pos() for k in diff["moved"]}
+            for i, driver_id in enumerate(diff["order"]):
+                card = self.cards[driver_id]
+                row, col = divmod(i, 2)
+                self.gbox.removeWidget(card)
+                self.gbox.addWidget(card, row, col)
+            animate_moves(self.gbox, self.cards, old_pos)
+
+        for card in new_cards:
+            if quality.animations_enabled():
+                anim = QPropertyAnimation(card, b"windowOpacity")
+                anim.setDuration(400)
+                anim.setStartValue(0)
+                anim.setEndValue(1)
+                anim.start()
+
+        quality.apply_effects(self.container)
+            
 
+    def build_grid(self, sorted_drivers):
+        """First load: build the grid progressively, first screenful in one go."""
+        self.clear_layout(self.gbox)
+        self.cards = {}
+        self.sorted_drivers = sorted_drivers
+        self.builder = ProgressiveBuilder(
+            sorted_drivers, self.add_card,
+            first=visible_count(self.scroll, CARD_HEIGHT, per_row=2), parent=self
+        )
+        self.builder.finished.connect(lambda: quality.apply_effects(self.container))
+        self.builder.start()
+
+    def add_card(self, i, driver):
+        card = self.make_card(driver)
+        self.cards[driver["driverId"]] = card
+        row, col = divmod(i, 2)
+        self.gbox.addWidget(card, row, col)
+        if quality.animations_enabled():
             anim = QPropertyAnimation(card, b"windowOpacity")
             anim.setDuration(400)
             anim.setStartValue(0)
             anim.setEndValue(1)
             anim.start()
-            
 
     def on_failed(self, error_msg):
+        if self.cards:
+            # keep the last good grid on screen when a refresh fails
+            print(f"❌ Failed to refresh drivers: {error_msg}")
+            return
         show_api_error(self.container, self.retry_load)
 
     def retry_load(self):
@@ -0,0 +1,67 @@
+# -- ui/incremental.py
+from PyQt6.QtCore import QPropertyAnimation, QEasingCurve, QParallelAnimationGroup
+from services.diff import row_key
+from config import settings
+from ui import quality
+
+
+def apply_row_diff(layout, rows: dict, items: list, diff: dict, key, factory):
+    """
+    Apply a services.diff result to a QBoxLayout holding one widget per row.
+
+    rows maps key -> row widget and is updated in place. Changed rows are
+    rebound through their update_data(item) method, added rows are built with
+    factory(item) and only the layout order is touched for moved rows.
+    Returns the animation group used for position swaps (or None).
+    """
+    by_key = {row_key(item, key): item for item in items}
+
+    for k in diff["removed"]:
+        widget = rows.pop(k, None)
+        if widget:
+            layout.removeWidget(widget)
+            widget.deleteLater()
+
+    for k in diff["changed"]:
+        if k in rows:
+            rows[k].update_data(by_key[k])
+
+    for k in diff["added"]:
+        rows[k] = factory(by_key[k])
+
+    if not (diff["added"] or diff["moved"]):
+        return None
+
+    old_pos = {k: rows[k].pos() for k in diff["moved"] if k in rows}
+    for i, k in enumerate(diff["order"]):
+        widget = rows[k]
+        if layout.indexOf(widget) != i:
+            layout.removeWidget(widget)
+            layout.insertWidget(i, widget)
+
+    return animate_moves(layout, rows, old_pos)
+
+
+def animate_moves(layout, rows: dict, old_pos: dict):
+    """Slide moved rows from their previous position into their new slot."""
+    parent = layout.parentWidget()
+    if (not old_pos or not settings.ANIMATE_POSITION_SWAPS
+            or not quality.animations_enabled()
+            or parent is None or not parent.isVisible()):
+        return None
+
+    layout.activate()
+    group = QParallelAnimationGroup(parent)
+    for k, start in old_pos.items():
+        widget = rows[k]
+        end = widget.pos()
+        if start == end:
+            continue
+        anim = QPropertyAnimation(widget, b"pos")
+        anim.setDuration(350)
+        anim.setEasingCurve(QEasingCurve.Type.InOutQuad)
+        anim.setStartValue(start)
+        anim.setEndValue(end)
+        group.addAnimation(anim)
+    group.start(QParallelAnimationGroup.DeletionPolicy.DeleteWhenStopped)
+    return group
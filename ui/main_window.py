@@ -13,7 +13,16 @@ from ui.wdc import WdcWindow
 from ui.wcc import WccWindow
 from ui.d_details import DriverDetails
 from ui.results import LatestRaceWindow
+from ui.pitstops import PitStopsWindow
+from ui.quality import QualityGovernor
+from ui import quality
+from services.stats_repo import get_stats_repo
+from services.updater_process import StatsUpdaterProcess
+from services.refresh_scheduler import RefreshScheduler, RESULTS, STANDINGS, WINNERS
+from services.cache_events import CacheEvents, kinds_for_paths
+from utils import http_cache
 from config.colors import TEAM_COLORS
+from config import settings
 
 DEFAULT_GRADIENT = """
 QMainWindow {
@@ -60,6 +69,16 @@ QLabel {
 }
 """
 
+# Which scheduler refresh kind each page depends on
+PAGE_REFRESH_KINDS = {
+    "Results - GP": RESULTS,
+    "wdc": STANDINGS,
+    "wcc": STANDINGS,
+    "drivers": STANDINGS,
+    "schedule": WINNERS,
+    "pitstops": RESULTS,
+}
+
 
 class MainWindow(QMainWindow):
     def __init__(self):
@@ -71,10 +90,32 @@ class MainWindow(QMainWindow):
 
         # ---- Page storage ----
         self.page_map = {}
+        self.details_page = None
 
         self.initUI()
         self.load_page("Results - GP")
         self.stack.setCurrentWidget(self.page_map["Results - GP"])
+
+        # ---- Render quality ----
+        self.quality_governor = QualityGovernor(self, parent=self)
+
+        # ---- Live data refresh ----
+        self.refresh_scheduler = RefreshScheduler(self)
+        self.refresh_scheduler.refreshDue.connect(self.refresh_pages)
+        self.refresh_scheduler.resultsFinal.connect(self.update_driver_stats)
+        self.refresh_scheduler.start()
+        QApplication.instance().aboutToQuit.connect(http_cache.log_metrics)
+        # Pushed invalidations when a shared cache daemon is configured
+        self.cache_events = CacheEvents(self)
+        self.cache_events.invalidated.connect(self.on_cache_invalidated)
+        self.cache_events.start()
+        # Load career stats in the background; the repository reloads itself
+        # whenever the updater rewrites the file
+        get_stats_repo()
+        self.stats_updater = StatsUpdaterProcess(self)
+        self.stats_updater.progress.connect(self.on_stats_progress)
+        self.stats_drivers_done = None
+        self.update_driver_stats()
         
     def initUI(self):
         # ---- Hamburger ---- 
@@ -121,13 +162,15 @@ class MainWindow(QMainWindow):
         btn_wdc = QPushButton("🏆 WDC")
         btn_construct = QPushButton("🏆 WCC")
         last_race = QPushButton("Results - GP")
+        btn_pitstops = QPushButton("⏱ Pit Stops")
 
         button_map = {
             btn_drivers: "drivers",
             btn_schedule: "schedule",
             btn_wdc: "wdc", 
             btn_construct: "wcc",
-            last_race: "Results - GP"
+            last_race: "Results - GP",
+            btn_pitstops: "pitstops"
         }
 
         for btn, name in button_map.items():
@@ -162,7 +205,10 @@ class MainWindow(QMainWindow):
         else:
             self.anim.setStartValue(QRect(-200, 0, 200, self.height()))
             self.anim.setEndValue(QRect(0, 0, 200, self.height()))
-        self.anim.start()
+        if quality.animations_enabled():
+            self.anim.start()
+        else:
+            self.sidebar.setGeometry(self.anim.endValue())
         self.sidebar_open = not self.sidebar_open
 
     def load_page(self, name):
@@ -179,6 +225,8 @@ class MainWindow(QMainWindow):
                 widget = WccWindow()
             elif name == "Results - GP":
                 widget = LatestRaceWindow()
+            elif name == "pitstops":
+                widget = PitStopsWindow()
             else:
                 return
             self.page_map[name] = widget
@@ -193,7 +241,8 @@ class MainWindow(QMainWindow):
             "schedule": "Race Schedule",
             "wdc": "World Drivers Championship",
             "wcc": "World Constructors Championship",
-            "Results - GP": "Latest Race Results"
+            "Results - GP": "Latest Race Results",
+            "pitstops": f"Pit Stops - {settings.CURRENT_SEASON} Season"
         }
 
         page_title_text = title_map.get(name, "")
@@ -203,6 +252,26 @@ class MainWindow(QMainWindow):
         self.toggle_sidebar()
         self.setStyleSheet(DEFAULT_GRADIENT)
 
+    def refresh_pages(self, kinds):
+        """Refresh already-loaded pages whose data the scheduler flagged."""
+        for name, page in self.page_map.items():
+            if PAGE_REFRESH_KINDS.get(name) in kinds:
+                page.refresh()
+
+    def on_cache_invalidated(self, paths):
+        self.refresh_pages(kinds_for_paths(paths))
+
+    def update_driver_stats(self, round_no=None):
+        """Run the career-stats updater in its low-priority worker process."""
+        self.stats_updater.start()
+
+    def on_stats_progress(self, p):
+        # one line per finished driver, not per page
+        if p["drivers_done"] != self.stats_drivers_done:
+            self.stats_drivers_done = p["drivers_done"]
+            eta = f", ~{p['eta_seconds']:.0f}s left" if p.get("eta_seconds") else ""
+            print(f"📊 Updating driver stats: {p['drivers_done']}/{p['drivers_total']} drivers{eta}")
+
     def set_team_background(self, team_name: str):
         """Change main window gradient based on team"""
         if not team_name or team_name not in TEAM_COLORS:
@@ -235,10 +304,13 @@ class MainWindow(QMainWindow):
             "constructorId": driver.get("constructorId", "N/A")
         }
 
-        details_page = DriverDetails(driver, constructor)
-        details_page.driverSelected.connect(self.handle_details_signal)
-        self.stack.addWidget(details_page)
-        self.stack.setCurrentWidget(details_page)
+        # One details page, rebound per driver instead of a new page per click
+        if self.details_page is None:
+            self.details_page = DriverDetails()
+            self.details_page.driverSelected.connect(self.handle_details_signal)
+            self.stack.addWidget(self.details_page)
+        self.details_page.bind(driver, constructor)
+        self.stack.setCurrentWidget(self.details_page)
 
         full_name = f"{driver.get('givenName', 'Driver')} {driver.get('familyName', '')}"
         page_title_text = f"Drivers - {full_name}"
@@ -266,6 +338,4 @@ if __name__ == "__main__":
     y = (screen_size.height() - height) // 2
     window.move(x, y)
     window.show()
-    import services.update_json
-    services.update_json.run_in_background()
     sys.exit(app.exec())
\ No newline at end of file
@@ -0,0 +1,144 @@
+# -- ui/pitstops.py
+# Season pit-stop analytics: per-team and per-driver median, best and count.
+# The whole summary is computed in one background task (services/pitstops.py);
+# browsing the page never makes a request.
+import sys
+from PyQt6.QtWidgets import (
+    QApplication, QWidget, QLabel, QVBoxLayout, QHBoxLayout, QFrame, QScrollArea,
+    QGraphicsDropShadowEffect
+)
+from PyQt6.QtCore import Qt
+from PyQt6.QtGui import QColor
+from services.pitstops import pit_stop_summary
+from services.worker import submit, NORMAL, LOW
+from ui.skeleton import WDCSkeleton
+from ui import quality
+from utils.api_helper import on_failed as show_api_error
+from config import colors
+
+
+def format_seconds(ms):
+    return f"{ms / 1000:.3f}s"
+
+
+class PitStopRow(QFrame):
+    """One team or driver: name, median, best and number of stops."""
+    def __init__(self, row: dict, team: str):
+        super().__init__()
+        self.setStyleSheet("background-color: #1E1E1E; border-radius: 12px;")
+        layout = QHBoxLayout(self)
+        layout.setContentsMargins(15, 8, 15, 8)
+        layout.setSpacing(20)
+
+        strip = QFrame()
+        strip.setFixedWidth(6)
+        strip.setStyleSheet(f"background-color: {colors.TEAM_COLORS.get(team, '#2A2F38')}; border-radius: 3px;")
+        name = QLabel(row["name"])
+        name.setStyleSheet("color: #EAEAEA; font-weight: bold; background: transparent;")
+        median = QLabel(f"Median {format_seconds(row['median'])}")
+        median.setStyleSheet("color: #FFD700; background: transparent;")
+        best = QLabel(f"Best {format_seconds(row['best'])}")
+        best.setStyleSheet("color: #CCCCCC; background: transparent;")
+        count = QLabel(f"{row['count']} stops")
+        count.setStyleSheet("color: #AAAAAA; background: transparent;")
+
+        layout.addWidget(strip)
+        layout.addWidget(name)
+        layout.addStretch()
+        for lbl in [median, best, count]:
+            layout.addWidget(lbl)
+
+        shadow = QGraphicsDropShadowEffect(self)
+        shadow.setBlurRadius(15)
+        shadow.setXOffset(0)
+        shadow.setYOffset(3)
+        shadow.setColor(QColor(0, 0, 0, 140))
+        self.setGraphicsEffect(shadow)
+
+
+class PitStopsWindow(QWidget):
+    def __init__(self):
+        super().__init__()
+        self.summary = None
+        self.setWindowTitle("Pit Stops")
+        self.setStyleSheet("""
+            QWidget { background-color: transparent; font-family: 'Segoe UI', Arial, sans-serif; }
+            QScrollArea { border: none; }
+            QScrollBar:vertical { width: 8px; background: #2A2F38; margin: 0px; border-radius: 4px; }
+            QScrollBar::handle:vertical { background: #555; border-radius: 4px; }
+            QScrollBar::handle:vertical:hover { background: #888; }
+        """)
+        self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)
+        self.initUI()
+
+    def initUI(self):
+        self.main_layout = QVBoxLayout(self)
+        self.scroll = QScrollArea()
+        self.scroll.setWidgetResizable(True)
+        self.container = QWidget()
+        self.list_vbox = QVBoxLayout(self.container)
+        self.list_vbox.setSpacing(10)
+        self.scroll.setWidget(self.container)
+        self.main_layout.addWidget(self.scroll)
+        self.list_vbox.addWidget(WDCSkeleton(podium_count=0, list_count=8))
+        self.load_stops()
+
+    def load_stops(self, priority=NORMAL):
+        self.task = submit(pit_stop_summary, self.on_stops_loaded, self.on_failed,
+                           key=f"pitstops-{id(self)}", priority=priority)
+
+    def refresh(self):
+        """Re-read the season; only rounds not yet final are fetched again."""
+        self.load_stops(priority=LOW)
+
+    def clear_layout(self, layout):
+        while layout.count():
+            item = layout.takeAt(0)
+            widget = item.widget()
+            if widget:
+                widget.deleteLater()
+
+    def section(self, title):
+        label = QLabel(title)
+        label.setStyleSheet("color: #FFD700; font-size: 18px; font-weight: bold; padding-top: 10px;")
+        self.list_vbox.addWidget(label)
+
+    def on_stops_loaded(self, summary):
+        if summary == self.summary:
+            return
+        self.summary = summary
+        self.clear_layout(self.list_vbox)
+
+        if not summary["teams"]:
+            self.section("No pit stops recorded yet this season")
+            self.list_vbox.addStretch()
+            return
+
+        self.section(f"Teams · {summary['rounds']} rounds")
+        for row in summary["teams"]:
+            self.list_vbox.addWidget(PitStopRow(row, row["name"]))
+        self.section("Drivers")
+        for row in summary["drivers"]:
+            self.list_vbox.addWidget(PitStopRow(row, row["team"]))
+        self.list_vbox.addStretch()
+        quality.apply_effects(self)
+
+    def on_failed(self, error_msg):
+        if self.summary:
+            # keep the last good summary on screen when a refresh fails
+            print(f"❌ Failed to refresh pit stops: {error_msg}")
+            return
+        show_api_error(self.container, self.retry_load, message=f"Error: {error_msg}")
+
+    def retry_load(self):
+        self.clear_layout(self.list_vbox)
+        self.list_vbox.addWidget(WDCSkeleton(podium_count=0, list_count=8))
+        self.load_stops()
+
+
+if __name__ == "__main__":
+    app = QApplication(sys.argv)
+    window = PitStopsWindow()
+    window.resize(900, 700)
+    window.show()
+    sys.exit(app.exec())
@@ -0,0 +1,67 @@
+# -- ui/progressive.py
+import time
+from PyQt6.QtCore import QObject, QTimer, pyqtSignal
+from config import settings
+
+
+def visible_count(scroll_area, item_height, per_row=1):
+    """How many items fit in the scroll area's viewport (at least one row)."""
+    rows = scroll_area.viewport().height() // max(1, item_height) + 1
+    return max(1, rows) * per_row
+
+
+class ProgressiveBuilder(QObject):
+    """
+    Builds a page's widgets across several event-loop turns.
+
+    build(index, item) is called for every item in order. The first
+    `first` items are built immediately so the visible part of the page
+    appears in one frame; the rest are built in slices that stop once
+    BUILD_SLICE_MS is spent, yielding to input and paint in between.
+    """
+    finished = pyqtSignal()
+
+    def __init__(self, items, build, first=1, slice_ms=None, parent=None):
+        super().__init__(parent)
+        self.items = list(items)
+        self.build = build
+        self.first = first
+        self.slice_ms = settings.BUILD_SLICE_MS if slice_ms is None else slice_ms
+        self.next_index = 0
+        self.cancelled = False
+
+    @property
+    def done(self):
+        return self.next_index >= len(self.items)
+
+    def start(self):
+        self.build_until(min(self.first, len(self.items)))
+        self.schedule()
+        return self
+
+    def cancel(self):
+        self.cancelled = True
+
+    def build_until(self, stop):
+        while self.next_index < stop:
+            i = self.next_index
+            self.next_index += 1
+            self.build(i, self.items[i])
+
+    def schedule(self):
+        if self.cancelled:
+            return
+        if self.done:
+            self.finished.emit()
+            return
+        QTimer.singleShot(0, self.run_slice)
+
+    def run_slice(self):
+        if self.cancelled:
+            return
+        deadline = time.perf_counter() + self.slice_ms / 1000
+        # always make progress, even if one item exceeds the budget
+        self.build_until(self.next_index + 1)
+        while not self.done and time.perf_counter() < deadline:
+            self.build_until(self.next_index + 1)
+        self.schedule()
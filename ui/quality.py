@@ -0,0 +1,119 @@
+# -- ui/quality.py
+import logging
+from collections import deque
+from PyQt6.QtWidgets import QWidget, QGraphicsDropShadowEffect
+from PyQt6.QtCore import QObject, QTimer, QElapsedTimer, pyqtSignal, Qt
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+# Each level includes every degradation of the levels before it.
+LEVELS = ["full", "no_shadows", "fast_transform", "no_animations"]
+FULL, NO_SHADOWS, FAST_TRANSFORM, NO_ANIMATIONS = range(len(LEVELS))
+
+WINDOW_SIZE = 20          # heartbeat samples per decision
+OVERRUN_RATIO = 0.3       # share of late samples that counts as "sustained"
+HEADROOM_WINDOWS = 5      # clean windows needed before stepping back up
+
+_level = FULL
+
+
+def current_level() -> int:
+    return _level
+
+
+def level_name(level=None) -> str:
+    return LEVELS[_level if level is None else level]
+
+
+def shadows_enabled() -> bool:
+    return _level < NO_SHADOWS
+
+
+def transform_mode():
+    """Transformation mode pages should use when scaling pixmaps."""
+    if _level >= FAST_TRANSFORM:
+        return Qt.TransformationMode.FastTransformation
+    return Qt.TransformationMode.SmoothTransformation
+
+
+def animations_enabled() -> bool:
+    return _level < NO_ANIMATIONS
+
+
+def apply_effects(root: QWidget):
+    """Enable/disable every drop shadow below root to match the current level."""
+    enabled = shadows_enabled()
+    for widget in [root, *root.findChildren(QWidget)]:
+        effect = widget.graphicsEffect()
+        if isinstance(effect, QGraphicsDropShadowEffect):
+            effect.setEnabled(enabled)
+
+
+class QualityGovernor(QObject):
+    """Steps render quality down on sustained frame overruns and back up on headroom.
+
+    Frame time is measured as the latency of a heartbeat timer: a paint or slot
+    that blocks the event loop delays the next tick by the same amount.
+    """
+    levelChanged = pyqtSignal(int)
+
+    def __init__(self, root: QWidget, parent=None):
+        super().__init__(parent)
+        self.root = root
+        self.interval = settings.FRAME_PROBE_INTERVAL_MS
+        self.budget = settings.FRAME_BUDGET_MS
+        self.samples = deque(maxlen=WINDOW_SIZE)
+        self.clean_windows = 0
+        self.clock = QElapsedTimer()
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.setSingleShot(True)
+        self.timer.setInterval(self.interval)
+        self.timer.timeout.connect(self.on_tick)
+
+        pinned = settings.RENDER_QUALITY
+        if pinned != "auto":
+            if pinned in LEVELS:
+                self.set_level(LEVELS.index(pinned))
+                logger.info("Render quality pinned to '%s'", pinned)
+                return
+            logger.warning("Unknown RENDER_QUALITY '%s', using auto", pinned)
+        logger.info("Render quality governor started at '%s'", level_name())
+        self.clock.start()
+        self.timer.start()
+
+    def on_tick(self):
+        # Single-shot and re-armed here, so each sample is the delay of one
+        # tick rather than drift that a periodic timer would catch up on.
+        elapsed = self.clock.restart()
+        self.timer.start()
+        self.samples.append(max(0, elapsed - self.interval))
+        if len(self.samples) < WINDOW_SIZE:
+            return
+
+        late = sum(1 for lag in self.samples if lag > self.budget)
+        worst = max(self.samples)
+        self.samples.clear()
+
+        if late >= WINDOW_SIZE * OVERRUN_RATIO:
+            self.clean_windows = 0
+            if _level < NO_ANIMATIONS:
+                logger.info("Frame overruns: %d/%d late (worst %d ms)", late, WINDOW_SIZE, worst)
+                self.set_level(_level + 1)
+        elif worst < self.budget / 2:
+            self.clean_windows += 1
+            if self.clean_windows >= HEADROOM_WINDOWS and _level > FULL:
+                self.clean_windows = 0
+                self.set_level(_level - 1)
+        else:
+            self.clean_windows = 0
+
+    def set_level(self, level: int):
+        global _level
+        if level == _level:
+            return
+        previous, _level = _level, level
+        logger.info("Render quality: %s -> %s", LEVELS[previous], LEVELS[level])
+        apply_effects(self.root)
+        self.levelChanged.emit(level)
@@ -0,0 +1,327 @@
+# -- ui/replay.py
+# Race replay: every driver's running position and gap, animated from the
+# race's lap table (services/laps.py).
+#
+# ReplayData turns the table into per-driver arrays once (race time at the
+# start of every lap, position at the end of every lap). A frame is then a
+# bisect and a lerp per driver: a driver's distance at race time t is
+# laps completed plus the share of the current lap elapsed, and the
+# running order is the order of those distances. ReplayCanvas paints the
+# frame straight from that with QPainter: no per-driver widgets.
+import math
+from array import array
+from bisect import bisect_right
+from PyQt6.QtWidgets import (
+    QWidget, QLabel, QVBoxLayout, QHBoxLayout, QPushButton, QSlider, QComboBox
+)
+from PyQt6.QtCore import Qt, QTimer, QElapsedTimer, QRectF, QPointF
+from PyQt6.QtGui import QPainter, QColor, QFont, QPen
+from PyQt6 import sip
+from config import settings
+from services.worker import submit
+from services.laps import get_race_laps
+from ui import quality
+
+REPLAY_TASK_KEY = "race-replay"     # one replay loads at a time; a new one supersedes it
+DEFAULT_COLOR = "#888888"
+SLOT_EASING_MS = 250     # time constant of a position swap on screen
+
+BUTTON_STYLE = """
+    QPushButton {
+        color: #000;
+        background-color: #FFD700;
+        border-radius: 8px;
+        padding: 6px 12px;
+        font-weight: bold;
+    }
+"""
+
+
+def format_clock(ms):
+    seconds = int(ms // 1000)
+    return f"{seconds // 3600}:{seconds // 60 % 60:02d}:{seconds % 60:02d}"
+
+
+class ReplayData:
+    """Per-driver lap arrays of one race and the frame computed from them."""
+    def __init__(self, table):
+        self.drivers = table.drivers
+        self.laps = table.laps
+        cumulative = table.cumulative_times()
+        self.starts = []        # race time (ms) at the start of each lap, then at the end of the last
+        self.positions = []     # position at the end of each completed lap
+        for i in range(len(self.drivers)):
+            row = cumulative[i * self.laps:(i + 1) * self.laps]
+            done = next((n for n, ms in enumerate(row) if not ms), self.laps)
+            self.starts.append(array("i", [0]) + row[:done])
+            self.positions.append(table.lap_positions(i)[:done])
+        self.duration = max((row[-1] for row in self.starts), default=0)
+        # first car to complete the full distance; stopping before it means retiring
+        self.finish = min((row[-1] for row in self.starts if len(row) == self.laps + 1),
+                          default=self.duration)
+
+    def start_position(self, i):
+        """Position at the end of lap 1 (last if the driver never completed it)."""
+        return self.positions[i][0] if self.positions[i] else len(self.drivers)
+
+    def distance(self, i, t):
+        """Laps covered by driver i at race time t (fractional)."""
+        row = self.starts[i]
+        k = bisect_right(row, t) - 1
+        if k >= len(row) - 1:
+            return float(len(row) - 1)
+        return k + (t - row[k]) / (row[k + 1] - row[k])
+
+    def time_at(self, i, distance):
+        """Race time at which driver i covered distance laps."""
+        row = self.starts[i]
+        k = int(distance)
+        if k >= len(row) - 1:
+            return row[-1]
+        return row[k] + (distance - k) * (row[k + 1] - row[k])
+
+    def frame(self, t):
+        """
+        Running order at race time t: a list of dicts (index, distance,
+        gap text, state) with the leader first. state is "running",
+        "finished" or "out".
+        """
+        cars = []
+        for i, row in enumerate(self.starts):
+            distance = self.distance(i, t)
+            stopped = distance >= len(row) - 1 and t >= row[-1]
+            state = "running"
+            if stopped:
+                state = "finished" if row[-1] >= self.finish else "out"
+            cars.append((i, distance, state, row[-1] if stopped else t))
+        # same distance: whoever got there first is ahead, then the lap 1 order (the start)
+        cars.sort(key=lambda car: (-car[1], car[3], self.start_position(car[0])))
+
+        frame = []
+        leader = cars[0] if cars else None
+        for rank, (i, distance, state, reached) in enumerate(cars):
+            if rank == 0:
+                gap = f"Lap {min(int(distance) + 1, self.laps)}" if state == "running" else "Leader"
+            elif state == "out":
+                gap = "OUT"
+            elif leader[1] - distance >= 1:
+                down = int(leader[1] - distance)
+                gap = f"+{down} lap" + ("s" if down > 1 else "")
+            else:
+                gap = f"+{(reached - self.time_at(leader[0], distance)) / 1000:.1f}s"
+            gained = self.start_position(i) - (rank + 1) if self.positions[i] else 0
+            frame.append({"index": i, "distance": distance, "gap": gap, "state": state, "gained": gained})
+        return frame
+
+
+def build_replay(season, round_no):
+    """Lap table -> ReplayData, off the GUI thread."""
+    return ReplayData(get_race_laps(season, round_no))
+
+
+class ReplayCanvas(QWidget):
+    """Paints one replay frame: the timing tower on the left, the cars on a lap ring on the right."""
+    def __init__(self, data, labels, parent=None):
+        super().__init__(parent)
+        self.data = data
+        self.labels = labels        # driverId -> (code, team colour)
+        self.time = 0
+        self.frame = data.frame(0)
+        self.slots = {car["index"]: float(rank) for rank, car in enumerate(self.frame)}
+        self.font = QFont("Segoe UI", 10)
+        self.bold = QFont("Segoe UI", 10, QFont.Weight.Bold)
+        self.setMinimumSize(640, 420)
+
+    def set_time(self, t, elapsed_ms=0, snap=True):
+        """Move to race time t; slots ease towards the new order over elapsed_ms unless snap."""
+        self.time = t
+        self.frame = self.data.frame(t)
+        step = 1.0 if snap else 1 - math.exp(-elapsed_ms / SLOT_EASING_MS)
+        for rank, car in enumerate(self.frame):
+            slot = self.slots.get(car["index"], float(rank))
+            self.slots[car["index"]] = slot + (rank - slot) * step
+        self.update()
+
+    def label(self, i):
+        driver_id = self.data.drivers[i]
+        return self.labels.get(driver_id, (driver_id[:3].upper(), DEFAULT_COLOR))
+
+    def paintEvent(self, event):
+        painter = QPainter(self)
+        painter.setRenderHint(QPainter.RenderHint.Antialiasing, quality.shadows_enabled())
+        painter.fillRect(self.rect(), QColor("#121212"))
+        count = len(self.frame)
+        if not count:
+            painter.setPen(QColor("#FFFFFF"))
+            painter.drawText(self.rect(), Qt.AlignmentFlag.AlignCenter, "No lap timing for this race")
+            return
+
+        # ---- Timing tower ----
+        tower_width = min(320, self.width() // 2)
+        header = 30
+        row_height = max(12.0, min(28.0, (self.height() - header - 10) / count))
+        painter.setFont(self.bold)
+        painter.setPen(QColor("#FFD700"))
+        lap = min(int(self.frame[0]["distance"]) + 1, self.data.laps)
+        painter.drawText(QRectF(10, 0, tower_width, header), Qt.AlignmentFlag.AlignVCenter,
+                         f"Lap {lap}/{self.data.laps}    {format_clock(self.time)}")
+
+        for car in self.frame:
+            i = car["index"]
+            y = header + self.slots[i] * row_height
+            code, color = self.label(i)
+            dimmed = car["state"] == "out"
+            rank = round(self.slots[i]) + 1
+            painter.fillRect(QRectF(10, y + 2, 5, row_height - 4), QColor(color))
+            painter.setPen(QColor("#666666" if dimmed else "#FFFFFF"))
+            painter.setFont(self.bold)
+            painter.drawText(QRectF(22, y, 30, row_height), Qt.AlignmentFlag.AlignVCenter, str(rank))
+            painter.drawText(QRectF(52, y, 60, row_height), Qt.AlignmentFlag.AlignVCenter, code)
+            painter.setFont(self.font)
+            painter.drawText(QRectF(112, y, tower_width - 160, row_height),
+                             Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignRight, car["gap"])
+            if car["gained"] and not dimmed:
+                painter.setPen(QColor("#4CAF50" if car["gained"] > 0 else "#F44336"))
+                arrow = "▲" if car["gained"] > 0 else "▼"
+                painter.drawText(QRectF(tower_width - 44, y, 40, row_height),
+                                 Qt.AlignmentFlag.AlignVCenter | Qt.AlignmentFlag.AlignRight,
+                                 f"{arrow}{abs(car['gained'])}")
+
+        # ---- Lap ring ----
+        area = QRectF(tower_width + 20, 20, self.width() - tower_width - 40, self.height() - 40)
+        radius = min(area.width(), area.height()) / 2 - 20
+        if radius < 20:
+            return
+        centre = area.center()
+        painter.setPen(QPen(QColor("#2A2F38"), 10))
+        painter.drawEllipse(centre, radius, radius)
+        start = QPointF(centre.x(), centre.y() - radius)
+        painter.setPen(QPen(QColor("#FFFFFF"), 2))
+        painter.drawLine(start + QPointF(0, -8), start + QPointF(0, 8))
+
+        painter.setFont(self.font)
+        for car in reversed(self.frame):      # leader painted last, on top
+            if car["state"] != "running":
+                continue
+            angle = 2 * math.pi * (car["distance"] % 1)
+            point = QPointF(centre.x() + radius * math.sin(angle), centre.y() - radius * math.cos(angle))
+            code, color = self.label(car["index"])
+            painter.setPen(Qt.PenStyle.NoPen)
+            painter.setBrush(QColor(color))
+            painter.drawEllipse(point, 7, 7)
+            painter.setPen(QColor("#FFFFFF"))
+            painter.drawText(point + QPointF(10, 4), code)
+
+
+class RaceReplayView(QWidget):
+    """Replay canvas with play / pause, a scrub slider and a speed selector."""
+    def __init__(self, season, round_no, labels, on_back=None, parent=None):
+        super().__init__(parent)
+        self.labels = labels
+        self.canvas = None
+        self.time = 0
+        self.speed = settings.REPLAY_DEFAULT_SPEED
+        self.clock = QElapsedTimer()
+        self.timer = QTimer(self)
+        self.timer.setTimerType(Qt.TimerType.PreciseTimer)
+        self.timer.timeout.connect(self.on_frame)
+
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(0, 0, 0, 0)
+        self.status = QLabel("Loading lap data…")
+        self.status.setStyleSheet("color: #FFFFFF; font-size: 14px;")
+        self.status.setAlignment(Qt.AlignmentFlag.AlignCenter)
+        layout.addWidget(self.status, 1)
+
+        controls = QHBoxLayout()
+        back_btn = QPushButton("← Back")
+        back_btn.setStyleSheet(BUTTON_STYLE)
+        if on_back:
+            back_btn.clicked.connect(on_back)
+        self.play_btn = QPushButton("▶")
+        self.play_btn.setStyleSheet(BUTTON_STYLE)
+        self.play_btn.setFixedWidth(48)
+        self.play_btn.setEnabled(False)
+        self.play_btn.clicked.connect(self.toggle_play)
+        self.slider = QSlider(Qt.Orientation.Horizontal)
+        self.slider.setEnabled(False)
+        self.slider.valueChanged.connect(self.on_scrub)
+        self.speed_box = QComboBox()
+        self.speed_box.setStyleSheet("color: #FFFFFF;")
+        for speed in settings.REPLAY_SPEEDS:
+            self.speed_box.addItem(f"{speed}x", speed)
+        self.speed_box.setCurrentIndex(self.speed_box.findData(self.speed))
+        self.speed_box.currentIndexChanged.connect(
+            lambda index: setattr(self, "speed", self.speed_box.itemData(index)))
+        for widget in (back_btn, self.play_btn):
+            controls.addWidget(widget)
+        controls.addWidget(self.slider, 1)
+        controls.addWidget(self.speed_box)
+        layout.addLayout(controls)
+
+        self.task = submit(build_replay, self.on_loaded, self.on_failed, season, round_no,
+                           key=REPLAY_TASK_KEY)
+        self.destroyed.connect(self.task.cancel)
+
+    def stop(self):
+        """Cancel a pending load and the animation; call before discarding the view."""
+        self.task.cancel()
+        self.timer.stop()
+
+    def on_loaded(self, data):
+        if sip.isdeleted(self):
+            return
+        if not data.duration:
+            self.status.setText("No lap timing for this race")
+            return
+        self.canvas = ReplayCanvas(data, self.labels)
+        layout = self.layout()
+        layout.replaceWidget(self.status, self.canvas)
+        self.status.deleteLater()
+        layout.setStretchFactor(self.canvas, 1)
+        self.slider.setRange(0, data.duration)
+        self.slider.setSingleStep(1000)
+        self.slider.setPageStep(60_000)
+        self.slider.setEnabled(True)
+        self.play_btn.setEnabled(True)
+        self.toggle_play()
+
+    def on_failed(self, error_msg):
+        if sip.isdeleted(self):
+            return
+        self.status.setText(f"Could not load lap data: {error_msg}")
+
+    def toggle_play(self):
+        if self.timer.isActive():
+            self.timer.stop()
+            self.play_btn.setText("▶")
+            return
+        if self.time >= self.canvas.data.duration:
+            self.seek(0)
+        interval = settings.REPLAY_FRAME_MS if quality.animations_enabled() else settings.FRAME_BUDGET_MS
+        self.clock.start()
+        self.timer.start(interval)
+        self.play_btn.setText("⏸")
+
+    def on_frame(self):
+        elapsed = self.clock.restart()
+        self.time = min(self.time + elapsed * self.speed, self.canvas.data.duration)
+        self.slider.blockSignals(True)
+        self.slider.setValue(int(self.time))
+        self.slider.blockSignals(False)
+        self.canvas.set_time(self.time, elapsed, snap=not quality.animations_enabled())
+        if self.time >= self.canvas.data.duration:
+            self.toggle_play()
+
+    def on_scrub(self, value):
+        self.seek(value)
+
+    def seek(self, t):
+        self.time = t
+        if self.canvas:
+            self.canvas.set_time(t)
+
+    def hideEvent(self, event):
+        if self.timer.isActive():
+            self.toggle_play()
+        super().hideEvent(event)
@@ -1,16 +1,78 @@
 import sys
 from PyQt6.QtWidgets import (
     QApplication, QWidget, QLabel, QVBoxLayout, QHBoxLayout,
-    QScrollArea, QFrame, QSizePolicy, QGraphicsDropShadowEffect
+    QScrollArea, QFrame, QSizePolicy, QGraphicsDropShadowEffect, QPushButton
 )
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QPixmap, QColor, QFont
 from config.settings import DRIVER_IMAGES_DIR, CURCUITS_IMAGES_DIR
 from config.colors import TEAM_COLORS
-from services.worker import Worker
+from services.worker import submit, NORMAL, LOW
 from utils.api_helper import on_failed as show_api_error
 from services.results import get_last_race_results
 from ui.skeleton import RaceResultsSkeleton
+from ui.replay import RaceReplayView, BUTTON_STYLE
+from ui import quality
+from ui.incremental import apply_row_diff
+from services.diff import diff_rows
+
+
+RESULT_FIELDS = ["position", "points", "status", "Time"]
+
+
+def result_key(result):
+    return result["Driver"]["driverId"]
+
+
+class ResultRow(QFrame):
+    """One classified driver in the results list."""
+    def __init__(self, driver: dict):
+        super().__init__()
+        self.setStyleSheet(
+            f"background-color: #1E1E1E; border-radius: 12px; padding: 12px;"
+        )
+        self.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
+
+        driver_layout = QHBoxLayout(self)
+        driver_layout.setContentsMargins(10, 0, 10, 0)
+
+        color_strip = QFrame()
+        color_strip.setFixedWidth(6)
+        team_color = TEAM_COLORS.get(driver['Constructor']['name'], "#2A2F38")
+        color_strip.setStyleSheet(f"background-color: {team_color}; border-radius: 3px;")
+        driver_layout.addWidget(color_strip)
+
+        self.driver_name = QLabel()
+        self.driver_name.setFont(QFont("Segoe UI", 12))
+        self.driver_name.setStyleSheet("color: #FFFFFF; background: transparent;")
+
+        self.points = QLabel()
+        self.points.setFont(QFont("Segoe UI", 12))
+        self.points.setStyleSheet("color: #FFFFFF; background: transparent;")
+
+        self.time = QLabel()
+        self.time.setFont(QFont("Segoe UI", 12))
+        self.time.setStyleSheet("color: #FFFFFF; background: transparent;")
+
+        driver_layout.addWidget(self.driver_name)
+        driver_layout.addStretch()
+        driver_layout.addWidget(self.points)
+        driver_layout.addWidget(self.time)
+
+        shadow = QGraphicsDropShadowEffect()
+        shadow.setBlurRadius(15)
+        shadow.setXOffset(0)
+        shadow.setYOffset(3)
+        shadow.setColor(QColor(0, 0, 0, 180))
+        self.setGraphicsEffect(shadow)
+
+        self.update_data(driver)
+
+    def update_data(self, driver: dict):
+        self.driver_name.setText(f"{driver['position']}. {driver['Driver']['givenName']} {driver['Driver']['familyName']}")
+        self.points.setText(f"Points: {driver['points']}")
+        time_text = driver.get("Time", {}).get("time", driver.get("status", "—"))
+        self.time.setText(f"Time: {time_text}")
 
 
 class LatestRaceWindow(QWidget):
@@ -21,6 +83,8 @@ class LatestRaceWindow(QWidget):
         self.setAttribute(Qt.WidgetAttribute.WA_TranslucentBackground)  
         self.setStyleSheet("background: transparent;") 
         self.race_data = {}
+        self.result_rows = {}
+        self.replay_view = None
         self.initUI()
         self.load_race_results()
 
@@ -32,15 +96,14 @@ class LatestRaceWindow(QWidget):
         self.show_skeletons()
 
     def show_skeletons(self):
+        self.drop_replay()
         self.clear_layout(self.main_layout)
         for _ in range(3):
             self.main_layout.addWidget(RaceResultsSkeleton())
 
-    def load_race_results(self):
-        self.worker = Worker(get_last_race_results)
-        self.worker.finished.connect(self.on_data_loaded)
-        self.worker.failed.connect(self.on_failed)
-        self.worker.start()
+    def load_race_results(self, priority=NORMAL):
+        self.task = submit(get_last_race_results, self.on_data_loaded, self.on_failed,
+                           key=f"results-{id(self)}", priority=priority)
 
     def clear_layout(self, layout):
         while layout.count():
@@ -49,18 +112,45 @@ class LatestRaceWindow(QWidget):
             if widget:
                 widget.deleteLater()
 
+    def refresh(self):
+        """Re-fetch the last race; an unchanged race only patches its rows."""
+        self.load_race_results(priority=LOW)
+
     def on_data_loaded(self, race_data):
+        if not race_data:
+            return
+        previous = self.race_data
         self.race_data = race_data
-        self.render_race_results()
+        if self.replay_view:
+            return      # rendered when the replay is closed
+        same_race = (
+            self.result_rows and previous
+            and (previous["raceName"], previous["date"]) == (race_data["raceName"], race_data["date"])
+        )
+        if not same_race:
+            self.render_race_results()
+            return
+
+        diff = diff_rows(previous.get("Results", []), race_data.get("Results", []),
+                         result_key, RESULT_FIELDS)
+        apply_row_diff(self.results_layout, self.result_rows, race_data.get("Results", []),
+                       diff, result_key, ResultRow)
+        quality.apply_effects(self)
 
     def on_failed(self, error_msg):
+        if self.result_rows or self.replay_view:
+            # keep the last good results (or the open replay) on screen when a refresh fails
+            print(f"❌ Failed to refresh race results: {error_msg}")
+            return
         show_api_error(self, self.retry_load)
 
     def retry_load(self):
+        self.result_rows = {}
         self.show_skeletons()
         self.load_race_results()
 
     def render_race_results(self):
+        self.drop_replay()
         self.clear_layout(self.main_layout)
         race = self.race_data
         results = race.get("Results", [])
@@ -81,6 +171,12 @@ class LatestRaceWindow(QWidget):
         header.setStyleSheet("color: #FFD700;")
         header.setAlignment(Qt.AlignmentFlag.AlignCenter)
         race_card_layout.addWidget(header)
+        if race.get("season") and race.get("round"):
+            replay_btn = QPushButton("▶ Race Replay")
+            replay_btn.setCursor(Qt.CursorShape.PointingHandCursor)
+            replay_btn.setStyleSheet(BUTTON_STYLE)
+            replay_btn.clicked.connect(self.show_replay)
+            race_card_layout.addWidget(replay_btn, alignment=Qt.AlignmentFlag.AlignCenter)
         race_card.setLayout(race_card_layout)
 
         shadow = QGraphicsDropShadowEffect()
@@ -103,48 +199,12 @@ class LatestRaceWindow(QWidget):
         container_layout.setContentsMargins(20, 20, 20, 20)
 
         # ---- All Drivers (including Top 3) ---- 
+        self.result_rows = {}
         for driver in results:
-            driver_widget = QFrame()
-            driver_widget.setStyleSheet(
-                f"background-color: #1E1E1E; border-radius: 12px; padding: 12px;"
-            )
-            driver_widget.setSizePolicy(QSizePolicy.Policy.Expanding, QSizePolicy.Policy.Fixed)
-
-            driver_layout = QHBoxLayout(driver_widget)
-            driver_layout.setContentsMargins(10, 0, 10, 0)
-
-            color_strip = QFrame()
-            color_strip.setFixedWidth(6)
-            team_color = TEAM_COLORS.get(driver['Constructor']['name'], "#2A2F38")
-            color_strip.setStyleSheet(f"background-color: {team_color}; border-radius: 3px;")
-            driver_layout.addWidget(color_strip)
-
-            driver_name = QLabel(f"{driver['position']}. {driver['Driver']['givenName']} {driver['Driver']['familyName']}")
-            driver_name.setFont(QFont("Segoe UI", 12))
-            driver_name.setStyleSheet("color: #FFFFFF; background: transparent;")
-
-            points = QLabel(f"Points: {driver['points']}")
-            points.setFont(QFont("Segoe UI", 12))
-            points.setStyleSheet("color: #FFFFFF; background: transparent;")
-
-            time_text = driver.get("Time", {}).get("time", driver.get("status", "—"))
-            time = QLabel(f"Time: {time_text}")
-            time.setFont(QFont("Segoe UI", 12))
-            time.setStyleSheet("color: #FFFFFF; background: transparent;")
-
-            driver_layout.addWidget(driver_name)
-            driver_layout.addStretch()
-            driver_layout.addWidget(points)
-            driver_layout.addWidget(time)
-
-            shadow = QGraphicsDropShadowEffect()
-            shadow.setBlurRadius(15)
-            shadow.setXOffset(0)
-            shadow.setYOffset(3)
-            shadow.setColor(QColor(0, 0, 0, 180))
-            driver_widget.setGraphicsEffect(shadow)
-
-            container_layout.addWidget(driver_widget)
+            row = ResultRow(driver)
+            self.result_rows[result_key(driver)] = row
+            container_layout.addWidget(row)
+        self.results_layout = container_layout
 
         # ----  Circuit Image ---- 
         circuit_img_path = CURCUITS_IMAGES_DIR / f"{self.race_data['circuitId']}.png"
@@ -154,7 +214,7 @@ class LatestRaceWindow(QWidget):
             pixmap = QPixmap(600, 300)
             pixmap.fill(QColor("#2A2F38"))
 
-        pixmap = pixmap.scaled(900, 600, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
+        pixmap = pixmap.scaled(900, 600, Qt.AspectRatioMode.KeepAspectRatio, quality.transform_mode())
         circuit_label = QLabel()
         circuit_label.setPixmap(pixmap)
         circuit_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -172,6 +232,29 @@ class LatestRaceWindow(QWidget):
         scroll_area.setWidget(container)
         self.main_layout.addWidget(scroll_area)
         scroll_area.setStyleSheet("border: none; background: transparent;") 
+        quality.apply_effects(self)
+
+    def show_replay(self):
+        race = self.race_data
+        labels = {
+            result_key(r): (r["Driver"].get("code") or r["Driver"]["familyName"][:3].upper(),
+                            TEAM_COLORS.get(r["Constructor"]["name"], "#2A2F38"))
+            for r in race.get("Results", [])
+        }
+        self.result_rows = {}
+        self.drop_replay()
+        self.clear_layout(self.main_layout)
+        self.replay_view = RaceReplayView(race["season"], race["round"], labels, on_back=self.close_replay)
+        self.main_layout.addWidget(self.replay_view)
+
+    def drop_replay(self):
+        """Stop and forget the replay before the layout holding it is torn down."""
+        if self.replay_view:
+            self.replay_view.stop()
+            self.replay_view = None
+
+    def close_replay(self):
+        self.render_race_results()
 
 
 if __name__ == "__main__":
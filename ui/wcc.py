@@ -7,12 +7,17 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, QPropertyAnimation, QEasingCurve
 from PyQt6.QtGui import QPixmap, QColor
 from services.c_standings import get_constructors_standings
-from services.worker import Worker
+from services.worker import submit, NORMAL, LOW
 from ui.skeleton import WDCSkeleton
+from ui import quality
+from ui.incremental import apply_row_diff
+from services.diff import diff_rows, has_changes
 from utils.api_helper import on_failed as show_api_error
 from config.settings import CONSTRUCTOR_IMAGES_DIR
 from config import colors
 
+TEAM_FIELDS = ["position", "positionText", "points", "wins", "constructorName"]
+
 PODIUM_COLORS = ["#FFFFFFF5", "#FFFFFFF5", "#FFFFFFF5"] 
 
 class PodiumTeams(QWidget):
@@ -42,7 +47,7 @@ class PodiumTeams(QWidget):
         else:
             pixmap = pixmap.scaled(self.size[0], self.size[1], 
                        Qt.AspectRatioMode.KeepAspectRatio,
-                       Qt.TransformationMode.SmoothTransformation)
+                       quality.transform_mode())
 
         TeamLabel = QLabel()
         TeamLabel.setPixmap(pixmap)
@@ -105,11 +110,52 @@ class PodiumTeams(QWidget):
             self.setStyleSheet("background-color: #1E1E1E; border-radius: 12px;")
             
             
+class TeamRow(QFrame):
+    """Standings row below the podium."""
+    def __init__(self, team: dict):
+        super().__init__()
+        self.setStyleSheet("background-color: #1E1E1E; border-radius: 12px;")
+        card_layout = QHBoxLayout()
+        card_layout.setContentsMargins(15,10,15,10)
+        card_layout.setSpacing(20)
+
+        self.pos_label = QLabel()
+        self.pos_label.setStyleSheet("color: #FFD700; font-weight: bold; min-width: 30px;")
+        self.name_label = QLabel()
+        self.name_label.setStyleSheet("color: #EAEAEA; font-weight: bold;")
+        self.points_label = QLabel()
+        self.points_label.setStyleSheet("color: #CCCCCC;")
+        self.win_label = QLabel()
+        self.win_label.setStyleSheet("color: #AAAAAA;")
+
+        for lbl in [self.pos_label, self.name_label, self.points_label, self.win_label]:
+            card_layout.addWidget(lbl)
+
+        self.setLayout(card_layout)
+
+        shadow = QGraphicsDropShadowEffect(self)
+        shadow.setBlurRadius(15)
+        shadow.setXOffset(0)
+        shadow.setYOffset(3)
+        shadow.setColor(QColor(0,0,0,140))
+        self.setGraphicsEffect(shadow)
+
+        self.update_data(team)
+
+    def update_data(self, d: dict):
+        self.pos_label.setText(d["positionText"])
+        self.name_label.setText(f" {d['constructorName']}")
+        self.points_label.setText(f"{d['points']} pts")
+        self.win_label.setText(f"{d['wins']} wins")
+
+
 class WccWindow(QWidget):
     
     def __init__(self):
         
         super().__init__()
+        self.teams = []
+        self.rows = {}
         self.setWindowTitle("World Constructors' Championship")
         self.setStyleSheet("""
             QWidget { background-color: transparent;; font-family: 'Segoe UI', Arial, sans-serif; }
@@ -143,11 +189,13 @@ class WccWindow(QWidget):
         self.podium_container.addWidget(self.skeleton)
         self.load_Teams()
         
-    def load_Teams(self):
-        self.worker = Worker(get_constructors_standings)
-        self.worker.finished.connect(self.on_Teams_loaded)
-        self.worker.failed.connect(self.on_failed)
-        self.worker.start()
+    def load_Teams(self, priority=NORMAL):
+        self.task = submit(get_constructors_standings, self.on_Teams_loaded, self.on_failed,
+                           key=f"wcc-{id(self)}", priority=priority)
+
+    def refresh(self):
+        """Re-fetch standings; only rows that changed are touched."""
+        self.load_Teams(priority=LOW)
 
     def clear_layout(self, layout):
         while layout.count():
@@ -155,70 +203,55 @@ class WccWindow(QWidget):
             widget = item.widget()
             if widget:
                 widget.deleteLater()
+            elif item.layout():
+                self.clear_layout(item.layout())
     
     def on_Teams_loaded(self, drivers):
         
-        # --- Clear podium skeleton
-        self.clear_layout(self.podium_container)
+        podium_diff = diff_rows(self.teams[:3], drivers[:3], "constructorId", TEAM_FIELDS)
+        if not self.teams or has_changes(podium_diff):
+            # --- Clear podium (or skeleton)
+            self.clear_layout(self.podium_container)
 
-        # --- Podium
-        podium_hbox = QHBoxLayout()
-        podium_hbox.setSpacing(30)
-        podium_hbox.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        podium_heights = [50, 0, 50]  
-        podium_order = [drivers[1], drivers[0], drivers[2]]  # 2nd, 1st, 3rd
-        podium_sizes = [(200,200), (240,240), (200,200)]
-
-        for i, driver in enumerate(podium_order):
-            vbox = QVBoxLayout()
-            vbox.addSpacing(podium_heights[i])
-            card = PodiumTeams(driver, size=podium_sizes[i])
-            vbox.addWidget(card)
-            vbox.addStretch()
-            podium_hbox.addLayout(vbox)
-
-        self.podium_container.addLayout(podium_hbox)
-        self.podium_container.addSpacing(20)
-
-        # --- Remaining drivers list
-        self.clear_layout(self.list_vbox)
-        for d in drivers[3:]:
-            card = QFrame()
-            card.setStyleSheet("background-color: #1E1E1E; border-radius: 12px;")
-            card_layout = QHBoxLayout()
-            card_layout.setContentsMargins(15,10,15,10)
-            card_layout.setSpacing(20)
-
-            pos_label = QLabel(d["positionText"])
-            pos_label.setStyleSheet("color: #FFD700; font-weight: bold; min-width: 30px;")
-            name_label = QLabel(f" {d['constructorName']}")
-            name_label.setStyleSheet("color: #EAEAEA; font-weight: bold;")
-            points_label = QLabel(f"{d['points']} pts")
-            points_label.setStyleSheet("color: #CCCCCC;")
-            win_label = QLabel(f"{d['wins']} wins")
-            win_label.setStyleSheet("color: #AAAAAA;")
-
-            for lbl in [pos_label, name_label, points_label, win_label]:
-                card_layout.addWidget(lbl)
-
-            card.setLayout(card_layout)
-
-            shadow = QGraphicsDropShadowEffect(card)
-            shadow.setBlurRadius(15)
-            shadow.setXOffset(0)
-            shadow.setYOffset(3)
-            shadow.setColor(QColor(0,0,0,140))
-            card.setGraphicsEffect(shadow)
-
-            self.list_vbox.addWidget(card)
+            # --- Podium
+            podium_hbox = QHBoxLayout()
+            podium_hbox.setSpacing(30)
+            podium_hbox.setAlignment(Qt.AlignmentFlag.AlignCenter)
+            podium_heights = [50, 0, 50]  
+            podium_order = [drivers[1], drivers[0], drivers[2]]  # 2nd, 1st, 3rd
+            podium_sizes = [(200,200), (240,240), (200,200)]
+
+            for i, driver in enumerate(podium_order):
+                vbox = QVBoxLayout()
+                vbox.addSpacing(podium_heights[i])
+                card = PodiumTeams(driver, size=podium_sizes[i])
+                vbox.addWidget(card)
+                vbox.addStretch()
+                podium_hbox.addLayout(vbox)
+
+            self.podium_container.addLayout(podium_hbox)
+            self.podium_container.addSpacing(20)
+
+        # --- Remaining teams list
+        list_diff = diff_rows(self.teams[3:], drivers[3:], "constructorId", TEAM_FIELDS)
+        apply_row_diff(self.list_vbox, self.rows, drivers[3:], list_diff,
+                       "constructorId", TeamRow)
+
+        self.teams = drivers
+        quality.apply_effects(self)
 
     def on_failed(self, error_msg):
+        if self.teams:
+            # keep the last good standings on screen when a refresh fails
+            print(f"❌ Failed to refresh constructor standings: {error_msg}")
+            return
         show_api_error(self.podium_container, self.retry_load, message=f"Error: {error_msg}")
 
         
     def retry_load(self):
         self.clear_layout(self.podium_container)
         self.clear_layout(self.list_vbox)
+        self.rows = {}
         self.skeleton = WDCSkeleton()
         self.podium_container.addWidget(self.skeleton)
         self.load_Teams()
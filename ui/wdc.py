@@ -6,12 +6,17 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt
 from PyQt6.QtGui import QPixmap, QColor, QFont
 from services.d_standings import get_driver_standings
-from services.worker import Worker
+from services.worker import submit, NORMAL, LOW
 from ui.skeleton import WDCSkeleton
+from ui import quality
+from ui.incremental import apply_row_diff
+from services.diff import diff_rows, has_changes
 from utils.api_helper import on_failed as show_api_error
 from config.settings import DRIVER_IMAGES_DIR
 
 
+STANDING_FIELDS = ["position", "positionText", "points", "wins", "driverName", "constructorName"]
+
 PODIUM_COLORS = {
     1: "#C9A34E",  
     2: "#B5B5B5", 
@@ -61,7 +66,7 @@ class PodiumDriverCard(QWidget):
             crop_height = pixmap.height() // 2
             pixmap = pixmap.copy(0, 0, pixmap.width(), crop_height)
 
-        pixmap = pixmap.scaledToWidth(110, Qt.TransformationMode.SmoothTransformation)
+        pixmap = pixmap.scaledToWidth(110, quality.transform_mode())
 
         img_label.setPixmap(pixmap)
         img_label.setAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -111,9 +116,57 @@ class PodiumDriverCard(QWidget):
         self.setGraphicsEffect(shadow)
 
 
+class StandingRow(QFrame):
+    """Leaderboard row below the podium."""
+    def __init__(self, driver: dict):
+        super().__init__()
+        self.setStyleSheet("""
+            background-color: #141414;
+            border-radius: 12px;
+        """)
+        hbox = QHBoxLayout(self)
+        hbox.setContentsMargins(15, 10, 15, 10)
+        hbox.setSpacing(20)
+
+        self.pos_label = QLabel()
+        self.pos_label.setStyleSheet("color: #F44336; font-weight: bold; font-size: 16px;")
+
+        self.name = QLabel()
+        self.name.setStyleSheet("color: white; font-weight: bold;")
+
+        self.team = QLabel()
+        self.team.setStyleSheet("color: #BBBBBB;")
+
+        self.points = QLabel()
+        self.points.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
+        self.points.setStyleSheet("color: #EAEAEA; font-weight: bold;")
+
+        hbox.addWidget(self.pos_label)
+        hbox.addWidget(self.name)
+        hbox.addWidget(self.team)
+        hbox.addStretch()
+        hbox.addWidget(self.points)
+
+        shadow = QGraphicsDropShadowEffect(self)
+        shadow.setBlurRadius(25)
+        shadow.setColor(QColor(0, 0, 0, 160))
+        shadow.setYOffset(4)
+        self.setGraphicsEffect(shadow)
+
+        self.update_data(driver)
+
+    def update_data(self, d: dict):
+        self.pos_label.setText(d["positionText"])
+        self.name.setText(d["driverName"])
+        self.team.setText(d.get("constructorName", ""))
+        self.points.setText(f"{d['points']} PTS")
+
+
 class WdcWindow(QWidget):
     def __init__(self):
         super().__init__()
+        self.drivers = []
+        self.rows = {}
         self.setWindowTitle("F1 Race Results")
         self.setStyleSheet("""
             QWidget {
@@ -150,76 +203,53 @@ class WdcWindow(QWidget):
         self.setLayout(layout)
         self.load_drivers()
 
-    def load_drivers(self):
-        self.worker = Worker(get_driver_standings)
-        self.worker.finished.connect(self.on_data_loaded)
-        self.worker.failed.connect(self.on_failed)
-        self.worker.start()
+    def load_drivers(self, priority=NORMAL):
+        self.task = submit(get_driver_standings, self.on_data_loaded, self.on_failed,
+                           key=f"wdc-{id(self)}", priority=priority)
 
-    def on_data_loaded(self, drivers):
-        if not drivers:
-            return
-
-        for i in reversed(range(self.podium_container.count())):
-            item = self.podium_container.takeAt(i)
-            if item.widget():
-                item.widget().deleteLater()
+    def refresh(self):
+        """Re-fetch standings; only rows that changed are touched."""
+        self.load_drivers(priority=LOW)
 
-        # Podium layout
-        podium_order = [drivers[1], drivers[0], drivers[2]]
-        offsets = [40, 0, 40]
-        for i, d in enumerate(podium_order):
-            card = PodiumDriverCard(d, position=int(d["position"]))
-            vbox = QVBoxLayout()
-            vbox.setAlignment(Qt.AlignmentFlag.AlignHCenter)
-            vbox.addSpacing(offsets[i])
-            vbox.addWidget(card)
-            self.podium_container.addLayout(vbox)
-
-        
-        for i in reversed(range(self.list_layout.count())):
-            item = self.list_layout.takeAt(i)
+    def clear_layout(self, layout):
+        while layout.count():
+            item = layout.takeAt(0)
             if item.widget():
                 item.widget().deleteLater()
+            elif item.layout():
+                self.clear_layout(item.layout())
 
-        for d in drivers[3:]:
-            card = QFrame()
-            card.setStyleSheet("""
-                background-color: #141414;
-                border-radius: 12px;
-            """)
-            hbox = QHBoxLayout(card)
-            hbox.setContentsMargins(15, 10, 15, 10)
-            hbox.setSpacing(20)
-
-            pos = QLabel(d["positionText"])
-            pos.setStyleSheet("color: #F44336; font-weight: bold; font-size: 16px;")
-
-            name = QLabel(d["driverName"])
-            name.setStyleSheet("color: white; font-weight: bold;")
-
-            team = QLabel(d.get("constructorName", ""))
-            team.setStyleSheet("color: #BBBBBB;")
+    def on_data_loaded(self, drivers):
+        if not drivers:
+            return
 
-            points = QLabel(f"{d['points']} PTS")
-            points.setAlignment(Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-            points.setStyleSheet("color: #EAEAEA; font-weight: bold;")
+        podium_diff = diff_rows(self.drivers[:3], drivers[:3], "driverId", STANDING_FIELDS)
+        if not self.drivers or has_changes(podium_diff):
+            self.clear_layout(self.podium_container)
 
-            hbox.addWidget(pos)
-            hbox.addWidget(name)
-            hbox.addWidget(team)
-            hbox.addStretch()
-            hbox.addWidget(points)
+            # Podium layout
+            podium_order = [drivers[1], drivers[0], drivers[2]]
+            offsets = [40, 0, 40]
+            for i, d in enumerate(podium_order):
+                card = PodiumDriverCard(d, position=int(d["position"]))
+                vbox = QVBoxLayout()
+                vbox.setAlignment(Qt.AlignmentFlag.AlignHCenter)
+                vbox.addSpacing(offsets[i])
+                vbox.addWidget(card)
+                self.podium_container.addLayout(vbox)
 
-            shadow = QGraphicsDropShadowEffect(card)
-            shadow.setBlurRadius(25)
-            shadow.setColor(QColor(0, 0, 0, 160))
-            shadow.setYOffset(4)
-            card.setGraphicsEffect(shadow)
+        list_diff = diff_rows(self.drivers[3:], drivers[3:], "driverId", STANDING_FIELDS)
+        apply_row_diff(self.list_layout, self.rows, drivers[3:], list_diff,
+                       "driverId", StandingRow)
 
-            self.list_layout.addWidget(card)
+        self.drivers = drivers
+        quality.apply_effects(self)
 
     def on_failed(self, error_msg):
+        if self.drivers:
+            # keep the last good standings on screen when a refresh fails
+            print(f"❌ Failed to refresh driver standings: {error_msg}")
+            return
         show_api_error(self, self.load_drivers)
 
 
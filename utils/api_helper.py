@@ -1,17 +1,378 @@
+import asyncio
+import json
+import logging
+import math
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ThreadPoolExecutor, wait
+from urllib.parse import urlencode
 import requests
+from utils import async_http, compression, http_cache
+from utils.circuit_breaker import CircuitOpenError, get_breaker, is_upstream_failure
+from utils.json_stream import ItemStream
+from utils.mirrors import MirrorPool
+from config import settings
 from PyQt6.QtWidgets import QWidget, QLabel, QPushButton, QVBoxLayout
-from PyQt6.QtCore import Qt
+from PyQt6.QtCore import Qt, QTimer
 
-BASE_URL = "https://api.jolpi.ca/ergast/f1"
+logger = logging.getLogger(__name__)
 
-def fetch_api(endpoint: str):
+mirrors = MirrorPool(settings.API_MIRRORS)
+
+STREAM_CHUNK_SIZE = 64 * 1024
+
+# One pooled session (keep-alive) advertising every encoding urllib3 decodes
+session = requests.Session()
+session.headers["Accept-Encoding"] = compression.SESSION_ACCEPT_ENCODING
+
+
+def request_path(endpoint: str, params=None):
+    """Mirror-independent part of an Ergast URL; the .json suffix goes before any query string."""
+    path, sep, query = endpoint.partition("?")
+    if params:
+        query = "&".join(filter(None, [query, urlencode(params)]))
+        sep = "?"
+    return f"{path}.json{sep}{query}"
+
+
+def build_url(endpoint: str, params=None, base=None):
+    return f"{base or mirrors.primary}/{request_path(endpoint, params)}"
+
+
+class RateLimiter:
+    """Token bucket shared by every request to the API (thread-safe)."""
+    def __init__(self, rate, burst):
+        self.rate = rate
+        self.burst = burst
+        self.tokens = burst
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+
+    def reserve(self):
+        """Take a token; returns how long the caller must wait before using it."""
+        with self.lock:
+            now = time.monotonic()
+            self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return 0 if self.tokens >= 0 else -self.tokens / self.rate
+
+    def wait(self):
+        delay = self.reserve()
+        if delay:
+            time.sleep(delay)
+
+    async def wait_async(self):
+        delay = self.reserve()
+        if delay:
+            await asyncio.sleep(delay)
+
+
+rate_limiter = RateLimiter(settings.API_RATE_LIMIT, settings.API_BURST)
+
+
+def _request(base, path, headers=None):
+    url = f"{base}/{path}"
+    breaker = get_breaker(url)
+    breaker.before_request()
+    rate_limiter.wait()
+    started = time.monotonic()
     try:
-        url = f"{BASE_URL}/{endpoint}.json"
-        resp = requests.get(url, timeout=10)
+        resp = session.get(url, headers=headers, timeout=settings.API_TIMEOUT)
         resp.raise_for_status()
-        return resp.json()
     except Exception as e:
-        raise Exception(f"Error fetching {endpoint}: {e}")
+        _record_outcome(base, breaker, e, started)
+        raise
+    mirrors.record(base, time.monotonic() - started)
+    breaker.record_success()
+    return resp.status_code, resp.headers, (resp.json() if resp.status_code != 304 else None)
+
+
+async def _request_async(base, path, headers=None):
+    url = f"{base}/{path}"
+    breaker = get_breaker(url)
+    breaker.before_request()
+    await rate_limiter.wait_async()
+    started = time.monotonic()
+    try:
+        status, response_headers, body = await async_http.get(url, headers=headers,
+                                                               timeout=settings.API_TIMEOUT)
+    except Exception as e:
+        _record_outcome(base, breaker, e, started)
+        raise
+    mirrors.record(base, time.monotonic() - started)
+    breaker.record_success()
+    return status, response_headers, (json.loads(body) if status != 304 else None)
+
+
+_hedge_pool = ThreadPoolExecutor(max_workers=settings.API_CONCURRENCY * len(settings.API_MIRRORS),
+                                 thread_name_prefix="api-hedge")
+
+
+def _get(endpoint, params=None, headers=None):
+    """
+    GET from the best mirror. If it has not answered within its p95 latency
+    (or fails), the next mirror is asked too; the first success wins and the
+    slower requests are cancelled, or abandoned if already in flight.
+    """
+    path = request_path(endpoint, params)
+    candidates = mirrors.ordered()
+    if len(candidates) == 1:
+        return _request(candidates[0], path, headers)
+    in_flight = []
+    error = None
+    try:
+        while candidates or in_flight:
+            if candidates:
+                base = candidates.pop(0)
+                in_flight.append(_hedge_pool.submit(_request, base, path, headers))
+            timeout = mirrors.hedge_delay(base) if candidates else None
+            done, _ = wait(in_flight, timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                in_flight.remove(future)
+                try:
+                    return future.result()
+                except Exception as e:
+                    error = e
+        raise error
+    finally:
+        for future in in_flight:
+            future.cancel()
+
+
+async def _get_async(endpoint, params=None, headers=None):
+    """Coroutine variant of _get; losing requests are cancelled outright."""
+    path = request_path(endpoint, params)
+    candidates = mirrors.ordered()
+    in_flight = set()
+    error = None
+    try:
+        while candidates or in_flight:
+            if candidates:
+                base = candidates.pop(0)
+                in_flight.add(asyncio.ensure_future(_request_async(base, path, headers)))
+            timeout = mirrors.hedge_delay(base) if candidates else None
+            done, _ = await asyncio.wait(in_flight, timeout=timeout, return_when=asyncio.FIRST_COMPLETED)
+            for task in done:
+                in_flight.discard(task)
+                try:
+                    return task.result()
+                except Exception as e:
+                    error = e
+        raise error
+    finally:
+        for task in in_flight:
+            task.cancel()
+
+
+def _record_outcome(base, breaker, error, started):
+    """Count a failed request against its mirror only if the host is unhealthy."""
+    if is_upstream_failure(error):
+        mirrors.record(base)
+        breaker.record_failure()
+    else:
+        # the host answered (e.g. 404 for an unknown round); the request was bad
+        mirrors.record(base, time.monotonic() - started)
+        breaker.record_success()
+
+
+def _serve_stale(endpoint, entry, error):
+    """Fall back to the cached copy when the API is down, else re-raise."""
+    if entry:
+        logger.warning("Serving cached %s: %s", endpoint, error)
+        http_cache.record(http_cache.STALE)
+        return entry["data"]
+    if isinstance(error, CircuitOpenError):
+        raise error
+    raise Exception(f"Error fetching {endpoint}: {error}") from error
+
+
+def _store(key, params, response):
+    _, headers, data = response
+    http_cache.record(http_cache.FULL)
+    http_cache.get_cache().put(key, data, headers, http_cache.fingerprint(data, params=params))
+    return data
+
+
+# Steps yielded by _fetch_steps
+GET = "get"         # (GET, params, headers): a request to the API
+CALL = "call"       # (CALL, fn, *args): disk work, kept off the GUI thread by fetch_api_async
+
+
+def _fetch_steps(endpoint, params, use_cache):
+    """
+    The revalidation logic behind fetch_api and fetch_api_async, written
+    once. A generator that yields GET / CALL steps and is sent each step's
+    result (or thrown its exception); it returns the response data.
+    """
+    key = request_path(endpoint, params)
+    entry = (yield (CALL, http_cache.lookup, key)) if use_cache else None
+    try:
+        if entry:
+            if http_cache.is_permanent(endpoint, entry):
+                http_cache.record(http_cache.PERMANENT)
+                return entry["data"]
+            if http_cache.validators(entry):
+                status, headers, data = yield (GET, params, http_cache.validators(entry))
+                if status == 304:
+                    http_cache.record(http_cache.NOT_MODIFIED)
+                    return entry["data"]
+                return (yield (CALL, _store, key, params, (status, headers, data)))
+            if (yield (CALL, http_cache.can_probe, endpoint, entry)):
+                _, _, probe = yield (GET, http_cache.probe_params(params, entry), None)
+                if http_cache.fingerprint(probe, from_probe=True) == entry["fingerprint"]:
+                    http_cache.record(http_cache.PROBE_UNCHANGED)
+                    return entry["data"]
+                http_cache.record(http_cache.PROBE_CHANGED)
+        response = yield (GET, params, None)
+        return (yield (CALL, _store, key, params, response))
+    except Exception as e:
+        return _serve_stale(endpoint, entry, e)
+
+
+def fetch_api(endpoint: str, params=None, use_cache=True):
+    """
+    GET an Ergast endpoint. Cached responses are revalidated instead of
+    re-downloaded: past seasons are served as is, entries with an ETag /
+    Last-Modified use a conditional GET, others a limit=1 probe (except
+    around sessions, when results and standings are corrected in place).
+    While the API host's circuit breaker is open (or a request fails) the
+    cached copy is served; without one, CircuitOpenError fails fast.
+    """
+    steps = _fetch_steps(endpoint, params, use_cache)
+    result, error = None, None
+    while True:
+        try:
+            step = steps.throw(error) if error else steps.send(result)
+        except StopIteration as done:
+            return done.value
+        try:
+            kind, *args = step
+            result, error = (_get(endpoint, *args) if kind == GET else args[0](*args[1:])), None
+        except Exception as e:
+            result, error = None, e
+
+
+async def fetch_api_async(endpoint: str, params=None, use_cache=True):
+    """
+    Coroutine variant of fetch_api; many can run concurrently on one thread.
+    Cache reads and writes run on the loop's executor, not the GUI thread.
+    """
+    steps = _fetch_steps(endpoint, params, use_cache)
+    result, error = None, None
+    while True:
+        try:
+            step = steps.throw(error) if error else steps.send(result)
+        except StopIteration as done:
+            return done.value
+        try:
+            kind, *args = step
+            result, error = (await _get_async(endpoint, *args) if kind == GET
+                             else await run_blocking(*args)), None
+        except Exception as e:
+            result, error = None, e
+
+
+async def run_blocking(fn, *args):
+    """Await fn(*args) on the running loop's executor (disk, sqlite, CPU-heavy builds)."""
+    return await asyncio.get_running_loop().run_in_executor(None, fn, *args)
+
+
+def fetch_api_stream(endpoint: str, params=None, table=None, items_key=None, reduce=None):
+    """
+    fetch_api for large pages: the MRData[table][items_key] array is decoded
+    one element at a time while the body downloads, and each element goes
+    through reduce before it is kept. Memory then follows the reduced
+    records, not the payload. Returns the usual MRData layout (limit /
+    offset / total plus the list). Skips the response cache and hedging.
+    """
+    base = mirrors.ordered()[0]
+    url = f"{base}/{request_path(endpoint, params)}"
+    breaker = get_breaker(url)
+    breaker.before_request()
+    rate_limiter.wait()
+    started = time.monotonic()
+    try:
+        with session.get(url, stream=True, timeout=settings.API_TIMEOUT) as resp:
+            resp.raise_for_status()
+            latency = time.monotonic() - started
+            stream = ItemStream(resp.iter_content(STREAM_CHUNK_SIZE), items_key)
+            items = [reduce(item) if reduce else item for item in stream]
+    except Exception as e:
+        _record_outcome(base, breaker, e, started)
+        raise Exception(f"Error fetching {endpoint}: {e}") from e
+    mirrors.record(base, latency)
+    breaker.record_success()
+    mr = {key: str(value) for key, value in stream.header.items()}
+    mr[table] = {items_key: items}
+    return {"MRData": mr}
+
+
+# ---- Pagination ----
+
+def page_items(data, table, items_key):
+    mr = data.get("MRData", {})
+    return mr.get(table, {}).get(items_key, []), int(mr.get("total", 0))
+
+
+def iter_pages(endpoint: str, table: str, items_key: str, params=None, offset=0,
+               page_size=None, fetch=None, max_workers=None):
+    """
+    Yield (offset, total, items) for every page of a paginated endpoint.
+
+    The first page tells us MRData.total; the remaining offsets are then
+    fetched concurrently (bounded by API_CONCURRENCY and the shared rate
+    limiter) and yielded in offset order as soon as each is available.
+    offset resumes part way through. Note that Ergast pages by result row,
+    so a race can be split across two pages; callers merge if it matters.
+    """
+    page_size = page_size or settings.API_PAGE_SIZE
+    fetch = fetch or fetch_api
+    params = dict(params or {})
+
+    def get(page_offset):
+        data = fetch(endpoint, dict(params, limit=page_size, offset=page_offset))
+        return page_items(data, table, items_key)
+
+    items, total = get(offset)
+    yield offset, total, items
+    offsets = range(offset + page_size, total, page_size)
+    if not offsets:
+        return
+
+    workers = min(max_workers or settings.API_CONCURRENCY, len(offsets))
+    with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="api-pages") as pool:
+        futures = [(page_offset, pool.submit(get, page_offset)) for page_offset in offsets]
+        try:
+            for page_offset, future in futures:
+                items, _ = future.result()
+                yield page_offset, total, items
+        finally:
+            for _, future in futures:
+                future.cancel()
+
+
+def paginate(endpoint: str, table: str, items_key: str, params=None, **kwargs):
+    """Stream every record of a paginated endpoint (see iter_pages)."""
+    for _, _, items in iter_pages(endpoint, table, items_key, params, **kwargs):
+        yield from items
+
+
+async def fetch_all_async(endpoint: str, table: str, items_key: str, params=None, page_size=None):
+    """Coroutine variant of paginate: first page, then the rest concurrently."""
+    page_size = page_size or settings.API_PAGE_SIZE
+    params = dict(params or {})
+
+    async def get(page_offset):
+        data = await fetch_api_async(endpoint, dict(params, limit=page_size, offset=page_offset))
+        return page_items(data, table, items_key)[0]
+
+    data = await fetch_api_async(endpoint, dict(params, limit=page_size, offset=0))
+    items, total = page_items(data, table, items_key)
+    pages = await asyncio.gather(*(get(o) for o in range(page_size, total, page_size)))
+    for page in pages:
+        items.extend(page)
+    return items
 
 
 def on_failed(widget: QWidget, retry_callback, message=None):
@@ -65,6 +426,20 @@ def on_failed(widget: QWidget, retry_callback, message=None):
         QPushButton:pressed { background-color: #E6B800; }
     """)
     retry_button.clicked.connect(retry_callback)
+
+    # Don't let Retry hammer an API that is known to be down
+    retry_in = mirrors.retry_in()
+    if retry_in > 0:
+        retry_button.setEnabled(False)
+        retry_button.setText(f"Retry in {math.ceil(retry_in)}s")
+
+        def enable_retry():
+            retry_button.setEnabled(True)
+            retry_button.setText("Retry")
+        timer = QTimer(retry_button)   # dies with the button
+        timer.setSingleShot(True)
+        timer.timeout.connect(enable_retry)
+        timer.start(int(retry_in * 1000))
     # print(message)
 
     # --- Add widgets ---
@@ -0,0 +1,96 @@
+# -- utils/async_http.py
+# Minimal HTTP/1.1 GET over asyncio streams, so coroutine-based services can
+# run many requests concurrently on one thread without extra dependencies.
+import asyncio
+import json
+import ssl
+from urllib.parse import urlsplit
+from utils import compression
+
+_ssl_context = None
+
+
+class HTTPError(Exception):
+    def __init__(self, status, reason, url):
+        super().__init__(f"{status} {reason} for url: {url}")
+        self.status = status
+
+
+def _context():
+    global _ssl_context
+    if _ssl_context is None:
+        _ssl_context = ssl.create_default_context()
+    return _ssl_context
+
+
+async def _read_chunked(reader):
+    body = bytearray()
+    while True:
+        size_line = await reader.readline()
+        size = int(size_line.split(b";")[0].strip() or b"0", 16)
+        if size == 0:
+            await reader.readline()
+            return bytes(body)
+        body += await reader.readexactly(size)
+        await reader.readexactly(2)
+
+
+async def get(url, headers=None, timeout=10):
+    """GET url; returns (status, headers, body bytes)."""
+    parts = urlsplit(url)
+    secure = parts.scheme == "https"
+    port = parts.port or (443 if secure else 80)
+    path = parts.path or "/"
+    if parts.query:
+        path += "?" + parts.query
+
+    request_headers = {
+        "Host": parts.hostname,
+        "Accept": "application/json",
+        "Accept-Encoding": compression.ACCEPT_ENCODING,
+        "Connection": "close",
+        "User-Agent": "SlipStream.live",
+    }
+    request_headers.update(headers or {})
+
+    async def exchange():
+        reader, writer = await asyncio.open_connection(
+            parts.hostname, port, ssl=_context() if secure else None
+        )
+        try:
+            head = f"GET {path} HTTP/1.1\r\n" + "".join(
+                f"{k}: {v}\r\n" for k, v in request_headers.items()
+            ) + "\r\n"
+            writer.write(head.encode("latin-1"))
+            await writer.drain()
+
+            status_line = (await reader.readline()).decode("latin-1")
+            _, status, *reason = status_line.split(" ", 2)
+            response_headers = {}
+            while True:
+                line = (await reader.readline()).decode("latin-1")
+                if line in ("\r\n", "\n", ""):
+                    break
+                name, _, value = line.partition(":")
+                response_headers[name.strip().lower()] = value.strip()
+
+            if response_headers.get("transfer-encoding", "").lower() == "chunked":
+                body = await _read_chunked(reader)
+            elif "content-length" in response_headers:
+                body = await reader.readexactly(int(response_headers["content-length"]))
+            else:
+                body = await reader.read()
+            body = compression.decode(body, response_headers.get("content-encoding"))
+            return int(status), (reason[0].strip() if reason else ""), response_headers, body
+        finally:
+            writer.close()
+
+    status, reason, response_headers, body = await asyncio.wait_for(exchange(), timeout)
+    if status >= 400:
+        raise HTTPError(status, reason, url)
+    return status, response_headers, body
+
+
+async def get_json(url, headers=None, timeout=10):
+    _, _, body = await get(url, headers=headers, timeout=timeout)
+    return json.loads(body)
@@ -0,0 +1,111 @@
+# -- utils/circuit_breaker.py
+# Per-host circuit breaker for the API layer. After a few consecutive
+# failures the host is considered down: requests fail fast (callers serve
+# cached data instead) until an exponentially growing, jittered cool-down
+# has passed. Then a single probe request is let through (half-open); its
+# success closes the breaker, its failure re-opens it for longer.
+import logging
+import random
+import threading
+import time
+from urllib.parse import urlsplit
+from config import settings
+
+logger = logging.getLogger(__name__)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(Exception):
+    def __init__(self, host, retry_in):
+        super().__init__(f"{host} is unavailable, retrying in {retry_in:.0f}s")
+        self.host = host
+        self.retry_in = retry_in
+
+
+def backoff_delay(attempt, base=None, cap=None):
+    """Exponential backoff with full jitter: uniform in [0, min(cap, base * 2**attempt)]."""
+    base = settings.API_BACKOFF_BASE if base is None else base
+    cap = settings.API_BACKOFF_CAP if cap is None else cap
+    return random.uniform(0, min(cap, base * 2 ** attempt))
+
+
+class CircuitBreaker:
+    """Thread-safe breaker for one host; see the module comment."""
+    def __init__(self, host, threshold=None):
+        self.host = host
+        self.threshold = threshold or settings.API_BREAKER_THRESHOLD
+        self.state = CLOSED
+        self.failures = 0
+        self.trips = 0
+        self.opened_until = 0.0
+        self.lock = threading.Lock()
+
+    def retry_in(self):
+        """Seconds until the next request is allowed (0 when closed)."""
+        with self.lock:
+            if self.state == CLOSED:
+                return 0.0
+            return max(self.opened_until - time.monotonic(), 0.0)
+
+    def before_request(self):
+        """Raise CircuitOpenError unless a request may go out now."""
+        with self.lock:
+            if self.state == CLOSED:
+                return
+            now = time.monotonic()
+            if now >= self.opened_until:
+                # let exactly one probe through; everyone else keeps failing fast.
+                # A probe that never reports back (cancelled) allows another one
+                # after a request timeout.
+                self.state = HALF_OPEN
+                self.opened_until = now + settings.API_TIMEOUT
+                logger.info("Circuit for %s half-open, probing", self.host)
+                return
+            raise CircuitOpenError(self.host, max(self.opened_until - now, 0.0))
+
+    def record_success(self):
+        with self.lock:
+            if self.state != CLOSED:
+                logger.info("Circuit for %s closed", self.host)
+            self.state = CLOSED
+            self.failures = 0
+            self.trips = 0
+
+    def record_failure(self):
+        with self.lock:
+            self.failures += 1
+            if self.state == HALF_OPEN or self.failures >= self.threshold:
+                delay = settings.API_BACKOFF_BASE * 2 ** self.trips
+                delay = min(settings.API_BREAKER_MAX_OPEN, delay) * random.uniform(0.5, 1.0)
+                self.trips += 1
+                self.state = OPEN
+                self.opened_until = time.monotonic() + delay
+                logger.warning("Circuit for %s open for %.1fs after %d failures",
+                               self.host, delay, self.failures)
+
+
+_breakers = {}
+_breakers_lock = threading.Lock()
+
+
+def get_breaker(url):
+    """The shared breaker for url's host."""
+    host = urlsplit(url).netloc
+    with _breakers_lock:
+        if host not in _breakers:
+            _breakers[host] = CircuitBreaker(host)
+        return _breakers[host]
+
+
+def is_upstream_failure(error):
+    """Failures that say the host is unhealthy (not a bad request on our side)."""
+    status = getattr(error, "status", None)
+    if status is None:
+        response = getattr(error, "response", None)
+        status = getattr(response, "status_code", None)
+    if status is None:
+        return True     # connection error, timeout, reset
+    return status == 429 or status >= 500
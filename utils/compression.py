@@ -0,0 +1,246 @@
+# -- utils/compression.py
+# Compression for the wire and for AppData.
+#
+# Wire: ACCEPT_ENCODING advertises every codec decode() handles (zstd and
+# brotli when their packages are installed, gzip/deflate always), for
+# clients that decode themselves; requests sessions use
+# SESSION_ACCEPT_ENCODING, what the installed urllib3 decodes.
+#
+# At rest: pack()/unpack() wrap a payload as
+#   magic "F1Z", codec (1 byte), dictionary id (4 bytes, 0 = none), data
+# using zstd when available and zlib otherwise. Small responses share
+# keys and values, so both codecs use a dictionary trained on cached
+# Ergast JSON (zstd's trainer, or a zlib preset dictionary built from the
+# most valuable repeated tokens). Dictionaries live under
+# COMPRESSION_DICT_DIR by id, so older blobs stay readable after retraining.
+#
+#   python -m utils.compression bench   # ratios and (de)compression cost
+import gzip
+import re
+import struct
+import threading
+import zlib
+from collections import Counter
+from config import settings
+
+try:
+    # what urllib3 (and so requests) decodes itself: zstd needs urllib3 >= 2
+    from urllib3.util.request import ACCEPT_ENCODING as _URLLIB3_ENCODINGS
+except ImportError:
+    _URLLIB3_ENCODINGS = "gzip,deflate"
+
+try:
+    import zstandard
+except ImportError:     # optional
+    zstandard = None
+
+try:
+    import brotli
+except ImportError:     # optional
+    brotli = None
+
+MAGIC = b"F1Z"
+HEADER = struct.Struct("<3sBI")
+RAW = 0
+ZLIB = 1
+ZSTD = 2
+
+# what a corrupt blob can raise, besides ValueError
+ERRORS = (zlib.error,) + ((zstandard.ZstdError,) if zstandard else ())
+
+ZLIB_DICT_SIZE = 32 * 1024      # zlib only looks back 32 KB
+ZSTD_DICT_SIZE = 64 * 1024
+
+ACCEPT_ENCODING = ", ".join(
+    name for name, available in (("zstd", zstandard), ("br", brotli), ("gzip", True), ("deflate", True))
+    if available
+)
+# for requests sessions: a body urllib3 cannot decode would reach .json() compressed
+SESSION_ACCEPT_ENCODING = ", ".join(name.strip() for name in _URLLIB3_ENCODINGS.split(","))
+
+
+# ---- Wire ----
+
+def decode(body, encoding):
+    """Undo a Content-Encoding."""
+    encoding = (encoding or "").lower()
+    if encoding == "gzip":
+        return gzip.decompress(body)
+    if encoding == "deflate":
+        return zlib.decompress(body)
+    if encoding == "br" and brotli:
+        return brotli.decompress(body)
+    if encoding == "zstd" and zstandard:
+        return zstandard.ZstdDecompressor().decompressobj().decompress(body)
+    return body
+
+
+# ---- Dictionaries ----
+
+_dicts = {}
+_dicts_lock = threading.Lock()
+_current = None
+
+
+def _dict_path(dict_id):
+    return settings.COMPRESSION_DICT_DIR / f"{dict_id:08x}.dict"
+
+
+def load_dictionary(dict_id):
+    with _dicts_lock:
+        if dict_id not in _dicts:
+            _dicts[dict_id] = _dict_path(dict_id).read_bytes()
+        return _dicts[dict_id]
+
+
+def current_dictionary():
+    """(id, bytes) of the newest trained dictionary, or (0, None)."""
+    global _current
+    if _current is None:
+        marker = settings.COMPRESSION_DICT_DIR / "current"
+        try:
+            dict_id = int(marker.read_text().strip(), 16)
+            _current = (dict_id, load_dictionary(dict_id))
+        except (OSError, ValueError):
+            _current = (0, None)
+    return _current
+
+
+def _zlib_dictionary(samples, size):
+    """Most valuable repeated JSON tokens, best last (zlib favours nearby matches)."""
+    counts = Counter()
+    for sample in samples:
+        counts.update(re.findall(rb'[{\[,]?"[^"\\]{0,48}"[:,]?', sample))
+    ranked = sorted((t for t, n in counts.items() if n > 1), key=lambda t: counts[t] * len(t))
+    out = bytearray()
+    for token in reversed(ranked):
+        if len(out) + len(token) > size:
+            break
+        out[:0] = token
+    return bytes(out)
+
+
+def build_dictionary(samples):
+    """(id, bytes) of a dictionary trained on sample payloads, not stored."""
+    samples = [s for s in samples if s]
+    if zstandard:
+        data = zstandard.train_dictionary(ZSTD_DICT_SIZE, samples).as_bytes()
+    else:
+        data = _zlib_dictionary(samples, ZLIB_DICT_SIZE)
+    return zlib.crc32(data) or 1, data
+
+
+def train_dictionary(samples):
+    """Train, store and activate a dictionary from sample payloads; returns its id."""
+    global _current
+    dict_id, data = build_dictionary(samples)
+    settings.COMPRESSION_DICT_DIR.mkdir(parents=True, exist_ok=True)
+    _dict_path(dict_id).write_bytes(data)
+    (settings.COMPRESSION_DICT_DIR / "current").write_text(f"{dict_id:08x}")
+    with _dicts_lock:
+        _dicts[dict_id] = data
+    _current = (dict_id, data)
+    return dict_id
+
+
+# ---- At rest ----
+
+def pack(payload, dictionary=None):
+    """
+    Compress bytes into a self-describing blob, with the current trained
+    dictionary unless dictionary (an (id, bytes) pair, (0, None) for none)
+    is given.
+    """
+    dict_id, dictionary = dictionary or current_dictionary()
+    if zstandard:
+        zdict = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        data = zstandard.ZstdCompressor(level=settings.COMPRESSION_LEVEL, dict_data=zdict).compress(payload)
+        return HEADER.pack(MAGIC, ZSTD, dict_id) + data
+    compressor = zlib.compressobj(settings.COMPRESSION_LEVEL, zdict=dictionary) if dictionary \
+        else zlib.compressobj(settings.COMPRESSION_LEVEL)
+    return HEADER.pack(MAGIC, ZLIB, dict_id) + compressor.compress(payload) + compressor.flush()
+
+
+def is_packed(blob):
+    return blob[:len(MAGIC)] == MAGIC
+
+
+def unpack(blob):
+    """Inverse of pack(); raises ValueError on anything else."""
+    if len(blob) < HEADER.size or not is_packed(blob):
+        raise ValueError("not a packed blob")
+    _, codec, dict_id = HEADER.unpack_from(blob)
+    data = blob[HEADER.size:]
+    dictionary = load_dictionary(dict_id) if dict_id else None
+    if codec == ZLIB:
+        decompressor = zlib.decompressobj(zdict=dictionary) if dictionary else zlib.decompressobj()
+        return decompressor.decompress(data) + decompressor.flush()
+    if codec == ZSTD:
+        if not zstandard:
+            raise ValueError("zstd blob, but zstandard is not installed")
+        zdict = zstandard.ZstdCompressionDict(dictionary) if dictionary else None
+        return zstandard.ZstdDecompressor(dict_data=zdict).decompressobj().decompress(data)
+    if codec == RAW:
+        return data
+    raise ValueError(f"unknown codec {codec}")
+
+
+# ---- Benchmark ----
+
+def cached_samples():
+    """Compact JSON of every response in the API cache."""
+    import json
+    from services.storage import load_state
+    from utils.http_cache import CACHE_SCHEMA, CACHE_VERSION
+
+    samples = []
+    for path in sorted(settings.API_CACHE_DIR.glob("*")):
+        if path.is_dir() or path.suffix in (".bak", ".lock", ".tmp"):
+            continue
+        entry = load_state(path, CACHE_SCHEMA, CACHE_VERSION)
+        if entry:
+            samples.append(json.dumps(entry["data"], separators=(",", ":")).encode("utf-8"))
+    return samples
+
+
+def bench(samples=None):
+    """Print sizes and (de)compression timings for the cached responses."""
+    import json
+    import time
+
+    samples = cached_samples() if samples is None else samples
+    if not samples:
+        print("No cached responses to benchmark; browse the app first.")
+        return
+    pretty = sum(len(json.dumps(json.loads(s), indent=4).encode("utf-8")) for s in samples)
+    compact = sum(len(s) for s in samples)
+    print(f"{len(samples)} responses: {pretty} B as indent=4 JSON, {compact} B compact")
+
+    def measure(label, compress, decompress):
+        started = time.perf_counter()
+        blobs = [compress(s) for s in samples]
+        packed_at = time.perf_counter()
+        for blob in blobs:
+            decompress(blob)
+        done = time.perf_counter()
+        size = sum(len(b) for b in blobs)
+        print(f"  {label:<16} {size:>9} B  x{pretty / size:5.1f}  "
+              f"compress {1e3 * (packed_at - started) / len(samples):.3f} ms  "
+              f"decompress {1e3 * (done - packed_at) / len(samples):.3f} ms per response")
+
+    # trained on half the samples so the ratio is not flattered by memorisation
+    dictionary = build_dictionary(samples[::2])
+    with _dicts_lock:
+        _dicts[dictionary[0]] = dictionary[1]
+    codec = "zstd" if zstandard else "zlib"
+    measure("gzip", gzip.compress, gzip.decompress)
+    measure(f"{codec}", lambda s: pack(s, (0, None)), unpack)
+    measure(f"{codec} + dict", lambda s: pack(s, dictionary), unpack)
+
+
+if __name__ == "__main__":
+    import sys
+    if sys.argv[1:] == ["bench"]:
+        bench()
+    else:
+        print("usage: python -m utils.compression bench")
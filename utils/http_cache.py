@@ -0,0 +1,273 @@
+# -- utils/http_cache.py
+# Response cache behind fetch_api: conditional GETs where the server sends
+# validators, cheap limit=1 probes where it doesn't, and no revalidation at
+# all for seasons that are over.
+import hashlib
+import json
+import logging
+import threading
+import time
+from collections import Counter
+from datetime import datetime, timedelta, timezone
+from config import settings
+from utils import compression
+from services.storage import load_state, save_state, delete_state, write_json_later
+
+logger = logging.getLogger(__name__)
+
+CACHE_SCHEMA = "api_cache"
+CACHE_VERSION = 1
+
+# How each fetch was served; see get_metrics()
+FULL = "full"                       # downloaded (no usable cache)
+NOT_MODIFIED = "not_modified"       # conditional GET answered 304
+PROBE_UNCHANGED = "probe_unchanged" # limit=1 probe matched, served from cache
+PROBE_CHANGED = "probe_changed"     # probe differed, then downloaded in full
+PERMANENT = "permanent"             # past season, served without asking
+STALE = "stale"                     # upstream failing, served the cached copy
+KINDS = [FULL, PROBE_CHANGED, PROBE_UNCHANGED, NOT_MODIFIED, PERMANENT, STALE]
+
+_metrics = Counter()
+_metrics_lock = threading.Lock()
+
+
+def record(kind):
+    with _metrics_lock:
+        _metrics[kind] += 1
+    logger.debug("cache %s", kind)
+
+
+def get_metrics():
+    with _metrics_lock:
+        return dict(_metrics)
+
+
+def metrics_summary():
+    """get_metrics() as one log line, e.g. "12 fetches (3 full, 9 probe unchanged); 9 without a download"."""
+    counts = get_metrics()
+    if not counts:
+        return "no fetches yet"
+    served = ", ".join(f"{counts[kind]} {kind.replace('_', ' ')}" for kind in KINDS if counts.get(kind))
+    saved = sum(counts.get(kind, 0) for kind in (PROBE_UNCHANGED, NOT_MODIFIED, PERMANENT, STALE))
+    return f"{sum(counts.values())} fetches ({served}); {saved} without a download"
+
+
+def log_metrics():
+    logger.info("API cache: %s", metrics_summary())
+
+
+def is_permanent(endpoint, entry):
+    """
+    Endpoints scoped to a finished season never change, provided the cached
+    copy was fetched after that season was over.
+    """
+    season = endpoint.split("/", 1)[0]
+    return (season.isdigit() and int(season) < int(settings.CURRENT_SEASON)
+            and time.gmtime(entry.get("fetched", 0)).tm_year > int(season))
+
+
+# ---- Fingerprints ----
+
+def _table_items(data):
+    mr = data.get("MRData", {})
+    for key, table in mr.items():
+        if key.endswith("Table") and isinstance(table, dict):
+            for value in table.values():
+                if isinstance(value, list):
+                    return key, value
+            return key, []
+    return None, []
+
+
+def _row_count(table, items):
+    """Rows as Ergast counts them: results tables page by result, not by race."""
+    if table != "RaceTable":
+        return len(items)
+    count = 0
+    for race in items:
+        nested = [v for v in race.values() if isinstance(v, list)]
+        count += len(nested[0]) if nested else 1
+    return count
+
+
+def probe_params(params, cached):
+    """
+    limit=1 request whose answer identifies the newest data: the leader for
+    standings (points move after every session, even within a round),
+    otherwise the last row, i.e. the latest round.
+    """
+    table, _ = _table_items(cached["data"])
+    offset = 0 if table == "StandingsTable" else max(cached["fingerprint"][0] - 1, 0)
+    return dict(params or {}, limit=1, offset=offset)
+
+
+def fingerprint(data, from_probe=False, params=None):
+    """
+    (total, digest of the newest row) for a response, or None when this
+    response does not contain the newest row (a middle page). The whole
+    row is hashed, so a corrected time, status or date in it shows up.
+    """
+    mr = data.get("MRData", {})
+    total = int(mr.get("total", 0))
+    table, items = _table_items(data)
+    if table == "StandingsTable":
+        newest = items[0] if items else None
+        if newest is not None:
+            rows = next((v for k, v in newest.items() if isinstance(v, list)), [])
+            newest = {"round": newest.get("round"), "leader": rows[0] if rows else None}
+    else:
+        offset = int((params or {}).get("offset", mr.get("offset", 0)))
+        if not from_probe and offset + _row_count(table, items) < total:
+            return None
+        newest = items[-1] if items else None
+        if table == "RaceTable" and newest is not None:
+            # Results-style tables count nested rows, so a probe returns the
+            # last race with only its last result: compare that row in full
+            nested = next((k for k, v in newest.items() if isinstance(v, list)), None)
+            if nested:
+                rows = newest[nested]
+                newest = {"season": newest.get("season"), "round": newest.get("round"),
+                          nested: rows[-1] if rows else None}
+    digest = hashlib.sha1(json.dumps(newest, sort_keys=True).encode("utf-8")).hexdigest()
+    return [total, digest]
+
+
+# ---- When probes are trusted ----
+
+_windows = None         # (loaded at, [(start, closes)]) of the current season's sessions
+_windows_lock = threading.Lock()
+
+
+def _session_windows():
+    """(start, end of post-session window) of every session, from the cached schedule."""
+    global _windows
+    with _windows_lock:
+        if _windows and time.monotonic() - _windows[0] < settings.POLL_LIVE_INTERVAL:
+            return _windows[1]
+    # imported here: both import api_helper, which imports this module
+    from services.Schedule import load_cached_schedule
+    from services.refresh_scheduler import session_windows, SESSION_DURATION
+
+    races = load_cached_schedule()
+    spans = None
+    if races:
+        spans = [(opens - timedelta(seconds=SESSION_DURATION[kind]), closes)
+                 for kind, _, opens, closes in session_windows(races)]
+    with _windows_lock:
+        _windows = (time.monotonic(), spans)
+    return spans
+
+
+def in_session_window(endpoint, now=None):
+    """
+    True while a current-season endpoint may be edited in place: from a
+    session's start until its post-session window closes. Penalties and
+    standings changes below the leader do not show in a limit=1 probe, so
+    these fetches go in full. Without a cached schedule we cannot tell.
+    """
+    season = endpoint.split("/", 1)[0]
+    if season != "current" and season != str(settings.CURRENT_SEASON):
+        return False
+    spans = _session_windows()
+    if spans is None:
+        return True
+    now = now or datetime.now(timezone.utc)
+    return any(start <= now < closes for start, closes in spans)
+
+
+def can_probe(endpoint, entry):
+    """A limit=1 probe may stand in for a full download of this entry."""
+    return (bool(entry.get("fingerprint")) and not needs_full_refresh(entry)
+            and not in_session_window(endpoint))
+
+
+# ---- Store ----
+
+class ResponseCache:
+    """
+    Responses keyed by request path (not URL, so any mirror's answer counts),
+    in memory and persisted compressed under API_CACHE_DIR.
+    """
+    def __init__(self, directory=None):
+        self.directory = directory or settings.API_CACHE_DIR
+        self.entries = {}
+        self.lock = threading.Lock()
+        self.trained = False
+
+    def migrate_legacy(self):
+        """Recompress cache files from before compression (<sha1>.json) and remove the old ones."""
+        for old in self.directory.glob("*.json"):
+            entry = load_state(old, CACHE_SCHEMA, CACHE_VERSION)
+            new = old.with_name(old.name + ".z")
+            if entry and not new.exists():
+                save_state(new, entry, CACHE_SCHEMA, CACHE_VERSION, compress=True)
+            delete_state(old)
+            old.with_name(old.name + ".lock").unlink(missing_ok=True)
+
+    def path(self, key):
+        return self.directory / (hashlib.sha1(key.encode("utf-8")).hexdigest() + ".json.z")
+
+    def get(self, key):
+        with self.lock:
+            if key in self.entries:
+                return self.entries[key]
+        entry = load_state(self.path(key), CACHE_SCHEMA, CACHE_VERSION)
+        if entry and entry.get("key") != key:
+            entry = None
+        with self.lock:
+            self.entries[key] = entry
+        return entry
+
+    def put(self, key, data, headers=None, fingerprint=None):
+        headers = headers or {}
+        entry = {
+            "key": key,
+            "data": data,
+            "etag": headers.get("etag") or headers.get("ETag"),
+            "last_modified": headers.get("last-modified") or headers.get("Last-Modified"),
+            "fetched": time.time(),
+            "fingerprint": fingerprint,
+        }
+        with self.lock:
+            self.entries[key] = entry
+            train = not self.trained and len(self.entries) >= settings.COMPRESSION_DICT_SAMPLES
+            if train:
+                self.trained = True
+                samples = [e["data"] for e in self.entries.values() if e]
+        if train and compression.current_dictionary()[0] == 0:
+            # many small responses share keys and values: learn them once
+            compression.train_dictionary(
+                [json.dumps(d, separators=(",", ":")).encode("utf-8") for d in samples])
+        write_json_later(self.path(key), entry, CACHE_SCHEMA, CACHE_VERSION, compress=True)
+        return entry
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def get_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ResponseCache()
+            _cache.migrate_legacy()
+    return _cache
+
+
+def lookup(key):
+    """Cached entry for a request path, or None (may read the disk)."""
+    return get_cache().get(key)
+
+
+def validators(entry):
+    headers = {}
+    if entry.get("etag"):
+        headers["If-None-Match"] = entry["etag"]
+    if entry.get("last_modified"):
+        headers["If-Modified-Since"] = entry["last_modified"]
+    return headers
+
+
+def needs_full_refresh(entry):
+    return time.time() - entry.get("fetched", 0) > settings.API_PROBE_MAX_AGE
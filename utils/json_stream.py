@@ -0,0 +1,79 @@
+# -- utils/json_stream.py
+# Incremental decoding of Ergast responses: the record array (Races,
+# Drivers, ...) is decoded one element at a time as chunks arrive, so a
+# large page never exists in memory as one string or one big dict.
+import codecs
+import json
+import re
+
+_decoder = json.JSONDecoder()
+_WHITESPACE = re.compile(r"[\s,]*")
+_HEADER_FIELD = re.compile(r'"(limit|offset|total)"\s*:\s*"?(\d+)"?')
+
+
+class StreamError(ValueError):
+    pass
+
+
+class ItemStream:
+    """
+    Iterates the elements of the `items_key` array of a JSON document given
+    as byte chunks. `header` holds MRData's limit / offset / total, read
+    from the text before the array (Ergast writes them first).
+    """
+    def __init__(self, chunks, items_key):
+        self.chunks = iter(chunks)
+        self.decode = codecs.getincrementaldecoder("utf-8")()
+        self.buffer = ""
+        self.pos = 0
+        self.done = False
+        self.header = self._read_header(items_key)
+
+    def _fill(self):
+        """Append the next chunk to the buffer; False at the end of the body."""
+        for chunk in self.chunks:
+            text = self.decode.decode(chunk)
+            if text:
+                # drop what has been consumed, so the buffer stays one element long
+                self.buffer = self.buffer[self.pos:] + text
+                self.pos = 0
+                return True
+        return False
+
+    def _read_header(self, items_key):
+        start = re.compile(r'"%s"\s*:\s*\[' % re.escape(items_key))
+        while True:
+            match = start.search(self.buffer)
+            if match:
+                header = {k: int(v) for k, v in _HEADER_FIELD.findall(self.buffer[:match.start()])}
+                self.pos = match.end()
+                return header
+            if not self._fill():
+                # no such array (e.g. an empty table): nothing to iterate
+                self.done = True
+                return {k: int(v) for k, v in _HEADER_FIELD.findall(self.buffer)}
+
+    def __iter__(self):
+        while not self.done:
+            self.pos = _WHITESPACE.match(self.buffer, self.pos).end()
+            if self.pos >= len(self.buffer):
+                if not self._fill():
+                    raise StreamError("response ended inside the array")
+                continue
+            if self.buffer[self.pos] == "]":
+                self.done = True
+                break
+            try:
+                item, end = _decoder.raw_decode(self.buffer, self.pos)
+            except json.JSONDecodeError:
+                # element not complete yet
+                if not self._fill():
+                    raise StreamError("response ended inside an element")
+                continue
+            if end == len(self.buffer) and not isinstance(item, (dict, list)) and self._fill():
+                continue    # a bare number may continue in the next chunk
+            self.pos = end
+            yield item
+        # drain the rest of the body so the connection can be reused
+        for _ in self.chunks:
+            pass
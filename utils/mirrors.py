@@ -0,0 +1,84 @@
+# -- utils/mirrors.py
+# Equivalent Ergast endpoints (settings.API_MIRRORS) with per-mirror latency
+# stats. fetch_api asks the fastest healthy mirror first and hedges to the
+# next one when no answer arrives within that mirror's usual p95 latency.
+import threading
+from collections import deque
+from config import settings
+from utils.circuit_breaker import get_breaker
+
+WINDOW = 50         # latency samples kept per mirror
+MIN_SAMPLES = 5     # below this, the configured defaults are used
+
+
+class MirrorStats:
+    """Recent latencies and failures of one mirror."""
+    def __init__(self, url):
+        self.url = url
+        self.latencies = deque(maxlen=WINDOW)
+        self.failures = deque(maxlen=WINDOW)     # 1 per failed request, 0 per success
+
+    def percentile(self, q):
+        if len(self.latencies) < MIN_SAMPLES:
+            return None
+        ordered = sorted(self.latencies)
+        return ordered[min(int(q * len(ordered)), len(ordered) - 1)]
+
+    def failure_rate(self):
+        return sum(self.failures) / len(self.failures) if self.failures else 0.0
+
+    def score(self):
+        """Expected cost of a request here, in seconds (lower is better)."""
+        # unmeasured mirrors rank first, so every mirror gets sampled
+        median = self.percentile(0.5) or 0.0
+        return median + self.failure_rate() * settings.API_TIMEOUT
+
+
+class MirrorPool:
+    """Orders mirrors by observed latency and derives hedge delays."""
+    def __init__(self, urls):
+        self.lock = threading.Lock()
+        self.set_urls(urls)
+
+    def set_urls(self, urls):
+        with self.lock:
+            self.stats = [MirrorStats(url.rstrip("/")) for url in urls]
+
+    @property
+    def primary(self):
+        return self.stats[0].url
+
+    def ordered(self):
+        """Mirror URLs, fastest first; mirrors whose breaker is open go last."""
+        with self.lock:
+            ranked = sorted(enumerate(self.stats),
+                            key=lambda item: (get_breaker(item[1].url).retry_in() > 0,
+                                              item[1].score(), item[0]))
+            return [stats.url for _, stats in ranked]
+
+    def _get_stats(self, url):
+        return next(s for s in self.stats if s.url == url)
+
+    def hedge_delay(self, url):
+        """How long to wait on url before asking the next mirror: its p95 latency."""
+        if settings.LOCAL_CACHE_URL and url == settings.LOCAL_CACHE_URL.rstrip("/"):
+            # a cache miss at the daemon is slow by design; hedging it would
+            # bypass the shared fetch, so only fail over when it errors
+            return settings.API_TIMEOUT
+        with self.lock:
+            p95 = self._get_stats(url).percentile(0.95)
+        if p95 is None:
+            return settings.API_HEDGE_DELAY
+        return min(max(p95, settings.API_HEDGE_MIN_DELAY), settings.API_TIMEOUT)
+
+    def record(self, url, latency=None):
+        """Record a success (with its latency) or, with latency=None, a failure."""
+        with self.lock:
+            stats = self._get_stats(url)
+            stats.failures.append(0 if latency is not None else 1)
+            if latency is not None:
+                stats.latencies.append(latency)
+
+    def retry_in(self):
+        """Seconds until any mirror accepts requests again (0 if one does now)."""
+        return min(get_breaker(url).retry_in() for url in self.ordered())